@@ -1,5 +1,4 @@
 import math
-import random
 import logging
 from typing import Dict, Any, Optional, List
 
@@ -9,6 +8,8 @@ from ..constants import (
     HOLE_SERVICE_INTERVAL_TICKS,
 )
 from ..utils.calculations import Calculations
+from ..utils.event_log import event_log
+from ..utils.random_stream import RandomStream
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +23,10 @@ class GreenkeeperAgent:
         navigation_paths: Dict = None,
         water: List = None,
         bridges: List = None,
+        rng: RandomStream = None,
     ):
         self.id = id
+        self.rng = rng or RandomStream(RandomStream.new_seed(), "greenkeeper")
         self.position = {"x": 100, "y": -520}
         self.state = "idle"  # idle, walking_to_hole, placing_flag
         self.current_hole = None
@@ -85,8 +88,8 @@ class GreenkeeperAgent:
         max_attempts = 250
         for _ in range(max_attempts):
             candidate = {
-                "x": random.uniform(min_x, max_x),
-                "y": random.uniform(min_y, max_y),
+                "x": self.rng.uniform(min_x, max_x),
+                "y": self.rng.uniform(min_y, max_y),
             }
 
             if Calculations.point_in_polygon(candidate, green):
@@ -117,9 +120,7 @@ class GreenkeeperAgent:
                 self.current_path = self._get_navigation_path(self.last_hole, next_hole)
                 self.current_waypoint_index = 0
 
-                logger.info(
-                    f"Greenkeeper: Starting journey to hole {next_hole} (from {self.last_hole})"
-                )
+                event_log.emit("greenkeeper_journey", next_hole, self.last_hole)
 
                 if self.current_path:
                     first_waypoint = self.current_path[0]
@@ -137,6 +138,27 @@ class GreenkeeperAgent:
                 self.holes_needing_service.discard(next_hole)
                 self.final_flag_selected = False
 
+    def reroute(self, changed_pairs: List[tuple]):
+        """Switch to a repaired navigation path if the current journey uses a changed one."""
+        if self.state != "walking_to_hole" or self.final_flag_selected:
+            return
+
+        if (self.last_hole, self.current_hole) not in changed_pairs:
+            return
+
+        self.current_path = self._get_navigation_path(self.last_hole, self.current_hole)
+
+        # Resume from the closest waypoint of the new path
+        self.current_waypoint_index = min(
+            range(len(self.current_path)),
+            key=lambda i: Calculations.get_distance(
+                self.position, self.current_path[i]
+            ),
+        )
+        self.target_position = self.current_path[self.current_waypoint_index].copy()
+
+        event_log.emit("greenkeeper_rerouted", self.current_hole)
+
     def update(self) -> Dict[str, Any]:
         """Update greenkeeper state."""
         result = {
@@ -219,7 +241,7 @@ class GreenkeeperAgent:
                 result["new_flag_position"] = self.target_position.copy()
                 result["hole_number"] = self.current_hole
 
-                logger.info(f"Greenkeeper: Placed flag on hole {self.current_hole}")
+                event_log.emit("greenkeeper_flag_placed", self.current_hole)
 
                 self.hole_timers[self.current_hole] = 0
                 self.holes_needing_service.discard(self.current_hole)
@@ -276,3 +298,41 @@ class GreenkeeperAgent:
             "current_hole": self.current_hole,
             "holes_needing_service": len(self.holes_needing_service),
         }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the complete greenkeeper state, including path progress and timers."""
+        return {
+            "id": self.id,
+            "position": dict(self.position),
+            "state": self.state,
+            "current_hole": self.current_hole,
+            "target_position": (
+                dict(self.target_position) if self.target_position else None
+            ),
+            "flag_placement_timer": self.flag_placement_timer,
+            "current_path": [dict(waypoint) for waypoint in self.current_path],
+            "current_waypoint_index": self.current_waypoint_index,
+            "last_hole": self.last_hole,
+            "final_flag_selected": self.final_flag_selected,
+            "hole_timers": {str(k): v for k, v in self.hole_timers.items()},
+            "holes_needing_service": sorted(self.holes_needing_service),
+            "rng": self.rng.counter,
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        """Resume from a checkpoint snapshot."""
+        self.id = snapshot["id"]
+        self.position = dict(snapshot["position"])
+        self.state = snapshot["state"]
+        self.current_hole = snapshot["current_hole"]
+        self.target_position = (
+            dict(snapshot["target_position"]) if snapshot["target_position"] else None
+        )
+        self.flag_placement_timer = snapshot["flag_placement_timer"]
+        self.current_path = [dict(waypoint) for waypoint in snapshot["current_path"]]
+        self.current_waypoint_index = snapshot["current_waypoint_index"]
+        self.last_hole = snapshot["last_hole"]
+        self.final_flag_selected = snapshot["final_flag_selected"]
+        self.hole_timers = {int(k): v for k, v in snapshot["hole_timers"].items()}
+        self.holes_needing_service = set(snapshot["holes_needing_service"])
+        self.rng.counter = snapshot["rng"]
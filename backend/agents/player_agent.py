@@ -1,8 +1,7 @@
 import math
-import random
 import logging
 
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from ..constants import (
     WALKING_SPEED,
     HOLE_COMPLETION_DISTANCE,
@@ -12,15 +11,22 @@ from ..constants import (
 )
 from .shot_utility import ShotUtility
 from ..utils.calculations import Calculations
+from ..utils.event_log import event_log
+from ..utils.flow_field import FlowField
+from ..utils.random_stream import RandomStream
+from ..utils.tick_metrics import HotPathCounters
 
 logger = logging.getLogger(__name__)
 
 
 class PlayerAgent:
-    def __init__(self, id: int, accuracy: float, strength: float):
+    def __init__(
+        self, id: int, accuracy: float, strength: float, rng: RandomStream = None
+    ):
         self.id = id
         self.accuracy = accuracy
         self.strength = strength
+        self.rng = rng or RandomStream(RandomStream.new_seed(), f"player:{id}")
 
         self.player_position = {"x": 0, "y": 0}
         self.ball_position = {"x": 0, "y": 0}
@@ -31,6 +37,65 @@ class PlayerAgent:
 
         self.state = "idle"
         self.walking_progress = 0.0
+        # Straight distance to the ball when the current walk started
+        self.walk_start_distance = 0.0
+
+        # Last planned shot: (ball, lie, hole and flag key, wind, reduced, shot)
+        self.planned_shot = None
+        # Shot that passed the last safety check, taken by the next take_shot
+        self.approved_shot: Optional[Dict[str, Any]] = None
+
+    def _plan_shot(
+        self,
+        hole_data: Dict[str, Any],
+        wind_conditions: Dict[str, Any],
+        water: list,
+        current_hole_number: Optional[int],
+        all_holes: Optional[Dict[int, Dict[str, Any]]],
+        reduced_search: bool,
+        reuse_plan: bool,
+    ) -> Dict[str, Any]:
+        """Get the best shot, reusing the last plan from the same spot.
+
+        A plan is reused when ball, lie, hole, flag, wind and search
+        resolution are unchanged, so waiting players skip repeating the same
+        search. With reuse_plan, a plan made under older wind or at any resolution is
+        good enough.
+        """
+        flag = hole_data["flag"]
+        key = (
+            self.ball_position["x"],
+            self.ball_position["y"],
+            self.current_lie,
+            current_hole_number,
+            flag["x"],
+            flag["y"],
+        )
+        plan = self.planned_shot
+        if (
+            plan
+            and plan[0] == key
+            and (
+                reuse_plan or (plan[1] == wind_conditions and plan[2] == reduced_search)
+            )
+        ):
+            HotPathCounters.reused_plans += 1
+            return plan[3]
+
+        best_shot = ShotUtility.select_best_shot(
+            self.ball_position,
+            self.current_lie,
+            self.strength,
+            hole_data,
+            wind_conditions,
+            self.accuracy,
+            water,
+            current_hole_number,
+            all_holes,
+            reduced_search,
+        )
+        self.planned_shot = (key, wind_conditions, reduced_search, best_shot)
+        return best_shot
 
     def can_take_shot(
         self,
@@ -39,16 +104,25 @@ class PlayerAgent:
         wind_conditions: Dict[str, Any] = None,
         other_group_positions: list[Dict[str, float]] = None,
         water: list = None,
+        current_hole_number: int = None,
+        all_holes: Dict[int, Dict[str, Any]] = None,
+        reduced_search: bool = False,
+        reuse_plan: bool = False,
     ) -> bool:
-        """Check if it's safe to take a shot (greenkeeper and other groups not in landing zone)."""
-        best_shot = ShotUtility.select_best_shot(
-            self.ball_position,
-            self.current_lie,
-            self.strength,
+        """Check if it's safe to take a shot (greenkeeper and other groups not in landing zone).
+
+        The checked shot is kept as approved_shot, so take_shot hits exactly
+        the shot whose landing zone was checked.
+        """
+        self.approved_shot = None
+        best_shot = self._plan_shot(
             hole_data,
             wind_conditions,
-            self.accuracy,
             water,
+            current_hole_number,
+            all_holes,
+            reduced_search,
+            reuse_plan,
         )
 
         landing_position = best_shot["landing_position"]
@@ -57,8 +131,11 @@ class PlayerAgent:
             landing_position, greenkeeper_position
         )
         if distance_to_greenkeeper < GREENKEEPER_SAFETY_DISTANCE_METERS:
-            logger.info(
-                f"Player {self.id} cannot shoot: greenkeeper too close ({distance_to_greenkeeper:.2f}m < {GREENKEEPER_SAFETY_DISTANCE_METERS}m)"
+            event_log.emit(
+                "shot_blocked_by_greenkeeper",
+                self.id,
+                distance_to_greenkeeper,
+                GREENKEEPER_SAFETY_DISTANCE_METERS,
             )
             return False
 
@@ -73,11 +150,15 @@ class PlayerAgent:
                     self.ball_position, other_position
                 )
                 if distance_to_other < required_distance:
-                    logger.info(
-                        f"Player {self.id} cannot shoot: other player too close ({distance_to_other:.2f}m < {required_distance:.2f}m)"
+                    event_log.emit(
+                        "shot_blocked_by_player",
+                        self.id,
+                        distance_to_other,
+                        required_distance,
                     )
                     return False
 
+        self.approved_shot = best_shot
         return True
 
     def take_shot(
@@ -87,6 +168,7 @@ class PlayerAgent:
         water: list = None,
         current_hole_number: int = None,
         all_holes: Dict[int, Dict[str, Any]] = None,
+        reduced_search: bool = False,
     ) -> Dict[str, Any]:
         """Execute one shot using utility-based decision making."""
         self.strokes += 1
@@ -95,24 +177,29 @@ class PlayerAgent:
         flag = hole_data["flag"]
         distance_before = Calculations.get_distance(self.ball_position, flag)
 
-        logger.info(
-            f"Player {self.id} taking shot #{self.strokes}: "
-            f"from ({self.ball_position['x']:.2f}, {self.ball_position['y']:.2f}), "
-            f"distance to flag: {distance_before:.2f}m, lie: {self.current_lie}"
-        )
-
-        best_shot = ShotUtility.select_best_shot(
-            self.ball_position,
+        event_log.emit(
+            "shot_started",
+            self.id,
+            self.strokes,
+            self.ball_position["x"],
+            self.ball_position["y"],
+            distance_before,
             self.current_lie,
-            self.strength,
-            hole_data,
-            wind_conditions,
-            self.accuracy,
-            water,
-            current_hole_number,
-            all_holes,
         )
 
+        best_shot = self.approved_shot
+        self.approved_shot = None
+        if best_shot is None:
+            best_shot = self._plan_shot(
+                hole_data,
+                wind_conditions,
+                water,
+                current_hole_number,
+                all_holes,
+                reduced_search,
+                reuse_plan=False,
+            )
+
         club = best_shot["club"]
         power = best_shot["power"]
         direction = best_shot["direction"]
@@ -120,10 +207,10 @@ class PlayerAgent:
         inaccuracy = 1.0 - self.accuracy
 
         distance_spread = 0.05 + (inaccuracy * 0.15)
-        actual_power = power * (1 + random.uniform(-distance_spread, distance_spread))
+        actual_power = power * (1 + self.rng.uniform(-distance_spread, distance_spread))
 
         direction_spread = 0.035 + (inaccuracy * 0.335)
-        actual_direction = direction + random.uniform(
+        actual_direction = direction + self.rng.uniform(
             -direction_spread, direction_spread
         )
 
@@ -139,8 +226,11 @@ class PlayerAgent:
         )
 
         if self.current_lie == "water":
-            logger.info(
-                f"Player {self.id} ball landed in WATER at ({self.ball_position['x']:.2f}, {self.ball_position['y']:.2f})"
+            event_log.emit(
+                "ball_in_water",
+                self.id,
+                self.ball_position["x"],
+                self.ball_position["y"],
             )
 
             entry_point = None
@@ -171,15 +261,15 @@ class PlayerAgent:
                 else:
                     self.ball_position = old_ball_position.copy()
 
-                logger.info(
-                    f"Player {self.id} PENALTY: Ball dropped at ({self.ball_position['x']:.2f}, {self.ball_position['y']:.2f}) "
-                    f"- 2m before water entry point"
+                event_log.emit(
+                    "penalty_drop",
+                    self.id,
+                    self.ball_position["x"],
+                    self.ball_position["y"],
                 )
             else:
                 self.ball_position = old_ball_position.copy()
-                logger.info(
-                    f"Player {self.id} PENALTY: Ball dropped at original position (couldn't find entry point)"
-                )
+                event_log.emit("penalty_drop_at_origin", self.id)
 
             self.strokes += 1
             self.current_lie = ShotUtility.determine_lie(
@@ -192,15 +282,13 @@ class PlayerAgent:
         self.walking_progress = 0.0
 
         new_distance_to_flag = Calculations.get_distance(self.ball_position, flag)
-        logger.info(
-            f"Player {self.id} after shot: distance to flag = {new_distance_to_flag:.2f}m"
-        )
+        event_log.emit("shot_finished", self.id, new_distance_to_flag)
 
         if new_distance_to_flag < HOLE_COMPLETION_DISTANCE:
             self.is_complete = True
             self.current_lie = "hole"
-            logger.info(
-                f"Player {self.id} COMPLETED HOLE! Distance to hole: {new_distance_to_flag:.2f}m, strokes: {self.strokes}"
+            event_log.emit(
+                "player_holed_out", self.id, new_distance_to_flag, self.strokes
             )
 
         return {
@@ -214,9 +302,13 @@ class PlayerAgent:
             "club_used": club,
         }
 
-    def walk_to_ball(self) -> bool:
+    def walk_to_ball(
+        self, flow_field: FlowField = None, ball_field: FlowField = None
+    ) -> bool:
         """
         Move player towards ball. Returns True when reached.
+        With a flow field toward the ball's block, and a field toward the ball
+        itself for the last stretch, the player follows them around water.
         """
         if self.state != "walking" and self.state != "idle":
             return True
@@ -231,26 +323,65 @@ class PlayerAgent:
 
         if self.state == "idle":
             self.state = "walking"
+            self.walk_start_distance = distance
 
-        direction = Calculations.get_direction(self.player_position, self.ball_position)
-
-        move_distance = min(WALKING_SPEED, distance)
-        self.player_position["x"] += move_distance * math.cos(direction)
-        self.player_position["y"] += move_distance * math.sin(direction)
+        if flow_field is not None:
+            self._follow_flow_field(flow_field, ball_field, WALKING_SPEED)
+        else:
+            direction = Calculations.get_direction(
+                self.player_position, self.ball_position
+            )
+            move_distance = min(WALKING_SPEED, distance)
+            self.player_position["x"] += move_distance * math.cos(direction)
+            self.player_position["y"] += move_distance * math.sin(direction)
 
-        total_distance = Calculations.get_distance(
-            {
-                "x": self.player_position["x"] - move_distance * math.cos(direction),
-                "y": self.player_position["y"] - move_distance * math.sin(direction),
-            },
-            self.ball_position,
-        )
-        self.walking_progress = 1.0 - (distance - move_distance) / max(
-            total_distance, 1
+        remaining = Calculations.get_distance(self.player_position, self.ball_position)
+        self.walking_progress = min(
+            max(1.0 - remaining / max(self.walk_start_distance, 1), 0.0), 1.0
         )
 
         return False
 
+    def _follow_flow_field(
+        self, flow_field: FlowField, ball_field: Optional[FlowField], budget: float
+    ) -> float:
+        """Walk along the flow fields' cell chain toward the ball. Returns meters moved.
+
+        The field toward the ball takes over from the block field wherever it
+        reaches the player's cell.
+        """
+        grid = flow_field.grid
+        cell = grid.cell_at(self.player_position)
+        moved = 0.0
+
+        while budget - moved > 0:
+            next_cell = None
+            if cell is not None:
+                if ball_field is not None and ball_field.distance_at(cell) < math.inf:
+                    next_cell = ball_field.step_from(cell)
+                else:
+                    next_cell = flow_field.step_from(cell)
+            # At the ball's cell, or with no way around, walk straight to the ball
+            waypoint = (
+                grid.cell_center(next_cell)
+                if next_cell is not None
+                else self.ball_position
+            )
+
+            step_distance = Calculations.get_distance(self.player_position, waypoint)
+            move_distance = min(budget - moved, step_distance)
+            if step_distance > 0:
+                direction = Calculations.get_direction(self.player_position, waypoint)
+                self.player_position["x"] += move_distance * math.cos(direction)
+                self.player_position["y"] += move_distance * math.sin(direction)
+            moved += move_distance
+
+            if next_cell is None or move_distance < step_distance:
+                break
+            cell = next_cell
+
+        return moved
+
     def get_state(self) -> Dict[str, Any]:
         """
         Get current player state.
@@ -264,3 +395,41 @@ class PlayerAgent:
             "current_lie": self.current_lie,
             "state": self.state,
         }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the complete player state for checkpoints."""
+        return {
+            "id": self.id,
+            "accuracy": self.accuracy,
+            "strength": self.strength,
+            "player_position": dict(self.player_position),
+            "ball_position": dict(self.ball_position),
+            "strokes": self.strokes,
+            "ball_state": self.ball_state,
+            "current_lie": self.current_lie,
+            "is_complete": self.is_complete,
+            "state": self.state,
+            "walking_progress": self.walking_progress,
+            "walk_start_distance": self.walk_start_distance,
+            "rng": self.rng.counter,
+        }
+
+    @staticmethod
+    def from_snapshot(snapshot: Dict[str, Any], seed: int) -> "PlayerAgent":
+        """Recreate a player from a checkpoint snapshot of a run with this seed."""
+        player = PlayerAgent(
+            id=snapshot["id"],
+            accuracy=snapshot["accuracy"],
+            strength=snapshot["strength"],
+            rng=RandomStream(seed, f"player:{snapshot['id']}", snapshot["rng"]),
+        )
+        player.player_position = dict(snapshot["player_position"])
+        player.ball_position = dict(snapshot["ball_position"])
+        player.strokes = snapshot["strokes"]
+        player.ball_state = snapshot["ball_state"]
+        player.current_lie = snapshot["current_lie"]
+        player.is_complete = snapshot["is_complete"]
+        player.state = snapshot["state"]
+        player.walking_progress = snapshot["walking_progress"]
+        player.walk_start_distance = snapshot.get("walk_start_distance", 0.0)
+        return player
@@ -11,15 +11,22 @@ from ..constants import (
     LIE_MULTIPLIERS_UTILITY,
     NUMBER_OF_POWER_STEPS_TO_VALIDATE,
     NUMBER_OF_DIRECTION_STEPS_TO_VALIDATE,
+    REDUCED_DIRECTION_STEPS_TO_VALIDATE,
+    REDUCED_POWER_STEPS_TO_VALIDATE,
     WRONG_HOLE_UTILITY_PENALTY,
 )
 from ..utils.calculations import Calculations
+from ..utils.event_log import event_log
+from ..utils.polygon_lod import PolygonLOD
+from ..utils.shadow import shadowed
+from ..utils.tick_metrics import HotPathCounters
 
 logger = logging.getLogger(__name__)
 
 
 class ShotUtility:
     @staticmethod
+    @shadowed("select_best_shot")
     def select_best_shot(
         ball_position: Dict[str, float],
         current_lie: str,
@@ -30,6 +37,7 @@ class ShotUtility:
         water: List[List[Dict[str, float]]] = None,
         current_hole_number: int = None,
         all_holes: Dict[int, Dict[str, Any]] = None,
+        reduced_search: bool = False,
     ) -> Dict[str, Any]:
         flag = hole_data["flag"]
         distance_to_flag = Calculations.get_distance(ball_position, flag)
@@ -45,8 +53,12 @@ class ShotUtility:
             wind_conditions,
             player_accuracy,
             water,
+            reduced_search,
         )
 
+        HotPathCounters.shots_evaluated += 1
+        HotPathCounters.options_evaluated += len(shot_options)
+
         best_shot = None
         best_utility = float("-inf")
 
@@ -67,9 +79,12 @@ class ShotUtility:
                 best_shot = shot
 
         if water_shots_rejected > 0:
-            logger.info(
-                f"Shot selection: Rejected {water_shots_rejected}/{total_shots} options due to water. "
-                f"Selected: club={best_shot['club']}, lie={best_shot['landing_lie']}"
+            event_log.emit(
+                "water_options_rejected",
+                water_shots_rejected,
+                total_shots,
+                best_shot["club"],
+                best_shot["landing_lie"],
             )
 
         return best_shot
@@ -85,9 +100,16 @@ class ShotUtility:
         wind_conditions: Dict[str, Any] = None,
         player_accuracy: float = 1.0,
         water: List[List[Dict[str, float]]] = None,
+        reduced_search: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Generate multiple shot options to evaluate."""
+        """Generate multiple shot options to evaluate, fewer of them for a reduced search."""
         options = []
+        if reduced_search:
+            power_steps = REDUCED_POWER_STEPS_TO_VALIDATE
+            direction_steps = REDUCED_DIRECTION_STEPS_TO_VALIDATE
+        else:
+            power_steps = NUMBER_OF_POWER_STEPS_TO_VALIDATE
+            direction_steps = NUMBER_OF_DIRECTION_STEPS_TO_VALIDATE
 
         clubs_to_consider = ShotUtility._get_available_clubs(
             distance_to_flag, current_lie
@@ -98,11 +120,11 @@ class ShotUtility:
                 club, player_strength, current_lie
             )
 
-            step = int(100 / NUMBER_OF_POWER_STEPS_TO_VALIDATE)
+            step = int(100 / power_steps)
             for percentage in range(0, 101, step):
                 power = max_distance * (percentage / 100)
 
-                step = int(60 / NUMBER_OF_DIRECTION_STEPS_TO_VALIDATE)
+                step = int(60 / direction_steps)
                 for degrees in range(-30, 31, step):
                     direction = direction_to_flag + math.radians(degrees)
 
@@ -143,9 +165,6 @@ class ShotUtility:
 
         # Heavily penalize water shots
         if landing_lie == "water":
-            logger.debug(
-                f"WATER HAZARD: Rejected shot landing at ({landing_pos['x']:.2f}, {landing_pos['y']:.2f}) - would land in water"
-            )
             return float("-inf")
 
         distance_to_hole = Calculations.get_distance(landing_pos, flag)
@@ -160,15 +179,13 @@ class ShotUtility:
                 if hole_num == current_hole_number:
                     continue
 
-                if "fairway" in hole and Calculations.point_in_polygon(
+                if "fairway" in hole and PolygonLOD.contains(
                     landing_pos, hole["fairway"]
                 ):
                     total_utility -= WRONG_HOLE_UTILITY_PENALTY
                     break
 
-                if "green" in hole and Calculations.point_in_polygon(
-                    landing_pos, hole["green"]
-                ):
+                if "green" in hole and PolygonLOD.contains(landing_pos, hole["green"]):
                     total_utility -= WRONG_HOLE_UTILITY_PENALTY
                     break
 
@@ -231,30 +248,29 @@ class ShotUtility:
         return {"x": new_x, "y": new_y}
 
     @staticmethod
+    @shadowed("determine_lie")
     def determine_lie(
         position: Dict[str, float],
         hole_data: Dict[str, Any],
         water: List[List[Dict[str, float]]] = None,
     ) -> str:
         """Determine what type of lie the ball is in."""
-        if "green" in hole_data and Calculations.point_in_polygon(
-            position, hole_data["green"]
-        ):
+        if "green" in hole_data and PolygonLOD.contains(position, hole_data["green"]):
             return "green"
 
         if "bunkers" in hole_data:
             for bunker in hole_data["bunkers"]:
-                if Calculations.point_in_polygon(position, bunker):
+                if PolygonLOD.contains(position, bunker):
                     return "bunker"
 
-        if "fairway" in hole_data and Calculations.point_in_polygon(
+        if "fairway" in hole_data and PolygonLOD.contains(
             position, hole_data["fairway"]
         ):
             return "fairway"
 
         if water:
             for water_polygon in water:
-                if Calculations.point_in_polygon(position, water_polygon):
+                if PolygonLOD.contains(position, water_polygon):
                     return "water"
 
         return "rough"
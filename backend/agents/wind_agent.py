@@ -1,21 +1,23 @@
-import random
 import math
 import logging
 
 from typing import Dict, Any
 from ..constants import WIND_UPDATE_TICKER_INTERVAL, WIND_EFFECT_FACTOR
+from ..utils.event_log import event_log
+from ..utils.random_stream import RandomStream
 
 logger = logging.getLogger(__name__)
 
 
 class WindAgent:
-    def __init__(self):
-        self.direction = random.uniform(0, 360)  # 0=North, 90=East, 180=South, 270=West
-        self.speed = random.uniform(2, 8)
+    def __init__(self, rng: RandomStream = None):
+        self.rng = rng or RandomStream(RandomStream.new_seed(), "wind")
+        self.direction = self.rng.uniform(
+            0, 360
+        )  # 0=North, 90=East, 180=South, 270=West
+        self.speed = self.rng.uniform(2, 8)
 
-        logger.info(
-            f"Initial Wind: direction {self.direction:.1f}°, speed {self.speed:.1f} m/s"
-        )
+        event_log.emit("wind_initial", self.direction, self.speed)
 
         self.tick_count = 0
 
@@ -27,16 +29,32 @@ class WindAgent:
             old_direction = self.direction
             old_speed = self.speed
 
-            self.direction = (self.direction + random.uniform(-5, 5)) % 360
+            self.direction = (self.direction + self.rng.uniform(-5, 5)) % 360
 
-            self.speed += random.uniform(-0.5, 0.5)
+            self.speed += self.rng.uniform(-0.5, 0.5)
             self.speed = max(0, min(self.speed, 15))  # Keep between 0-15 m/s
 
-            logger.info(
-                f"Wind changed: direction {old_direction:.1f}° -> {self.direction:.1f}°, speed {old_speed:.1f} m/s -> {self.speed:.1f} m/s"
+            event_log.emit(
+                "wind_changed", old_direction, self.direction, old_speed, self.speed
             )
         return self.get_current_conditions()
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the unrounded wind state for checkpoints."""
+        return {
+            "direction": self.direction,
+            "speed": self.speed,
+            "tick_count": self.tick_count,
+            "rng": self.rng.counter,
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        """Resume from a checkpoint snapshot."""
+        self.direction = snapshot["direction"]
+        self.speed = snapshot["speed"]
+        self.tick_count = snapshot["tick_count"]
+        self.rng.counter = snapshot["rng"]
+
     def get_current_conditions(self) -> Dict[str, Any]:
         """Get current wind conditions."""
         return {"direction": round(self.direction, 1), "speed": round(self.speed, 1)}
@@ -0,0 +1,4 @@
+from backend.benchmarks.runner import Benchmark, BenchmarkRunner
+from backend.benchmarks.suite import BenchmarkSuite
+
+__all__ = ["Benchmark", "BenchmarkRunner", "BenchmarkSuite"]
@@ -0,0 +1,145 @@
+import sys
+import time
+import logging
+import platform
+import statistics
+
+from typing import Any, Callable, Dict, List, Optional
+
+from ..constants import (
+    BENCHMARK_MIN_ROUND_SECONDS,
+    BENCHMARK_REGRESSION_THRESHOLD,
+    BENCHMARK_ROUNDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Benchmark:
+    """A timed function doing ops operations per call.
+
+    reset runs untimed before every round, so stateful benchmarks such as
+    engine ticks start each round from the same state.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[[], Any],
+        ops: int = 1,
+        rounds: int = BENCHMARK_ROUNDS,
+        reset: Callable[[], Any] = None,
+        max_iterations: int = None,
+    ):
+        self.name = name
+        self.function = function
+        self.ops = ops
+        self.rounds = rounds
+        self.reset = reset
+        self.max_iterations = max_iterations
+
+
+class BenchmarkRunner:
+    """Times benchmarks in rounds and compares results against a baseline."""
+
+    def __init__(self, min_round_seconds: float = BENCHMARK_MIN_ROUND_SECONDS):
+        self.min_round_seconds = min_round_seconds
+
+    def _calibrate(self, benchmark: Benchmark) -> int:
+        """Get the number of calls per round needed to fill min_round_seconds."""
+        if benchmark.reset:
+            benchmark.reset()
+        started = time.perf_counter()
+        benchmark.function()
+        single = time.perf_counter() - started
+
+        iterations = max(1, int(self.min_round_seconds / max(single, 1e-9)))
+        if benchmark.max_iterations:
+            iterations = min(iterations, benchmark.max_iterations)
+        return iterations
+
+    def measure(self, benchmark: Benchmark) -> Dict[str, Any]:
+        """Time one benchmark; all figures are seconds per operation."""
+        iterations = self._calibrate(benchmark)
+        samples = []
+
+        for _ in range(benchmark.rounds):
+            if benchmark.reset:
+                benchmark.reset()
+            function = benchmark.function
+            started = time.perf_counter()
+            for _ in range(iterations):
+                function()
+            elapsed = time.perf_counter() - started
+            samples.append(elapsed / (iterations * benchmark.ops))
+
+        return {
+            "median": statistics.median(samples),
+            "min": min(samples),
+            "mean": statistics.fmean(samples),
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "rounds": benchmark.rounds,
+            "iterations": iterations,
+            "ops": benchmark.ops,
+        }
+
+    def run(self, benchmarks: List[Benchmark]) -> Dict[str, Any]:
+        """Run benchmarks and collect their results with the environment they ran in."""
+        results = {}
+        for benchmark in benchmarks:
+            results[benchmark.name] = self.measure(benchmark)
+            logger.info(
+                f"{benchmark.name}: {format_seconds(results[benchmark.name]['median'])}"
+            )
+
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "benchmarks": results,
+        }
+
+    @staticmethod
+    def compare(
+        results: Dict[str, Any],
+        baseline: Dict[str, Any],
+        threshold: float = BENCHMARK_REGRESSION_THRESHOLD,
+    ) -> List[Dict[str, Any]]:
+        """Compare medians per benchmark; slower than the baseline by over threshold is a regression."""
+        current = results["benchmarks"]
+        previous = baseline["benchmarks"]
+        rows = []
+
+        for name in sorted(set(current) | set(previous)):
+            row = {
+                "name": name,
+                "baseline": previous.get(name, {}).get("median"),
+                "current": current.get(name, {}).get("median"),
+                "ratio": None,
+            }
+            if row["baseline"] is None:
+                row["status"] = "new"
+            elif row["current"] is None:
+                row["status"] = "missing"
+            else:
+                row["ratio"] = row["current"] / row["baseline"]
+                if row["ratio"] > 1 + threshold:
+                    row["status"] = "regression"
+                elif row["ratio"] < 1 / (1 + threshold):
+                    row["status"] = "faster"
+                else:
+                    row["status"] = "ok"
+            rows.append(row)
+
+        return rows
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """Format a duration with a readable unit."""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
@@ -0,0 +1,263 @@
+import json
+import logging
+
+from typing import Any, Dict, List, Optional
+
+from .runner import Benchmark
+from ..agents.greenkeeper_agent import GreenkeeperAgent
+from ..agents.shot_utility import ShotUtility
+from ..simulation.simulation_engine import SimulationEngine
+from ..utils.calculations import Calculations
+from ..utils.pathfinding import PathFinder
+from ..utils.polygon_lod import PolygonLOD
+from ..utils.random_stream import RandomStream
+
+logger = logging.getLogger(__name__)
+
+# Run seed of every benchmark fixture, so all runs time the same work
+BENCHMARK_SEED = 2024
+
+# Random positions evaluated per call of the batched geometry benchmarks
+GEOMETRY_BATCH = 1000
+
+# Shot situations timed for select_best_shot: (lie, min and max distance to the flag)
+SHOT_SITUATIONS = {
+    "tee": ("tee", 0, float("inf")),
+    "fairway_long": ("fairway", 150, 260),
+    "fairway_approach": ("fairway", 60, 150),
+    "rough": ("rough", 30, 150),
+    "bunker": ("bunker", 0, 120),
+    "green": ("green", 0, 30),
+}
+
+# Group counts the engine tick is timed at
+TICK_GROUP_COUNTS = [1, 10, 50]
+
+# Ticks per round of an engine tick benchmark, so the group count stays close
+TICKS_PER_ROUND = 20
+
+
+class BenchmarkSuite:
+    """Hot-path benchmarks on fixtures built from the shipped course.
+
+    All positions are drawn from a fixed random stream and all engines
+    use a fixed run seed, so every run times the same work.
+    """
+
+    def __init__(self, engine: SimulationEngine = None):
+        self.engine = engine or SimulationEngine(seed=BENCHMARK_SEED)
+        self.rng = RandomStream(BENCHMARK_SEED, "benchmarks")
+
+    def build(self) -> List[Benchmark]:
+        """Build every benchmark of the suite."""
+        return (
+            self.shot_benchmarks()
+            + self.geometry_benchmarks()
+            + self.navigation_benchmarks()
+            + self.engine_benchmarks()
+        )
+
+    def _holes_by_length(self) -> List[int]:
+        """Hole numbers, longest tee to flag distance first."""
+        engine = self.engine
+        return sorted(
+            engine.holes,
+            key=lambda number: -Calculations.get_distance(
+                engine.get_tee_position(engine.holes[number]["tees"][0]),
+                engine.holes[number]["flag"],
+            ),
+        )
+
+    def find_position(
+        self, lie: str, min_distance: float, max_distance: float
+    ) -> Optional[Dict[str, Any]]:
+        """Find a ball position with a lie and flag distance, preferring long holes."""
+        engine = self.engine
+        for hole_number in self._holes_by_length():
+            hole_data = engine.holes[hole_number]
+            if lie == "tee":
+                position = engine.get_tee_position(hole_data["tees"][0])
+                return {"hole": hole_number, "position": position}
+
+            points = list(hole_data.get("fairway", [])) + list(hole_data["green"])
+            min_x, min_y, max_x, max_y = PolygonLOD.bounding_box(points)
+            for _ in range(2000):
+                position = {
+                    "x": self.rng.uniform(min_x, max_x),
+                    "y": self.rng.uniform(min_y, max_y),
+                }
+                distance = Calculations.get_distance(position, hole_data["flag"])
+                if (
+                    min_distance <= distance <= max_distance
+                    and ShotUtility.determine_lie(position, hole_data, engine.water)
+                    == lie
+                ):
+                    return {"hole": hole_number, "position": position}
+        return None
+
+    def shot_benchmarks(self) -> List[Benchmark]:
+        """select_best_shot from typical lies and distances."""
+        engine = self.engine
+        wind = {"direction": 45.0, "speed": 6.0}
+        benchmarks = []
+
+        for situation, (lie, min_distance, max_distance) in SHOT_SITUATIONS.items():
+            fixture = self.find_position(lie, min_distance, max_distance)
+            if fixture is None:
+                logger.warning(f"No {situation} position on the course, skipping")
+                continue
+
+            hole_number, position = fixture["hole"], fixture["position"]
+            benchmarks.append(
+                Benchmark(
+                    f"select_best_shot[{situation}]",
+                    lambda position=position, lie=lie, hole_number=hole_number: (
+                        ShotUtility.select_best_shot(
+                            position,
+                            lie,
+                            0.85,
+                            engine.holes[hole_number],
+                            wind,
+                            0.8,
+                            engine.water,
+                            hole_number,
+                            engine.holes,
+                        )
+                    ),
+                )
+            )
+        return benchmarks
+
+    def geometry_benchmarks(self) -> List[Benchmark]:
+        """Lie detection and point in polygon tests on batches of random positions."""
+        engine = self.engine
+        lie_cases = []
+        for _ in range(GEOMETRY_BATCH):
+            hole_number = self.rng.randint(1, engine.num_holes)
+            hole_data = engine.holes[hole_number]
+            min_x, min_y, max_x, max_y = PolygonLOD.bounding_box(
+                list(hole_data.get("fairway", [])) + list(hole_data["green"])
+            )
+            position = {
+                "x": self.rng.uniform(min_x, max_x),
+                "y": self.rng.uniform(min_y, max_y),
+            }
+            lie_cases.append((position, hole_data))
+
+        def determine_lies():
+            for position, hole_data in lie_cases:
+                ShotUtility.determine_lie(position, hole_data, engine.water)
+
+        fairway = max(
+            (hole["fairway"] for hole in engine.holes.values() if "fairway" in hole),
+            key=len,
+        )
+        min_x, min_y, max_x, max_y = PolygonLOD.bounding_box(fairway)
+        points = [
+            {"x": self.rng.uniform(min_x, max_x), "y": self.rng.uniform(min_y, max_y)}
+            for _ in range(GEOMETRY_BATCH)
+        ]
+
+        def exact_tests():
+            for point in points:
+                Calculations.point_in_polygon(point, fairway)
+
+        def lod_tests():
+            for point in points:
+                PolygonLOD.contains(point, fairway)
+
+        return [
+            Benchmark("determine_lie", determine_lies, ops=GEOMETRY_BATCH),
+            Benchmark(
+                "point_in_polygon[largest_fairway]", exact_tests, ops=GEOMETRY_BATCH
+            ),
+            Benchmark(
+                "polygon_lod_contains[largest_fairway]", lod_tests, ops=GEOMETRY_BATCH
+            ),
+        ]
+
+    def navigation_benchmarks(self) -> List[Benchmark]:
+        """Cold all-pairs path computation and greenkeeper updates."""
+        engine = self.engine
+
+        def compute_all_paths():
+            PathFinder(engine.water, engine.bridges, engine.holes).compute_all_paths(
+                engine.holes
+            )
+
+        greenkeeper = {}
+
+        def reset_greenkeeper():
+            greenkeeper["agent"] = GreenkeeperAgent(
+                id=1,
+                num_holes=engine.num_holes,
+                holes_data=engine.holes,
+                navigation_paths=engine.greenkeeper_paths,
+                water=engine.water,
+                bridges=engine.bridges,
+                rng=RandomStream(BENCHMARK_SEED, "greenkeeper"),
+            )
+
+        def update_greenkeeper():
+            agent = greenkeeper["agent"]
+            for _ in range(100):
+                agent.update()
+
+        return [
+            Benchmark(
+                "pathfinder_compute_all_paths[cold]",
+                compute_all_paths,
+                rounds=1,
+                max_iterations=1,
+            ),
+            Benchmark(
+                "greenkeeper_update",
+                update_greenkeeper,
+                ops=100,
+                reset=reset_greenkeeper,
+            ),
+        ]
+
+    def engine_with_groups(self, count: int) -> SimulationEngine:
+        """Fork the engine and put count groups on the tees, spread over the holes."""
+        engine = self.engine.fork()
+        for i in range(count):
+            group = engine.spawn_new_group()
+            hole_number = i % engine.num_holes + 1
+            tee = engine.get_tee_position(engine.holes[hole_number]["tees"][0])
+            group.current_hole_number = hole_number
+            for player in group.players:
+                player.player_position = dict(tee)
+                player.ball_position = dict(tee)
+        return engine
+
+    def engine_benchmarks(self) -> List[Benchmark]:
+        """Engine ticks at several group counts, and gamestate serialization."""
+        benchmarks = []
+
+        for count in TICK_GROUP_COUNTS:
+            engine = self.engine_with_groups(count)
+            snapshot = engine.snapshot()
+            benchmarks.append(
+                Benchmark(
+                    f"engine_tick[{count}_groups]",
+                    engine.tick,
+                    reset=lambda engine=engine, snapshot=snapshot: engine.restore(
+                        snapshot
+                    ),
+                    max_iterations=TICKS_PER_ROUND,
+                )
+            )
+
+        # A separate engine, so the serialized state does not depend on which ticks ran
+        engine = self.engine_with_groups(max(TICK_GROUP_COUNTS))
+        benchmarks.append(
+            Benchmark(f"get_state[{max(TICK_GROUP_COUNTS)}_groups]", engine.get_state)
+        )
+        benchmarks.append(
+            Benchmark(
+                f"get_state_json[{max(TICK_GROUP_COUNTS)}_groups]",
+                lambda: json.dumps(engine.get_state()),
+            )
+        )
+        return benchmarks
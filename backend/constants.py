@@ -69,3 +69,123 @@ MIN_DISTANCE_FROM_TEE_TO_SPAWN_NEW_GROUP = 50.0
 
 # Utility penalty for shots taken from another hole's features
 WRONG_HOLE_UTILITY_PENALTY = 1000.0
+
+# Cell size in meters of the walkable grid players follow around water
+WALKING_GRID_CELL_SIZE = 5.0
+
+# Margin in meters added around a hole's features when building its walking grid
+WALKING_GRID_MARGIN = 100.0
+
+# Side in cells of the coarse blocks flow fields lead to; a field toward the ball finishes the walk
+FLOW_FIELD_BLOCK_CELLS = 16
+
+# Number of hole walking grids and per block component flow fields kept in memory (LRU)
+WALKING_GRID_CACHE_SIZE = 6
+FLOW_FIELD_CACHE_SIZE = 64
+
+# Number of fields toward single ball cells kept in memory (LRU); one per walk in progress
+BALL_FIELD_CACHE_SIZE = 256
+
+# Maximum deviation in meters of the simplified polygons sent to clients
+POLYGON_LOD_COARSE_TOLERANCE = 1.0
+
+# Ticks between full gamestate keyframes sent to delta-protocol clients
+STATE_KEYFRAME_INTERVAL_TICKS = 30
+
+# Outbound frames buffered per WebSocket client before stale gamestates are dropped
+CLIENT_SEND_QUEUE_SIZE = 8
+
+# Buffered bytes per relay worker above which the broker drops gamestate frames
+BROKER_RELAY_BUFFER_BYTES = 4 * 1024 * 1024
+
+# Seconds a relay worker waits before reconnecting to the broker
+BROKER_RECONNECT_SECONDS = 1.0
+
+# Seconds a relay worker waits for the producer to reply to a command
+BROKER_REQUEST_TIMEOUT_SECONDS = 5.0
+
+# Recent ticks kept so reconnecting clients can catch up with a delta
+TICK_HISTORY_SIZE = 120
+
+# Ticks between keyframes in recorded tick logs; seeking replays at most this many deltas
+TICK_LOG_KEYFRAME_INTERVAL = 30
+
+# Size in bytes after which the recorder starts a new tick log file
+TICK_LOG_MAX_FILE_BYTES = 64 * 1024 * 1024
+
+# Rows buffered per table before the columnar exporter writes a part file
+EXPORT_FLUSH_ROWS = 100_000
+
+# Ticks after which the columnar exporter writes whatever it has buffered
+EXPORT_FLUSH_TICKS = 600
+
+# Ticks between exported player track samples
+EXPORT_TRACK_INTERVAL = 1
+
+# Ticks between automatic engine checkpoints (GOLF_CHECKPOINT_DIR)
+CHECKPOINT_INTERVAL_TICKS = 120
+
+# Number of newest checkpoint files kept
+CHECKPOINT_KEEP = 3
+
+# Relative and absolute tolerance when comparing reference and optimized results
+EQUIVALENCE_REL_TOLERANCE = 1e-9
+EQUIVALENCE_ABS_TOLERANCE = 1e-6
+
+# Mismatch descriptions kept per shadow-checked function
+SHADOW_MISMATCH_HISTORY = 20
+
+# Timed rounds per benchmark; results report the median round
+BENCHMARK_ROUNDS = 5
+
+# Minimum duration of a benchmark round; fast functions are called repeatedly to fill it
+BENCHMARK_MIN_ROUND_SECONDS = 0.2
+
+# Fraction by which a benchmark may be slower than its baseline before it counts as a regression
+BENCHMARK_REGRESSION_THRESHOLD = 0.2
+
+# Ticks kept in the rolling phase timing windows behind the reported quantiles
+METRICS_WINDOW_TICKS = 600
+
+# Quantiles reported per tick phase on /metrics
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+
+# Seconds between stack samples of an on-demand profile capture (GOLF_PROFILING)
+PROFILER_SAMPLE_INTERVAL_SECONDS = 0.005
+
+# Most ticks a single profile capture may cover
+PROFILER_MAX_TICKS = 600
+
+# Allocation sites with the largest growth reported by a memory capture
+PROFILER_MEMORY_TOP = 25
+
+# Events held in the structured event log's ring buffer
+EVENT_LOG_CAPACITY = 65536
+
+# Lowest level of simulation events that are recorded (GOLF_EVENT_LEVEL)
+EVENT_LOG_LEVEL = "INFO"
+
+# Keep only every Nth event of high volume kinds
+EVENT_SAMPLE_EVERY = {
+    "shot_blocked_by_greenkeeper": 10,
+    "shot_blocked_by_player": 10,
+}
+
+# Seconds between writes of new events to the event log file (GOLF_EVENT_LOG)
+EVENT_SINK_FLUSH_SECONDS = 1.0
+
+# Time a tick may take before the engine degrades work (GOLF_TICK_BUDGET, 0 disables)
+TICK_BUDGET_SECONDS = TICK_INTERVAL_SECONDS * 0.8
+
+# Fraction of the budget a tick is projected to use before shot searches get coarser
+TICK_BUDGET_DEGRADE_AT = 0.5
+
+# Fraction of the budget used after which remaining shot decisions wait for the next tick
+TICK_BUDGET_DEFER_AT = 0.9
+
+# Power and direction steps of a degraded shot search
+REDUCED_POWER_STEPS_TO_VALIDATE = 5
+REDUCED_DIRECTION_STEPS_TO_VALIDATE = 5
+
+# Weight of the newest duration in each group's smoothed decision cost
+DECISION_COST_SMOOTHING = 0.3
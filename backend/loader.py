@@ -1,11 +1,43 @@
 import logging
-from backend.scripts.convert_geojson import convert_all_holes
+from backend.utils.course_artifact import CourseArtifact
 
 logger = logging.getLogger(__name__)
 
 
-def regenerate_course_data() -> None:
-    """Regenerate all course data files from raw GeoJSON."""
-    logger.info("Regenerating course data from raw GeoJSON files...")
-    convert_all_holes()
-    logger.info("Course data regeneration complete")
+def regenerate_course_data(force: bool = False) -> bool:
+    """Regenerate course data files from raw GeoJSON that changed since the last run."""
+    # Imported lazily: the conversion pipeline is only needed when sources change
+    from backend.scripts.convert_geojson import convert_all_holes
+
+    logger.info("Checking course data against raw GeoJSON files...")
+    changed = convert_all_holes(force=force)
+    if changed:
+        logger.info("Course data regeneration complete")
+    else:
+        logger.info("Course data is up to date")
+    return changed
+
+
+def ensure_course_artifact(force: bool = False) -> None:
+    """Compile the binary course artifact unless a current one already exists."""
+    if not force:
+        artifact = CourseArtifact.open_if_current()
+        if artifact is not None:
+            artifact.close()
+            logger.info("Course artifact is up to date")
+            return
+
+    from backend.scripts.compile_course import compile_course
+
+    logger.info("Compiling course artifact...")
+    compile_course()
+
+
+def prepare_course_data() -> None:
+    """Make sure converted course data and the compiled artifact match the raw GeoJSON.
+
+    Only hashes files when nothing changed; projection (pyproj) and compilation
+    are imported and run on demand.
+    """
+    changed = regenerate_course_data()
+    ensure_course_artifact(force=changed)
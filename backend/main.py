@@ -1,17 +1,34 @@
+import time
+
+# Taken before the heavy imports so startup time covers import-to-first-tick
+STARTUP_STARTED_AT = time.perf_counter()
+
+import os
 import json
-import random
 import asyncio
 import logging
 
-from typing import Set
-from pathlib import Path
+from typing import Set, List, Dict, Optional
+from pydantic import BaseModel
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
+from fastapi import WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 
-from backend.loader import regenerate_course_data
-from backend.simulation import SimulationEngine
-from backend.constants import TICK_INTERVAL_SECONDS
+from backend.loader import prepare_course_data
+from backend.recording import ReplayPlayer, TickLogReader, TickLogWriter
+from backend.recording import ColumnarExporter
+from backend.server import CoursePayload, ClientConnection, FrameCodec
+from backend.server import StateFrames, StateRouter, TickHistory
+from backend.server import BrokerProducer, BrokerRelay, elect_role
+from backend.simulation import CheckpointStore, SimulationEngine
+from backend.constants import CHECKPOINT_INTERVAL_TICKS, PROFILER_MAX_TICKS
+from backend.constants import TICK_BUDGET_SECONDS, TICK_INTERVAL_SECONDS
 from backend.agents import GreenkeeperAgent, WindAgent
+from backend.utils.shadow import ShadowChecker
+from backend.utils.event_log import event_log
+from backend.utils.profiler import TickProfiler
+from backend.utils.tick_metrics import TickMetrics
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -20,47 +37,421 @@ logger = logging.getLogger(__name__)
 
 simulation_engine = None
 simulation_task = None
-active_connections: Set[WebSocket] = set()
+startup_seconds = None
+course_payload = CoursePayload()
+active_connections: Set[ClientConnection] = set()
+state_router = StateRouter()
+tick_history = TickHistory()
 
+# Tick phase timings of this worker, served on /metrics
+tick_metrics = TickMetrics()
 
-async def broadcast_game_state(game_state=None):
-    """Broadcast game state to all connected clients."""
-    if simulation_engine and active_connections:
-        if game_state is None:
-            game_state = simulation_engine.get_state()
-        message = json.dumps({"type": "gamestate", "data": game_state})
+# Multi-worker mode: one producer runs the simulation, relays only serve clients
+worker_role = "standalone"
+broker_producer = None
+broker_relay = None
+latest_game_state = None
 
-        disconnected = set()
-        for connection in active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error sending to client: {e}")
-                disconnected.add(connection)
+# Tick log recording (GOLF_RECORD_DIR) and playback (GOLF_REPLAY_DIR)
+tick_recorder = None
+replay_player = None
+
+# Columnar shot and track export for offline analytics (GOLF_EXPORT_DIR)
+shot_exporter = None
+
+# Periodic engine snapshots for warm restarts (GOLF_CHECKPOINT_DIR)
+checkpoint_store = None
+checkpoint_future = None
+
+# Samples live decisions against the reference implementation (GOLF_SHADOW_SAMPLE_RATE)
+shadow_checker = None
+
+# On-demand stack sampling of the next ticks, only when GOLF_PROFILING is set
+tick_profiler = None
+
+
+def broadcast_game_state(game_state=None):
+    """Queue game state for all connected clients without waiting on the network."""
+    global latest_game_state
+
+    if game_state is None:
+        if not simulation_engine:
+            return
+        game_state = simulation_engine.get_state()
+    latest_game_state = game_state
+    course_payload.track_flags(game_state)
+    started = time.perf_counter()
+    tick_history.record(game_state)
+    recorded = time.perf_counter()
+
+    for connection in list(active_connections):
+        if connection.closed:
+            active_connections.discard(connection)
+
+    # Frame encoding happens inside publish, once per view and encoding
+    encode_seconds = state_router.publish(game_state, active_connections)
+    published = time.perf_counter()
+    tick_metrics.observe("serialization", recorded - started + encode_seconds)
+    tick_metrics.observe("broadcast", published - recorded - encode_seconds)
+
+
+def current_game_state():
+    """Get the state to greet a new client with, from the engine or the broker."""
+    if simulation_engine:
+        return simulation_engine.get_state()
+    return latest_game_state
+
+
+def handle_client_message(connection: ClientConnection, data: str):
+    """Handle a control message sent by a client."""
+    try:
+        message = json.loads(data)
+        message_type = message.get("type")
+    except (ValueError, AttributeError):
+        logger.warning(f"Ignoring malformed client message: {data[:100]}")
+        return
+
+    if message_type == "enable_deltas":
+        connection.delta_enabled = True
+        connection.needs_keyframe = True
+    elif message_type == "request_keyframe":
+        connection.needs_keyframe = True
+    elif message_type == "subscribe":
+        try:
+            subscription = StateRouter.subscription_key(
+                message.get("holes"), message.get("groups")
+            )
+        except (TypeError, ValueError):
+            connection.publish(
+                json.dumps(
+                    {"type": "error", "message": "holes and groups must be id lists"}
+                )
+            )
+            return
+        connection.subscription = subscription
+        connection.needs_keyframe = True
+        connection.publish(
+            json.dumps(
+                {
+                    "type": "subscribed",
+                    **(connection.describe_subscription() or {}),
+                }
+            )
+        )
+    elif message_type == "set_max_rate":
+        try:
+            max_rate = float(message.get("max_rate") or 0)
+        except (TypeError, ValueError):
+            connection.publish(
+                json.dumps({"type": "error", "message": "max_rate must be a number"})
+            )
+            return
+        connection.rate_tier = StateRouter.rate_tier(max_rate, TICK_INTERVAL_SECONDS)
+        connection.needs_keyframe = True
+        connection.publish(
+            json.dumps(
+                {
+                    "type": "rate",
+                    "max_rate": max_rate or None,
+                    "update_interval": connection.rate_tier * TICK_INTERVAL_SECONDS,
+                }
+            )
+        )
+    elif message_type == "set_encoding":
+        encoding = message.get("encoding")
+        if encoding not in FrameCodec.available_encodings():
+            connection.publish(
+                json.dumps(
+                    {
+                        "type": "error",
+                        "message": f"Unsupported encoding: {encoding}",
+                        "encodings": FrameCodec.available_encodings(),
+                    }
+                )
+            )
+            return
+        # Acknowledged in JSON; gamestate frames after the ack use the new encoding
+        connection.publish(json.dumps({"type": "encoding", "encoding": encoding}))
+        connection.encoding = encoding
+        connection.needs_keyframe = True
+    else:
+        logger.warning(f"Ignoring unknown client message type: {message_type}")
 
-        active_connections.difference_update(disconnected)
+
+def broadcast_course_data():
+    """Rebuild the course payload and queue it for clients and relays if geometry changed."""
+    if not simulation_engine:
+        return
+    if not course_payload.refresh(simulation_engine, TICK_INTERVAL_SECONDS):
+        return
+
+    for connection in list(active_connections):
+        connection.publish(course_payload.message)
+    if broker_producer:
+        broker_producer.publish_course(
+            course_payload.course_data(), course_payload.version
+        )
+    if tick_recorder:
+        tick_recorder.record_course(course_payload.course_data())
+
+
+def receive_course_data(data: Dict, version: int, push: bool):
+    """Take course data published by the producer worker and pass it to clients."""
+    course_payload.build(data, version)
+    if not push:
+        return
+    for connection in list(active_connections):
+        connection.publish(course_payload.message)
+
+
+def handle_obstacle_command(command: Dict) -> Dict:
+    """Run an obstacle command on the local simulation, for HTTP handlers and relay workers."""
+    if not simulation_engine:
+        return {"status": 503, "detail": "Simulation not running"}
+
+    action = command.get("action")
+    if action == "list":
+        obstacles = simulation_engine.get_obstacles()
+        return {
+            "status": 200,
+            "body": {
+                "obstacles": [
+                    {"id": obstacle_id, "polygon": polygon}
+                    for obstacle_id, polygon in obstacles.items()
+                ]
+            },
+        }
+    if action == "add":
+        obstacle_id = simulation_engine.add_obstacle(command["polygon"])
+        broadcast_course_data()
+        return {"status": 200, "body": {"id": obstacle_id}}
+    if action == "remove":
+        if not simulation_engine.remove_obstacle(command["id"]):
+            return {"status": 404, "detail": "Obstacle not found"}
+        broadcast_course_data()
+        return {"status": 200, "body": {"id": command["id"]}}
+    return {"status": 400, "detail": f"Unknown obstacle action: {action}"}
+
+
+async def run_obstacle_command(command: Dict) -> Dict:
+    """Run an obstacle command here, or on the producer when this is a relay worker."""
+    if broker_relay:
+        reply = await broker_relay.request(command)
+    else:
+        reply = handle_obstacle_command(command)
+
+    if reply["status"] != 200:
+        raise HTTPException(status_code=reply["status"], detail=reply["detail"])
+    return reply["body"]
+
+
+def log_checkpoint_failure(future: asyncio.Future):
+    """Report a periodic checkpoint that failed to save in the executor."""
+    if future.cancelled():
+        return
+    if future.exception():
+        logger.error(f"Saving a checkpoint failed: {future.exception()}")
 
 
 async def run_simulation():
     """Background task that runs the simulation."""
-    global simulation_engine
+    global simulation_engine, startup_seconds, checkpoint_future
 
+    # The first tick runs right away, so startup_seconds measures startup only
     while True:
-        await asyncio.sleep(TICK_INTERVAL_SECONDS)
-
         if simulation_engine:
-            logger.info("TICK")
+            if tick_profiler:
+                tick_profiler.tick_started()
             game_state = simulation_engine.tick()
-            await broadcast_game_state(game_state)
+            event_log.emit("tick", simulation_engine.tick_count)
+
+            if startup_seconds is None:
+                startup_seconds = time.perf_counter() - STARTUP_STARTED_AT
+                logger.info(
+                    f"Startup: import to first tick took {startup_seconds:.3f}s"
+                )
+
+            broadcast_game_state(game_state)
+            if tick_recorder:
+                tick_recorder.record_tick(
+                    game_state,
+                    simulation_engine.tick_events,
+                    {
+                        number: hole["flag"]
+                        for number, hole in simulation_engine.holes.items()
+                    },
+                )
+            if shot_exporter:
+                shot_exporter.record_tick(game_state, simulation_engine.tick_events)
+            if (
+                checkpoint_store
+                and simulation_engine.tick_count % CHECKPOINT_INTERVAL_TICKS == 0
+            ):
+                if checkpoint_future and not checkpoint_future.done():
+                    logger.warning(
+                        f"Skipping checkpoint at tick {simulation_engine.tick_count}: "
+                        "the previous one is still being saved"
+                    )
+                else:
+                    # Snapshots hold copies, so encoding and writing can run off the loop
+                    checkpoint_future = asyncio.get_running_loop().run_in_executor(
+                        None, checkpoint_store.save, simulation_engine.snapshot()
+                    )
+                    checkpoint_future.add_done_callback(log_checkpoint_failure)
+            if broker_producer:
+                # Clients get flag moves in the gamestate; relays also get them
+                # in a flags frame, which is never dropped, for later clients
+                if course_payload.refresh(simulation_engine, TICK_INTERVAL_SECONDS):
+                    broker_producer.publish_course(
+                        course_payload.course_data(), course_payload.version, push=False
+                    )
+                if "flag_update" in game_state:
+                    broker_producer.publish_flags(course_payload.flag_updates())
+                broker_producer.publish_state(game_state)
+            if tick_profiler:
+                tick_profiler.tick_finished()
+
+        await asyncio.sleep(TICK_INTERVAL_SECONDS)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manages application startup and shutdown events."""
+    global simulation_task, worker_role, broker_relay, replay_player
+
+    broker_socket = os.environ.get("GOLF_BROKER_SOCKET")
+    replay_dir = os.environ.get("GOLF_REPLAY_DIR")
+    if replay_dir:
+        worker_role = "replay"
+    elif broker_socket:
+        worker_role = elect_role(broker_socket)
+    logger.info(f"Starting worker {os.getpid()} as {worker_role}")
+
+    if worker_role == "relay":
+        broker_relay = BrokerRelay(
+            broker_socket,
+            on_course=receive_course_data,
+            on_state=broadcast_game_state,
+            on_flags=course_payload.track_flags,
+            # A forced relay never takes over; an elected one can
+            on_promote=(
+                promote_to_producer
+                if os.environ.get("GOLF_BROKER_ROLE", "auto") == "auto"
+                else None
+            ),
+        )
+        broker_relay.start()
+    elif worker_role == "replay":
+        replay_player = ReplayPlayer(
+            TickLogReader(replay_dir),
+            on_course=receive_course_data,
+            on_state=broadcast_game_state,
+            tick_interval=TICK_INTERVAL_SECONDS,
+            speed=float(os.environ.get("GOLF_REPLAY_SPEED", "1")),
+        )
+        simulation_task = asyncio.create_task(replay_player.run())
+    else:
+        await start_producer(broker_socket)
+
+    yield
+
+    # Cleanup on shutdown
+    if simulation_task:
+        simulation_task.cancel()
+    if tick_profiler:
+        tick_profiler.cancel()
+    if checkpoint_store and simulation_engine:
+        # Never write while a periodic save is still pruning old files
+        if checkpoint_future:
+            await asyncio.wait([checkpoint_future])
+        checkpoint_store.save(simulation_engine.snapshot())
+    if broker_producer:
+        await broker_producer.close()
+    if broker_relay:
+        await broker_relay.close()
+    if tick_recorder:
+        tick_recorder.close()
+    if shot_exporter:
+        shot_exporter.close()
+    if shadow_checker:
+        shadow_checker.uninstall()
+    event_log.close()
+
+
+async def start_producer(broker_socket: Optional[str]):
+    """Run the simulation in this worker and, as the producer, feed the relay workers."""
+    global checkpoint_store, shadow_checker, tick_profiler
+    global tick_recorder, shot_exporter, broker_producer
+
+    event_level = os.environ.get("GOLF_EVENT_LEVEL")
+    if event_level:
+        event_log.configure(level=event_level)
+    event_file = os.environ.get("GOLF_EVENT_LOG")
+    if event_file:
+        event_log.start_sink(event_file)
+    checkpoint_dir = os.environ.get("GOLF_CHECKPOINT_DIR")
+    if checkpoint_dir:
+        checkpoint_store = CheckpointStore(checkpoint_dir)
+    shadow_sample_rate = float(os.environ.get("GOLF_SHADOW_SAMPLE_RATE", "0"))
+    if shadow_sample_rate > 0:
+        shadow_checker = ShadowChecker(shadow_sample_rate)
+        shadow_checker.install()
+    if os.environ.get("GOLF_PROFILING", "").lower() in ("1", "true", "yes"):
+        tick_profiler = TickProfiler()
+    start_simulation()
+    record_dir = os.environ.get("GOLF_RECORD_DIR")
+    if record_dir:
+        tick_recorder = TickLogWriter(
+            os.path.join(record_dir, time.strftime("%Y%m%d-%H%M%S"))
+        )
+        tick_recorder.record_course(course_payload.course_data())
+    export_dir = os.environ.get("GOLF_EXPORT_DIR")
+    if export_dir:
+        shot_exporter = ColumnarExporter(
+            os.path.join(export_dir, time.strftime("%Y%m%d-%H%M%S"))
+        )
+    if worker_role == "producer":
+        broker_producer = BrokerProducer(broker_socket, handle_obstacle_command)
+        await broker_producer.start()
+        broker_producer.publish_course(
+            course_payload.course_data(), course_payload.version
+        )
+
+
+async def promote_to_producer():
+    """Take over the simulation after the producer worker died."""
+    global worker_role, broker_relay
+
+    logger.warning(f"Worker {os.getpid()} is taking over as producer")
+    worker_role = "producer"
+    broker_relay = None
+    # Rebuild the course from this worker's engine and resend it to its clients
+    course_payload.version = None
+    await start_producer(os.environ["GOLF_BROKER_SOCKET"])
+    for connection in list(active_connections):
+        connection.publish(course_payload.message)
+
+
+def start_simulation():
+    """Create the simulation engine and its agents and start ticking."""
     global simulation_engine, simulation_task
-    regenerate_course_data()
+    prepare_course_data()
 
-    simulation_engine = SimulationEngine()
+    seed = os.environ.get("GOLF_SEED")
+    # Degradation depends on wall-clock time, so seeded runs default to no budget
+    tick_budget = float(
+        os.environ.get("GOLF_TICK_BUDGET", 0 if seed else TICK_BUDGET_SECONDS)
+    )
+    if seed and tick_budget:
+        logger.warning(
+            "The tick budget is on, so this seeded run is not reproducible; "
+            "set GOLF_TICK_BUDGET=0 to reproduce it"
+        )
+    simulation_engine = SimulationEngine(
+        seed=int(seed) if seed else None,
+        metrics=tick_metrics,
+        tick_budget=tick_budget or None,
+    )
 
     greenkeeper = GreenkeeperAgent(
         id=1,
@@ -69,75 +460,242 @@ async def lifespan(app: FastAPI):
         navigation_paths=simulation_engine.greenkeeper_paths,
         water=simulation_engine.water,
         bridges=simulation_engine.bridges,
+        rng=simulation_engine.random_stream("greenkeeper"),
     )
     simulation_engine.greenkeeper = greenkeeper
 
-    wind_agent = WindAgent()
+    wind_agent = WindAgent(rng=simulation_engine.random_stream("wind"))
     simulation_engine.wind_agent = wind_agent
 
-    simulation_task = asyncio.create_task(run_simulation())
+    if checkpoint_store:
+        snapshot = checkpoint_store.load_latest()
+        if snapshot:
+            try:
+                simulation_engine.restore(snapshot)
+            except ValueError as e:
+                logger.warning(f"Ignoring checkpoint: {e}")
 
-    yield
+    course_payload.refresh(simulation_engine, TICK_INTERVAL_SECONDS)
 
-    # Cleanup on shutdown
-    if simulation_task:
-        simulation_task.cancel()
+    simulation_task = asyncio.create_task(run_simulation())
 
 
 app = FastAPI(lifespan=lifespan)
 
 
+class ObstacleRequest(BaseModel):
+    polygon: List[Dict[str, float]]
+
+
+@app.get("/obstacles")
+async def list_obstacles():
+    """List active temporary course closures."""
+    return await run_obstacle_command({"action": "list"})
+
+
+@app.post("/obstacles")
+async def add_obstacle(request: ObstacleRequest):
+    """Close an area of the course, e.g. ground under repair or a flooded bridge."""
+    if len(request.polygon) < 3:
+        raise HTTPException(status_code=422, detail="Polygon needs at least 3 points")
+    return await run_obstacle_command({"action": "add", "polygon": request.polygon})
+
+
+@app.delete("/obstacles/{obstacle_id}")
+async def remove_obstacle(obstacle_id: int):
+    """Reopen a previously closed area."""
+    return await run_obstacle_command({"action": "remove", "id": obstacle_id})
+
+
+class ReplayRequest(BaseModel):
+    tick: Optional[int] = None
+    speed: Optional[float] = None
+
+
+@app.get("/replay")
+async def get_replay():
+    """Playback position and recorded range when serving a recording."""
+    if not replay_player:
+        raise HTTPException(status_code=404, detail="Not serving a replay")
+    return replay_player.get_status()
+
+
+@app.post("/replay")
+async def control_replay(request: ReplayRequest):
+    """Seek to a tick and/or change the playback speed."""
+    if not replay_player:
+        raise HTTPException(status_code=404, detail="Not serving a replay")
+    if request.speed is not None:
+        if request.speed <= 0:
+            raise HTTPException(status_code=422, detail="Speed must be positive")
+        replay_player.speed = request.speed
+    if request.tick is not None:
+        try:
+            replay_player.seek(request.tick)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    return replay_player.get_status()
+
+
+@app.get("/snapshot")
+async def get_snapshot():
+    """Current engine snapshot, e.g. to fork batch runs from a live simulation."""
+    if not simulation_engine:
+        raise HTTPException(status_code=404, detail="Not running the simulation")
+    return Response(
+        content=CheckpointStore.encode(simulation_engine.snapshot()),
+        media_type="application/octet-stream",
+        headers={"X-Tick": str(simulation_engine.tick_count)},
+    )
+
+
+@app.get("/shadow")
+async def get_shadow_stats():
+    """Divergence and speedup of shadow-checked decisions."""
+    if not shadow_checker:
+        raise HTTPException(status_code=404, detail="Shadow checking is disabled")
+    return shadow_checker.get_stats()
+
+
+class ProfileRequest(BaseModel):
+    ticks: int = 10
+    memory: bool = False
+    format: str = "json"
+
+
+@app.post("/profile")
+async def capture_profile(request: ProfileRequest):
+    """Sample the stacks of the next ticks; collapsed stacks plus an optional memory diff."""
+    if not tick_profiler:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not simulation_engine:
+        raise HTTPException(status_code=404, detail="Not running the simulation")
+    if not 1 <= request.ticks <= PROFILER_MAX_TICKS:
+        raise HTTPException(
+            status_code=422, detail=f"ticks must be 1 to {PROFILER_MAX_TICKS}"
+        )
+    if request.format not in ("json", "collapsed"):
+        raise HTTPException(status_code=422, detail="format must be json or collapsed")
+    if tick_profiler.busy:
+        raise HTTPException(status_code=409, detail="A capture is already running")
+
+    result = await tick_profiler.start(request.ticks, request.memory)
+    if request.format == "collapsed":
+        return PlainTextResponse(result["collapsed"])
+    return result
+
+
+@app.get("/events")
+async def get_events(limit: int = 100, kind: Optional[str] = None, since: int = None):
+    """Newest simulation events, optionally of one kind or after a sequence number."""
+    return {
+        **event_log.get_stats(),
+        "events": event_log.recent(min(max(limit, 1), 1000), kind, since),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Tick phase timings and hot path counters in the Prometheus text format."""
+    return PlainTextResponse(
+        tick_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/course")
+async def get_course(request: Request):
+    """Course geometry as cacheable JSON: the course_data message without flag positions."""
+    if simulation_engine:
+        course_payload.refresh(simulation_engine, TICK_INTERVAL_SECONDS)
+    if course_payload.version is None:
+        raise HTTPException(status_code=503, detail="Simulation not running")
+
+    headers = {
+        "ETag": course_payload.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if course_payload.matches(request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+
+    encoding = course_payload.pick_encoding(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        body = course_payload.encoded[encoding]
+    else:
+        body = course_payload.body
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/flags")
+async def get_flags():
+    """Current flag positions, which move during play and are not part of /course."""
+    if simulation_engine:
+        course_payload.refresh(simulation_engine, TICK_INTERVAL_SECONDS)
+    if course_payload.version is None:
+        raise HTTPException(status_code=503, detail="Simulation not running")
+    return {"flag_updates": course_payload.flag_updates()}
+
+
+@app.get("/connections")
+async def list_connections():
+    """Per-client send queue depth and drop counts."""
+    return {
+        "worker": {"pid": os.getpid(), "role": worker_role},
+        "connections": [
+            connection.get_stats() for connection in list(active_connections)
+        ],
+    }
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time game state updates."""
     await websocket.accept()
-    active_connections.add(websocket)
-    logger.info(f"Client connected. Total connections: {len(active_connections)}")
+    connection = ClientConnection(websocket)
+    connection.start()
+    active_connections.add(connection)
+    logger.info(
+        f"Client {connection.id} connected. Total connections: {len(active_connections)}"
+    )
 
     try:
-        course_data_dir = Path(__file__).parent / "data" / "course"
-        holes = []
-        hole_files = sorted(course_data_dir.glob("hole_*.json"))
-
-        for hole_file in hole_files:
-            with open(hole_file, "r") as f:
-                hole_data = json.load(f)
-                holes.append(hole_data)
-
-        # Load course-wide features
-        course_features = {}
-        for feature_name in ["water", "bridges"]:
-            feature_file = course_data_dir / f"{feature_name}.json"
-            with open(feature_file, "r") as f:
-                feature_json = json.load(f)
-                course_features[feature_name] = feature_json.get(feature_name, [])
-
-        await websocket.send_text(
-            json.dumps(
-                {
-                    "type": "course_data",
-                    "data": {
-                        "holes": holes,
-                        **course_features,
-                        "tick_interval": TICK_INTERVAL_SECONDS,
-                    },
-                }
-            )
-        )
-
         if simulation_engine:
-            game_state = simulation_engine.get_state()
-            await websocket.send_text(
-                json.dumps({"type": "gamestate", "data": game_state})
-            )
+            course_payload.refresh(simulation_engine, TICK_INTERVAL_SECONDS)
+        # Reconnecting clients skip geometry they already have, but not the flags
+        course_etag = websocket.query_params.get("course_etag", "")
+        if course_payload.version is not None:
+            if course_etag and course_payload.matches(course_etag):
+                connection.publish(course_payload.flags_message)
+            else:
+                connection.publish(course_payload.message)
+
+        catch_up = None
+        resume_tick = websocket.query_params.get("resume_tick")
+        if resume_tick and resume_tick.isdigit():
+            catch_up = tick_history.catch_up_message(int(resume_tick))
+
+        if catch_up:
+            connection.delta_enabled = True
+            connection.needs_keyframe = False
+            connection.publish(catch_up)
+        else:
+            game_state = current_game_state()
+            if game_state:
+                connection.publish_state(StateFrames(game_state))
 
         while True:
             data = await websocket.receive_text()
+            handle_client_message(connection, data)
 
     except WebSocketDisconnect:
-        logger.info("Client disconnected")
+        logger.info(f"Client {connection.id} disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        active_connections.discard(websocket)
-        logger.info(f"Client removed. Total connections: {len(active_connections)}")
+        active_connections.discard(connection)
+        await connection.close()
+        logger.info(
+            f"Client {connection.id} removed after sending {connection.sent} frames "
+            f"({connection.dropped} dropped). Total connections: {len(active_connections)}"
+        )
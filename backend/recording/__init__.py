@@ -0,0 +1,5 @@
+from backend.recording.tick_log import TickLogWriter, TickLogReader
+from backend.recording.replay import ReplayPlayer
+from backend.recording.columnar_export import ColumnarExporter
+
+__all__ = ["TickLogWriter", "TickLogReader", "ReplayPlayer", "ColumnarExporter"]
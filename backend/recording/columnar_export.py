@@ -0,0 +1,244 @@
+import csv
+import gzip
+import logging
+
+from array import array
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..constants import EXPORT_FLUSH_ROWS, EXPORT_FLUSH_TICKS, EXPORT_TRACK_INTERVAL
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# Column name and type per table; "i" int64, "d" float64, "b" bool, "s" string
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "shots": [
+        ("tick", "i"),
+        ("group_id", "i"),
+        ("hole", "i"),
+        ("player_id", "i"),
+        ("stroke_number", "i"),
+        ("club", "s"),
+        ("lie", "s"),
+        ("landing_lie", "s"),
+        ("old_x", "d"),
+        ("old_y", "d"),
+        ("new_x", "d"),
+        ("new_y", "d"),
+        ("distance_traveled", "d"),
+        ("distance_to_flag", "d"),
+        ("is_complete", "b"),
+        ("wind_direction", "d"),
+        ("wind_speed", "d"),
+    ],
+    "tracks": [
+        ("tick", "i"),
+        ("group_id", "i"),
+        ("hole", "i"),
+        ("player_id", "i"),
+        ("x", "d"),
+        ("y", "d"),
+        ("ball_x", "d"),
+        ("ball_y", "d"),
+        ("strokes", "i"),
+        ("state", "s"),
+    ],
+    "hole_completions": [
+        ("tick", "i"),
+        ("group_id", "i"),
+        ("hole", "i"),
+        ("player_id", "i"),
+        ("strokes", "i"),
+    ],
+}
+
+# Columns of these types buffer as compact typed arrays instead of lists
+ARRAY_TYPECODES = {"i": "q", "d": "d", "b": "b"}
+
+
+def available_format() -> str:
+    """Get the best columnar file format the installed packages can write."""
+    if pyarrow is not None:
+        return "parquet"
+    if numpy is not None:
+        return "npz"
+    return "csv"
+
+
+class ColumnarExporter:
+    """Buffers shots, player tracks and hole completions as columns.
+
+    Every table is flushed to a numbered part file in its own subdirectory
+    once it holds flush_rows rows or flush_ticks ticks have passed, so each
+    subdirectory reads as one dataset. Files are Parquet when pyarrow is
+    installed, compressed numpy .npz otherwise, and gzipped CSV as a last
+    resort. Writing happens on a background thread so the tick loop only
+    pays for appending to the buffers.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        file_format: Optional[str] = None,
+        flush_rows: int = EXPORT_FLUSH_ROWS,
+        flush_ticks: int = EXPORT_FLUSH_TICKS,
+        track_interval: int = EXPORT_TRACK_INTERVAL,
+    ):
+        self.directory = Path(directory)
+        for name in TABLES:
+            (self.directory / name).mkdir(parents=True, exist_ok=True)
+        self.file_format = file_format or available_format()
+        self.flush_rows = flush_rows
+        self.flush_ticks = flush_ticks
+        self.track_interval = track_interval
+        self.rows_written = {name: 0 for name in TABLES}
+        self._parts = {name: 0 for name in TABLES}
+        self._buffers = {name: self._empty_columns(name) for name in TABLES}
+        self._last_flush_tick = None
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        logger.info(f"Exporting {self.file_format} columns to {self.directory}")
+
+    @staticmethod
+    def _empty_columns(table: str) -> Dict[str, Any]:
+        return {
+            name: array(ARRAY_TYPECODES[kind]) if kind in ARRAY_TYPECODES else []
+            for name, kind in TABLES[table]
+        }
+
+    def record_tick(self, game_state: Dict[str, Any], events: List[Dict[str, Any]]):
+        """Append one tick's shot and hole completion events and player positions."""
+        tick = game_state["tick"]
+        shots = self._buffers["shots"]
+        completions = self._buffers["hole_completions"]
+
+        for event in events:
+            if event["type"] == "shot":
+                shots["tick"].append(tick)
+                shots["group_id"].append(event["group_id"])
+                shots["hole"].append(event["hole"])
+                shots["player_id"].append(event["player_id"])
+                shots["stroke_number"].append(event["stroke_number"])
+                shots["club"].append(event["club_used"])
+                shots["lie"].append(event["lie"])
+                shots["landing_lie"].append(event["landing_lie"])
+                shots["old_x"].append(event["old_position"]["x"])
+                shots["old_y"].append(event["old_position"]["y"])
+                shots["new_x"].append(event["new_position"]["x"])
+                shots["new_y"].append(event["new_position"]["y"])
+                shots["distance_traveled"].append(event["distance_traveled"])
+                shots["distance_to_flag"].append(event["distance_to_flag"])
+                shots["is_complete"].append(event["is_complete"])
+                shots["wind_direction"].append(event["wind"]["direction"])
+                shots["wind_speed"].append(event["wind"]["speed"])
+            elif event["type"] == "hole_complete":
+                for player_id, strokes in event["strokes"].items():
+                    completions["tick"].append(tick)
+                    completions["group_id"].append(event["group_id"])
+                    completions["hole"].append(event["hole"])
+                    completions["player_id"].append(player_id)
+                    completions["strokes"].append(strokes)
+
+        if tick % self.track_interval == 0:
+            tracks = self._buffers["tracks"]
+            for group in game_state["groups"]:
+                for player in group["players"]:
+                    tracks["tick"].append(tick)
+                    tracks["group_id"].append(group["id"])
+                    tracks["hole"].append(group["current_hole"])
+                    tracks["player_id"].append(player["id"])
+                    tracks["x"].append(player["position"]["x"])
+                    tracks["y"].append(player["position"]["y"])
+                    tracks["ball_x"].append(player["ball_position"]["x"])
+                    tracks["ball_y"].append(player["ball_position"]["y"])
+                    tracks["strokes"].append(player["strokes"])
+                    tracks["state"].append(player["state"])
+
+        if self._last_flush_tick is None:
+            self._last_flush_tick = tick
+        if tick - self._last_flush_tick >= self.flush_ticks:
+            self.flush()
+            self._last_flush_tick = tick
+        else:
+            for table, columns in self._buffers.items():
+                if len(columns["tick"]) >= self.flush_rows:
+                    self.flush(table)
+
+    def flush(self, table: Optional[str] = None):
+        """Hand buffered rows of one or all tables to the writer thread."""
+        for name in [table] if table else list(TABLES):
+            columns = self._buffers[name]
+            if not columns["tick"]:
+                continue
+            self._buffers[name] = self._empty_columns(name)
+            path = self.directory / name / f"part-{self._parts[name]:05d}"
+            self._parts[name] += 1
+            self.rows_written[name] += len(columns["tick"])
+            self._writer.submit(self._write, name, columns, path)
+
+    def _write(self, table: str, columns: Dict[str, Any], path: Path):
+        try:
+            if self.file_format == "parquet":
+                self._write_parquet(table, columns, path.with_suffix(".parquet"))
+            elif self.file_format == "npz":
+                self._write_npz(table, columns, path.with_suffix(".npz"))
+            else:
+                self._write_csv(table, columns, path.with_suffix(".csv.gz"))
+        except Exception as e:
+            logger.error(f"Failed to export {table} to {path}: {e}")
+
+    @staticmethod
+    def _write_parquet(table: str, columns: Dict[str, Any], path: Path):
+        types = {
+            "i": pyarrow.int64(),
+            "d": pyarrow.float64(),
+            "b": pyarrow.bool_(),
+            "s": pyarrow.string(),
+        }
+        arrays = [
+            pyarrow.array(
+                [bool(v) for v in columns[name]] if kind == "b" else columns[name],
+                type=types[kind],
+            )
+            for name, kind in TABLES[table]
+        ]
+        names = [name for name, _ in TABLES[table]]
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_arrays(arrays, names=names), path
+        )
+
+    @staticmethod
+    def _write_npz(table: str, columns: Dict[str, Any], path: Path):
+        dtypes = {"i": numpy.int64, "d": numpy.float64, "b": numpy.bool_, "s": str}
+        numpy.savez_compressed(
+            path,
+            **{
+                name: numpy.asarray(columns[name], dtype=dtypes[kind])
+                for name, kind in TABLES[table]
+            },
+        )
+
+    @staticmethod
+    def _write_csv(table: str, columns: Dict[str, Any], path: Path):
+        names = [name for name, _ in TABLES[table]]
+        with gzip.open(path, "wt", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(zip(*(columns[name] for name in names)))
+
+    def close(self):
+        """Flush the remaining rows and wait for all files to be written."""
+        self.flush()
+        self._writer.shutdown(wait=True)
+        logger.info(f"Exported {self.rows_written} rows to {self.directory}")
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+
+from typing import Any, Callable, Dict, Optional
+
+from .tick_log import TickLogReader
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayPlayer:
+    """Plays a recorded session back at any speed without running the simulation.
+
+    States and course data are handed to the same callbacks the live server
+    uses, so clients see the normal WebSocket protocol. Seeking jumps through
+    the tick log index.
+    """
+
+    def __init__(
+        self,
+        reader: TickLogReader,
+        on_course: Callable[[Dict[str, Any], int, bool], None],
+        on_state: Callable[[Dict[str, Any]], None],
+        tick_interval: float,
+        speed: float = 1.0,
+        start_tick: Optional[int] = None,
+    ):
+        self.reader = reader
+        self.on_course = on_course
+        self.on_state = on_state
+        self.tick_interval = tick_interval
+        self.speed = speed
+        self.tick = start_tick if start_tick is not None else reader.first_tick
+        self.course_version = 0
+        self._seek_to: Optional[int] = None
+        self._seek_requested = asyncio.Event()
+
+    def seek(self, tick: int):
+        """Continue playback from a tick."""
+        if not self.reader.first_tick <= tick <= self.reader.last_tick:
+            raise ValueError(
+                f"Tick {tick} is outside the recording "
+                f"({self.reader.first_tick}-{self.reader.last_tick})"
+            )
+        self._seek_to = tick
+        self._seek_requested.set()
+
+    async def run(self):
+        """Play from the current tick until cancelled, restarting wherever seek points."""
+        start_tick = self.tick
+        while True:
+            self._seek_to = None
+            self._seek_requested.clear()
+            course, flags = None, None
+
+            for kind, payload in self.reader.iter_ticks(start_tick):
+                if kind == "course":
+                    course = payload
+                    # The opening course is published once its flags are known
+                    if flags is not None:
+                        self._publish_course(course, flags, push=True)
+                elif kind == "flags":
+                    flags = payload
+                    self._publish_course(course, flags, push=True)
+                elif kind == "state":
+                    self.tick = payload["tick"]
+                    moves = payload.get("flag_updates") or [payload.get("flag_update")]
+                    # Clients and the course payload get moves from the gamestate;
+                    # these flags only go with a course recorded later on
+                    for flag_update in moves:
+                        if flag_update and self.tick != start_tick:
+                            flags[flag_update["hole"]] = flag_update["position"]
+                    self.on_state(payload)
+
+                    try:
+                        await asyncio.wait_for(
+                            self._seek_requested.wait(),
+                            self.tick_interval / self.speed,
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    if self._seek_to is not None:
+                        break
+            else:
+                logger.info(f"Replay reached the end of the recording at {self.tick}")
+                await self._seek_requested.wait()
+
+            start_tick = self._seek_to
+
+    def _publish_course(self, course, flags, push: bool):
+        holes = [
+            {**hole, "flag": flags.get(number, hole.get("flag"))}
+            for number, hole in enumerate(course.get("holes", []), 1)
+        ]
+        self.course_version += 1
+        self.on_course({**course, "holes": holes}, self.course_version, push)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the playback position, recorded range and speed."""
+        return {
+            "tick": self.tick,
+            "first_tick": self.reader.first_tick,
+            "last_tick": self.reader.last_tick,
+            "speed": self.speed,
+        }
@@ -0,0 +1,295 @@
+import os
+import json
+import zlib
+import bisect
+import struct
+import logging
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..server.state_delta import StateDeltaEncoder
+from ..constants import TICK_LOG_KEYFRAME_INTERVAL, TICK_LOG_MAX_FILE_BYTES
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GOLFTLOG"
+LOG_VERSION = 1
+FILE_HEADER = struct.Struct("<8sHII")  # magic, version, keyframe interval, first tick
+RECORD_HEADER = struct.Struct("<BII")  # kind, tick, payload length
+INDEX_ENTRY = struct.Struct("<IQQ")  # keyframe tick, keyframe offset, course offset
+
+# Record payloads are zlib-compressed JSON
+KIND_COURSE = 1  # course data as served to clients
+KIND_KEYFRAME = 2  # {"state": full gamestate, "flags": {hole: position}}
+KIND_DELTA = 3  # StateDeltaEncoder delta against the previous tick
+KIND_EVENTS = 4  # list of engine tick events
+
+
+def _log_path(directory: Path, first_tick: int) -> Path:
+    return directory / f"ticks-{first_tick:010d}.log"
+
+
+class TickLogWriter:
+    """Appends one recording session as size-rotated tick log files.
+
+    Every file starts with the course data and a keyframe, and keyframes
+    follow every keyframe_interval ticks after that. A fixed-size index file
+    next to each log maps every keyframe tick to its offset, so a reader finds
+    any tick with a binary search instead of a scan.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        keyframe_interval: int = TICK_LOG_KEYFRAME_INTERVAL,
+        max_file_bytes: int = TICK_LOG_MAX_FILE_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+        self.max_file_bytes = max_file_bytes
+        self.encoder = StateDeltaEncoder(keyframe_interval)
+        self.course: Optional[Dict[str, Any]] = None
+        self._log = None
+        self._index = None
+        self._course_offset = 0
+        self._last_tick = 0
+
+    def record_course(self, course_data: Dict[str, Any]):
+        """Record course data, e.g. after an obstacle change; written before the next tick."""
+        self.course = course_data
+        if self._log is not None:
+            self._course_offset = self._write(KIND_COURSE, self._last_tick, course_data)
+
+    def record_tick(
+        self,
+        game_state: Dict[str, Any],
+        events: List[Dict[str, Any]],
+        flags: Dict[int, Dict[str, float]],
+    ):
+        """Append a tick's state as a keyframe or delta, followed by its events."""
+        if self._log is None or self._log.tell() >= self.max_file_bytes:
+            self._rotate(game_state["tick"])
+
+        tick = game_state["tick"]
+        delta = self.encoder.encode(game_state)
+        if delta is None:
+            offset = self._write(
+                KIND_KEYFRAME, tick, {"state": game_state, "flags": flags}
+            )
+            self._index.write(INDEX_ENTRY.pack(tick, offset, self._course_offset))
+            self._log.flush()
+            self._index.flush()
+        else:
+            self._write(KIND_DELTA, tick, delta)
+
+        if events:
+            self._write(KIND_EVENTS, tick, events)
+        self._last_tick = tick
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._index.close()
+            self._log = self._index = None
+
+    def _rotate(self, first_tick: int):
+        self.close()
+        path = _log_path(self.directory, first_tick)
+        self._log = open(path, "wb")
+        self._index = open(path.with_suffix(".idx"), "wb")
+        self._log.write(
+            FILE_HEADER.pack(MAGIC, LOG_VERSION, self.keyframe_interval, first_tick)
+        )
+        self._course_offset = self._write(
+            KIND_COURSE, max(first_tick - 1, 0), self.course or {}
+        )
+        self.encoder.force_keyframe()
+        logger.info(f"Recording ticks from {first_tick} to {path}")
+
+    def _write(self, kind: int, tick: int, payload: Any) -> int:
+        offset = self._log.tell()
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        self._log.write(RECORD_HEADER.pack(kind, tick, len(body)))
+        self._log.write(body)
+        return offset
+
+
+class TickLogReader:
+    """Random access to a recorded session without re-running the simulation."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.paths: List[Path] = []
+        self.first_ticks: List[int] = []
+        # Scan position in the newest file and the last tick found up to it
+        self._tail_offset = FILE_HEADER.size
+        self._last_tick = None
+        # Per log file: (index size read, keyframe ticks, index entries)
+        self._indexes: Dict[Path, tuple] = {}
+        self._list_files()
+        if not self.paths:
+            raise FileNotFoundError(f"No tick logs in {directory}")
+
+    def _list_files(self):
+        """Pick up log files the writer rotated to since the last read."""
+        paths = sorted(self.directory.glob("ticks-*.log"))
+        if paths == self.paths:
+            return
+        self.paths = paths
+        self.first_ticks = [int(path.stem.split("-")[1]) for path in paths]
+        # Records are only appended to the newest file, so scan that one from its start
+        self._tail_offset = FILE_HEADER.size
+        self._last_tick = max(self._last_tick or 0, self.first_ticks[-1])
+
+    @property
+    def first_tick(self) -> int:
+        return self.first_ticks[0]
+
+    @property
+    def last_tick(self) -> int:
+        """Last tick with a complete record; only records appended since the last call are read."""
+        self._list_files()
+        for _, tick, length, offset in self._records(self.paths[-1], self._tail_offset):
+            self._last_tick = max(self._last_tick, tick)
+            self._tail_offset = offset + RECORD_HEADER.size + length
+        return self._last_tick
+
+    def seek(
+        self, tick: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[int, Dict[str, float]]]:
+        """Get (course data, gamestate, flags) at a tick: one index lookup plus < keyframe_interval deltas."""
+        path, keyframe_offset, course_offset = self._locate(tick)
+
+        with open(path, "rb") as log:
+            course = self._read_at(log, course_offset)[2]
+            state = flags = None
+            for kind, record_tick, payload in self._read_from(log, keyframe_offset):
+                if record_tick > tick:
+                    break
+                if kind == KIND_KEYFRAME:
+                    state = payload["state"]
+                    flags = {
+                        int(hole): position
+                        for hole, position in payload["flags"].items()
+                    }
+                elif kind == KIND_DELTA:
+                    state = StateDeltaEncoder.apply(state, payload)
+                    for flag_update in payload.get("flag_updates") or [
+                        payload.get("flag_update")
+                    ]:
+                        if flag_update:
+                            flags[flag_update["hole"]] = flag_update["position"]
+                elif kind == KIND_COURSE:
+                    course = payload
+
+        if state is None or state["tick"] != tick:
+            raise ValueError(f"Tick {tick} is past the end of the recording")
+        return course, state, flags
+
+    def iter_ticks(self, start_tick: int) -> Iterator[Tuple[str, Any]]:
+        """Yield ("course", data), ("state", gamestate) and ("events", list) in recorded order from a tick.
+
+        Starts with the course, the flag positions ("flags") and the state at start_tick.
+        """
+        course, state, flags = self.seek(start_tick)
+        yield "course", course
+        yield "flags", flags
+        yield "state", state
+
+        path, keyframe_offset, _ = self._locate(start_tick)
+        file_number = self.paths.index(path)
+        for number, path in enumerate(self.paths[file_number:], file_number):
+            with open(path, "rb") as log:
+                if number == file_number:
+                    records = self._read_from(log, keyframe_offset)
+                else:
+                    # Skip the opening course record, a copy of the current course
+                    log.seek(FILE_HEADER.size)
+                    kind, tick, length = RECORD_HEADER.unpack(
+                        log.read(RECORD_HEADER.size)
+                    )
+                    records = self._read_from(
+                        log, FILE_HEADER.size + RECORD_HEADER.size + length
+                    )
+
+                for kind, tick, payload in records:
+                    if kind in (KIND_KEYFRAME, KIND_DELTA):
+                        if tick <= state["tick"]:
+                            continue
+                        if kind == KIND_KEYFRAME:
+                            state = payload["state"]
+                        else:
+                            state = StateDeltaEncoder.apply(state, payload)
+                        yield "state", state
+                    elif kind == KIND_COURSE and tick > start_tick:
+                        yield "course", payload
+                    elif kind == KIND_EVENTS and tick >= start_tick:
+                        yield "events", payload
+
+    def _locate(self, tick: int) -> Tuple[Path, int, int]:
+        """Find the log file, keyframe offset and course offset for a tick."""
+        self._list_files()
+        file_number = bisect.bisect_right(self.first_ticks, tick) - 1
+        if file_number < 0:
+            raise ValueError(f"Tick {tick} is before the recording starts")
+        path = self.paths[file_number]
+
+        ticks, entries = self._keyframes(path)
+        entry_number = bisect.bisect_right(ticks, tick) - 1
+        if entry_number < 0:
+            raise ValueError(f"Tick {tick} is past the end of the recording")
+
+        _, keyframe_offset, course_offset = entries[entry_number]
+        return path, keyframe_offset, course_offset
+
+    def _keyframes(self, path: Path) -> Tuple[List[int], List[Tuple[int, int, int]]]:
+        """Keyframe ticks and index entries of a log file, re-read only when its index grew."""
+        index_path = path.with_suffix(".idx")
+        size = os.path.getsize(index_path)
+        cached = self._indexes.get(path)
+        if cached is None or cached[0] != size:
+            with open(index_path, "rb") as index:
+                # Drop an entry cut short by a crash
+                raw = index.read(size - size % INDEX_ENTRY.size)
+            entries = list(INDEX_ENTRY.iter_unpack(raw))
+            cached = self._indexes[path] = (
+                size,
+                [entry[0] for entry in entries],
+                entries,
+            )
+        return cached[1], cached[2]
+
+    @staticmethod
+    def _read_at(log, offset: int) -> Tuple[int, int, Any]:
+        log.seek(offset)
+        kind, tick, length = RECORD_HEADER.unpack(log.read(RECORD_HEADER.size))
+        return kind, tick, json.loads(zlib.decompress(log.read(length)))
+
+    @staticmethod
+    def _read_from(log, offset: int) -> Iterator[Tuple[int, int, Any]]:
+        log.seek(offset)
+        while True:
+            header = log.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            kind, tick, length = RECORD_HEADER.unpack(header)
+            body = log.read(length)
+            if len(body) < length:
+                # A record cut short by a crash ends the log
+                return
+            yield kind, tick, json.loads(zlib.decompress(body))
+
+    @staticmethod
+    def _records(path: Path, offset: int) -> Iterator[Tuple[int, int, int, int]]:
+        """Walk record headers without decoding payloads: (kind, tick, length, offset)."""
+        size = os.path.getsize(path)
+        with open(path, "rb") as log:
+            while offset + RECORD_HEADER.size <= size:
+                log.seek(offset)
+                kind, tick, length = RECORD_HEADER.unpack(log.read(RECORD_HEADER.size))
+                if offset + RECORD_HEADER.size + length > size:
+                    return
+                yield kind, tick, length, offset
+                offset += RECORD_HEADER.size + length
@@ -0,0 +1,270 @@
+import json
+import time
+import logging
+import argparse
+
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.loader import prepare_course_data
+from backend.simulation import SimulationEngine
+from backend.agents.shot_utility import ShotUtility
+from backend.utils.calculations import Calculations
+from backend.utils.polygon_lod import PolygonLOD
+from backend.utils.random_stream import RandomStream
+from backend.utils.shadow import diff_results, exact_geometry
+
+logger = logging.getLogger(__name__)
+
+# Margin in meters around a hole's polygons where random ball positions are drawn
+POSITION_MARGIN = 30.0
+
+# Mismatches listed per check in the report
+REPORTED_MISMATCHES = 5
+
+
+class EquivalenceCheck:
+    """A reference and a candidate implementation compared on generated inputs."""
+
+    def __init__(
+        self,
+        name: str,
+        generate: Callable[[RandomStream], tuple],
+        reference: Callable,
+        candidate: Callable,
+    ):
+        self.name = name
+        self.generate = generate
+        self.reference = reference
+        self.candidate = candidate
+
+
+class EquivalenceHarness:
+    """Drives reference and candidate implementations with the same seeded inputs.
+
+    Inputs come from the loaded course: its real polygons, holes, flags and
+    navigation waypoints, and random ball positions around the holes. An
+    optimized implementation is verified by registering it as the candidate
+    against the pure Python reference.
+    """
+
+    def __init__(self, engine: SimulationEngine, seed: int = 0):
+        self.engine = engine
+        self.seed = seed
+        self.checks: Dict[str, EquivalenceCheck] = {}
+        self.hole_numbers = sorted(
+            number for number, hole in engine.holes.items() if "flag" in hole
+        )
+        self.hole_bounds = {
+            number: self._hole_bounds(engine.holes[number])
+            for number in self.hole_numbers
+        }
+
+    @staticmethod
+    def _hole_bounds(hole_data: Dict[str, Any]) -> List[float]:
+        points = list(hole_data.get("fairway", [])) + list(hole_data.get("green", []))
+        for polygon in hole_data.get("tees", []):
+            points.extend(polygon)
+        min_x, min_y, max_x, max_y = PolygonLOD.bounding_box(points)
+        return [
+            min_x - POSITION_MARGIN,
+            min_y - POSITION_MARGIN,
+            max_x + POSITION_MARGIN,
+            max_y + POSITION_MARGIN,
+        ]
+
+    def register(self, check: EquivalenceCheck):
+        """Add or replace a check."""
+        self.checks[check.name] = check
+
+    def random_hole(self, rng: RandomStream) -> int:
+        """Draw a hole number."""
+        return self.hole_numbers[rng.randint(0, len(self.hole_numbers) - 1)]
+
+    def random_position(self, rng: RandomStream, hole_number: int) -> Dict[str, float]:
+        """Draw a ball position around a hole."""
+        min_x, min_y, max_x, max_y = self.hole_bounds[hole_number]
+        return {"x": rng.uniform(min_x, max_x), "y": rng.uniform(min_y, max_y)}
+
+    def run(self, cases: int, names: List[str] = None) -> Dict[str, Any]:
+        """Run every (or the named) check on the same inputs for both sides."""
+        report = {}
+        for name in names or list(self.checks):
+            check = self.checks[name]
+            rng = RandomStream(self.seed, f"equivalence:{name}")
+            mismatches = []
+            reference_seconds = candidate_seconds = 0.0
+
+            for case in range(cases):
+                args = check.generate(rng)
+
+                started = time.perf_counter()
+                expected = check.reference(*args)
+                reference_seconds += time.perf_counter() - started
+
+                started = time.perf_counter()
+                result = check.candidate(*args)
+                candidate_seconds += time.perf_counter() - started
+
+                difference = diff_results(expected, result)
+                if difference:
+                    mismatches.append({"case": case, "difference": difference})
+
+            report[name] = {
+                "cases": cases,
+                "mismatches": len(mismatches),
+                "examples": mismatches[:REPORTED_MISMATCHES],
+                "reference_seconds": round(reference_seconds, 6),
+                "candidate_seconds": round(candidate_seconds, 6),
+                "speedup": (
+                    round(reference_seconds / candidate_seconds, 3)
+                    if candidate_seconds
+                    else None
+                ),
+            }
+            logger.info(
+                f"{name}: {len(mismatches)}/{cases} mismatches, "
+                f"speedup {report[name]['speedup']}"
+            )
+        return report
+
+    def register_defaults(self):
+        """Register the LOD geometry and search implementations against their exact references."""
+        engine = self.engine
+        polygons = list(engine.water) + list(engine.bridges)
+        for hole_data in engine.holes.values():
+            polygons.extend(
+                hole_data[name] for name in ("fairway", "green") if name in hole_data
+            )
+            polygons.extend(hole_data.get("tees", []) + hole_data.get("bunkers", []))
+        polygons = [polygon for polygon in polygons if polygon]
+
+        def polygon_case(rng: RandomStream) -> tuple:
+            polygon = polygons[rng.randint(0, len(polygons) - 1)]
+            min_x, min_y, max_x, max_y = PolygonLOD.bounding_box(polygon)
+            margin_x, margin_y = (max_x - min_x) * 0.1, (max_y - min_y) * 0.1
+            point = {
+                "x": rng.uniform(min_x - margin_x, max_x + margin_x),
+                "y": rng.uniform(min_y - margin_y, max_y + margin_y),
+            }
+            return point, polygon
+
+        self.register(
+            EquivalenceCheck(
+                "point_in_polygon",
+                polygon_case,
+                Calculations.point_in_polygon,
+                PolygonLOD.contains,
+            )
+        )
+
+        def lie_case(rng: RandomStream) -> tuple:
+            hole_number = self.random_hole(rng)
+            position = self.random_position(rng, hole_number)
+            return position, engine.holes[hole_number], engine.water
+
+        self.register(
+            EquivalenceCheck(
+                "determine_lie",
+                lie_case,
+                exact(ShotUtility.determine_lie),
+                ShotUtility.determine_lie,
+            )
+        )
+
+        def shot_case(rng: RandomStream) -> tuple:
+            hole_number = self.random_hole(rng)
+            hole_data = engine.holes[hole_number]
+            # Balls never come to rest in water, so neither do generated ones
+            lie = "water"
+            while lie == "water":
+                position = self.random_position(rng, hole_number)
+                with exact_geometry():
+                    lie = ShotUtility.determine_lie(position, hole_data, engine.water)
+            wind = {
+                "direction": round(rng.uniform(0, 360), 1),
+                "speed": round(rng.uniform(0, 15), 1),
+            }
+            return (
+                position,
+                lie,
+                rng.uniform(0.75, 0.95),
+                hole_data,
+                wind,
+                rng.uniform(0.7, 0.9),
+                engine.water,
+                hole_number,
+                engine.holes,
+            )
+
+        self.register(
+            EquivalenceCheck(
+                "select_best_shot",
+                shot_case,
+                exact(ShotUtility.select_best_shot),
+                ShotUtility.select_best_shot,
+            )
+        )
+
+        pathfinder = engine._get_pathfinder()
+        if not pathfinder.graph:
+            logger.info("No navigation graph cached, skipping the shortest_path check")
+            return
+
+        def path_case(rng: RandomStream) -> tuple:
+            last = len(pathfinder.waypoints) - 1
+            return rng.randint(0, last), rng.randint(0, last)
+
+        self.register(
+            EquivalenceCheck(
+                "shortest_path",
+                path_case,
+                lambda start, goal: path_length(
+                    pathfinder, pathfinder._astar(start, goal)
+                ),
+                lambda start, goal: path_length(
+                    pathfinder, pathfinder._lazy_astar(start, goal)
+                ),
+            )
+        )
+
+
+def exact(function: Callable) -> Callable:
+    """Wrap a function to run with exact polygon tests."""
+
+    def reference(*args):
+        with exact_geometry():
+            return function(*args)
+
+    return reference
+
+
+def path_length(pathfinder, waypoint_path: Optional[List[int]]) -> Optional[float]:
+    """Total length of a waypoint index path, or None if there is no path."""
+    if waypoint_path is None:
+        return None
+    points = [pathfinder.waypoints[i] for i in waypoint_path]
+    return sum(Calculations.get_distance(a, b) for a, b in zip(points, points[1:]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare optimized implementations against their pure Python references."
+    )
+    parser.add_argument("--cases", type=int, default=200, help="Inputs per check")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the inputs")
+    parser.add_argument(
+        "--check", action="append", help="Run only this check (repeatable)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    prepare_course_data()
+    harness = EquivalenceHarness(SimulationEngine(), seed=args.seed)
+    harness.register_defaults()
+    report = harness.run(args.cases, args.check)
+    print(json.dumps(report, indent=2))
+
+    if any(result["mismatches"] for result in report.values()):
+        raise SystemExit(1)
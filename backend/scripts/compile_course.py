@@ -0,0 +1,33 @@
+import logging
+from pathlib import Path
+
+from backend.simulation import SimulationEngine
+from backend.utils.course_artifact import ARTIFACT_FILE, CourseArtifact, source_digest
+
+logger = logging.getLogger(__name__)
+
+
+def compile_course(path: Path = ARTIFACT_FILE) -> Path:
+    """Compile converted course data and navigation paths into one binary artifact."""
+    engine = SimulationEngine(use_artifact=False)
+
+    # Digest after loading: computing missing paths writes the navigation cache
+    CourseArtifact.write(
+        path,
+        engine.holes,
+        engine.water,
+        engine.bridges,
+        engine.water_lod,
+        engine.bridges_lod,
+        engine.greenkeeper_paths,
+        engine.navigation_graph,
+        source_digest(),
+    )
+
+    logger.info(f"Compiled course artifact: {path} ({path.stat().st_size} bytes)")
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    compile_course()
@@ -1,20 +1,47 @@
 import json
+import hashlib
 import logging
+import argparse
 from pathlib import Path
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
-from pyproj import Transformer
+
+from backend.constants import POLYGON_LOD_COARSE_TOLERANCE
+from backend.utils.polygon_lod import PolygonLOD
 
 logger = logging.getLogger(__name__)
 
-# Create transformer from WGS84 (lat/lon) to UTM Zone 33N (Sweden)
-# EPSG:4326 = WGS84 (latitude/longitude)
-# EPSG:32633 = WGS84 / UTM zone 33N
-transformer = Transformer.from_crs("EPSG:4326", "EPSG:32633", always_xy=True)
+
+RAW_DATA_DIR = Path(__file__).parent.parent / "data" / "geojson"
+COURSE_DATA_DIR = Path(__file__).parent.parent / "data" / "course"
+MANIFEST_FILE = COURSE_DATA_DIR / "manifest.json"
+
+# Bump when the output format changes so existing course data is reconverted
+MANIFEST_VERSION = 2
+
+COURSE_FEATURES = ["water", "bridges"]
+HOLE_FEATURE_FILES = [
+    "fairway.geojson",
+    "green.geojson",
+    "tees.geojson",
+    "bunkers.geojson",
+]
+
+
+@lru_cache(maxsize=None)
+def get_transformer():
+    """Create the projection on first use, so importing this module stays cheap."""
+    from pyproj import Transformer
+
+    # Create transformer from WGS84 (lat/lon) to UTM Zone 33N (Sweden)
+    # EPSG:4326 = WGS84 (latitude/longitude)
+    # EPSG:32633 = WGS84 / UTM zone 33N
+    return Transformer.from_crs("EPSG:4326", "EPSG:32633", always_xy=True)
 
 
 def convert_lonlat_to_utm(lon: float, lat: float) -> tuple[float, float]:
     """Convert longitude/latitude to UTM x/y in meters."""
-    return transformer.transform(lon, lat)
+    return get_transformer().transform(lon, lat)
 
 
 def convert_coordinates_to_points(
@@ -24,13 +51,36 @@ def convert_coordinates_to_points(
     if origin_utm is None and coordinates:
         origin_utm = convert_lonlat_to_utm(coordinates[0][0], coordinates[0][1])
 
-    points = []
-    for coord in coordinates:
-        x_utm, y_utm = convert_lonlat_to_utm(coord[0], coord[1])
+    [points] = convert_polygons_to_points([coordinates], origin_utm)
+    return points, origin_utm
+
+
+def convert_polygons_to_points(
+    polygons: List[List[List[float]]], origin_utm: tuple[float, float]
+) -> List[List[Dict[str, float]]]:
+    """Convert many coordinate lists to points with a single batched projection."""
+    lons = [coord[0] for polygon in polygons for coord in polygon]
+    lats = [coord[1] for polygon in polygons for coord in polygon]
+    if not lons:
+        return [[] for _ in polygons]
+
+    xs, ys = get_transformer().transform(lons, lats)
+    origin_x, origin_y = origin_utm
+
+    converted = []
+    offset = 0
+    for polygon in polygons:
+        end = offset + len(polygon)
         # Convert to relative coordinates (meters from origin)
-        points.append({"x": x_utm - origin_utm[0], "y": y_utm - origin_utm[1]})
+        converted.append(
+            [
+                {"x": x - origin_x, "y": y - origin_y}
+                for x, y in zip(xs[offset:end], ys[offset:end])
+            ]
+        )
+        offset = end
 
-    return points, origin_utm
+    return converted
 
 
 def extract_polygons(
@@ -65,67 +115,45 @@ def convert_hole_data(
     hole_number: int, origin_utm: Optional[tuple[float, float]] = None
 ) -> tuple[Dict[str, Any], Optional[tuple[float, float]]]:
     """Convert raw GeoJSON files for a hole to frontend format."""
-    raw_data_dir = Path(__file__).parent.parent / "data" / "geojson"
-    hole_dir = raw_data_dir / f"hole_{hole_number:02d}"
+    hole_dir = RAW_DATA_DIR / f"hole_{hole_number:02d}"
 
     if not hole_dir.exists():
         raise ValueError(f"Hole directory not found: {hole_dir}")
 
-    hole_data = {}
-
-    # Process fairway
-    fairway_path = hole_dir / "fairway.geojson"
-    if fairway_path.exists():
-        if fairway_path.stat().st_size == 0:
-            raise ValueError(f"Empty file: {fairway_path}")
-        with open(fairway_path, "r") as f:
-            fairway_geojson = json.load(f)
-        fairway_coords = extract_polygons(fairway_geojson, flatten=True)
-        hole_data["fairway"], origin_utm = convert_coordinates_to_points(
-            fairway_coords, origin_utm
-        )
+    # Read every feature first so all coordinates are projected in one call
+    sections = []
+    for name, flatten in [
+        ("fairway", True),
+        ("green", True),
+        ("tees", False),
+        ("bunkers", False),
+    ]:
+        feature_path = hole_dir / f"{name}.geojson"
+        if not feature_path.exists():
+            continue
+        if feature_path.stat().st_size == 0:
+            raise ValueError(f"Empty file: {feature_path}")
+        with open(feature_path, "r") as f:
+            feature_geojson = json.load(f)
+
+        if flatten:
+            polygons = [extract_polygons(feature_geojson, flatten=True)]
+        else:
+            polygons = extract_polygons(feature_geojson)
+        sections.append((name, flatten, polygons))
+
+    if origin_utm is None:
+        first_coords = [p[0] for _, _, polygons in sections for p in polygons if p]
+        if first_coords:
+            origin_utm = convert_lonlat_to_utm(first_coords[0][0], first_coords[0][1])
+
+    all_polygons = [p for _, _, polygons in sections for p in polygons]
+    converted = iter(convert_polygons_to_points(all_polygons, origin_utm))
 
-    # Process green
-    green_path = hole_dir / "green.geojson"
-    if green_path.exists():
-        if green_path.stat().st_size == 0:
-            raise ValueError(f"Empty file: {green_path}")
-        with open(green_path, "r") as f:
-            green_geojson = json.load(f)
-        green_coords = extract_polygons(green_geojson, flatten=True)
-        hole_data["green"], origin_utm = convert_coordinates_to_points(
-            green_coords, origin_utm
-        )
-
-    # Process tees
-    tees_path = hole_dir / "tees.geojson"
-    if tees_path.exists():
-        if tees_path.stat().st_size == 0:
-            raise ValueError(f"Empty file: {tees_path}")
-        with open(tees_path, "r") as f:
-            tees_geojson = json.load(f)
-        tees_polygons = extract_polygons(tees_geojson)
-        tees_data = []
-        for tee in tees_polygons:
-            tee_points, origin_utm = convert_coordinates_to_points(tee, origin_utm)
-            tees_data.append(tee_points)
-        hole_data["tees"] = tees_data
-
-    # Process bunkers
-    bunkers_path = hole_dir / "bunkers.geojson"
-    if bunkers_path.exists():
-        if bunkers_path.stat().st_size == 0:
-            raise ValueError(f"Empty file: {bunkers_path}")
-        with open(bunkers_path, "r") as f:
-            bunkers_geojson = json.load(f)
-        bunkers_polygons = extract_polygons(bunkers_geojson)
-        bunkers_data = []
-        for bunker in bunkers_polygons:
-            bunker_points, origin_utm = convert_coordinates_to_points(
-                bunker, origin_utm
-            )
-            bunkers_data.append(bunker_points)
-        hole_data["bunkers"] = bunkers_data
+    hole_data = {}
+    for name, flatten, polygons in sections:
+        points = [next(converted) for _ in polygons]
+        hole_data[name] = points[0] if flatten else points
 
     # Initial flag position set to the center of green as default
     # Note: Flag position will be managed by the green-keeper agent at runtime
@@ -135,9 +163,10 @@ def convert_hole_data(
         avg_y = sum(p["y"] for p in green_points) / len(green_points)
         hole_data["flag"] = {"x": avg_x, "y": avg_y}
 
-    output_dir = Path(__file__).parent.parent / "data" / "course"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_file = output_dir / f"hole_{hole_number:02d}.json"
+    hole_data["lod"] = build_feature_lods(hole_data)
+
+    COURSE_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = COURSE_DATA_DIR / f"hole_{hole_number:02d}.json"
 
     with open(output_file, "w") as f:
         json.dump(hole_data, f, indent=4)
@@ -145,12 +174,26 @@ def convert_hole_data(
     return hole_data, origin_utm
 
 
+def build_feature_lods(hole_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build collision hulls and coarse client rings for every polygon of a hole."""
+    lods = {}
+    for name in ("fairway", "green"):
+        if name in hole_data:
+            lods[name] = PolygonLOD.build(hole_data[name], POLYGON_LOD_COARSE_TOLERANCE)
+    for name in ("tees", "bunkers"):
+        if name in hole_data:
+            lods[name] = [
+                PolygonLOD.build(polygon, POLYGON_LOD_COARSE_TOLERANCE)
+                for polygon in hole_data[name]
+            ]
+    return lods
+
+
 def convert_course_feature(
     feature_name: str, origin_utm: tuple[float, float]
 ) -> Dict[str, Any]:
     """Convert a course-wide GeoJSON feature (water, bridges, etc.) to frontend format."""
-    raw_data_dir = Path(__file__).parent.parent / "data" / "geojson"
-    feature_path = raw_data_dir / f"{feature_name}.geojson"
+    feature_path = RAW_DATA_DIR / f"{feature_name}.geojson"
 
     if not feature_path.exists():
         logger.warning(f"No {feature_name}.geojson file found")
@@ -160,17 +203,18 @@ def convert_course_feature(
         feature_geojson = json.load(f)
 
     feature_polygons = extract_polygons(feature_geojson)
-    feature_data = []
+    feature_data = convert_polygons_to_points(feature_polygons, origin_utm)
 
-    for polygon in feature_polygons:
-        polygon_points, _ = convert_coordinates_to_points(polygon, origin_utm)
-        feature_data.append(polygon_points)
+    feature_output = {
+        feature_name: feature_data,
+        f"{feature_name}_lod": [
+            PolygonLOD.build(polygon, POLYGON_LOD_COARSE_TOLERANCE)
+            for polygon in feature_data
+        ],
+    }
 
-    feature_output = {feature_name: feature_data}
-
-    output_dir = Path(__file__).parent.parent / "data" / "course"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_file = output_dir / f"{feature_name}.json"
+    COURSE_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = COURSE_DATA_DIR / f"{feature_name}.json"
 
     with open(output_file, "w") as f:
         json.dump(feature_output, f, indent=4)
@@ -179,23 +223,164 @@ def convert_course_feature(
     return feature_output
 
 
-def convert_all_holes() -> None:
-    """Convert all available holes from raw GeoJSON to frontend format."""
-    raw_data_dir = Path(__file__).parent.parent / "data" / "geojson"
+def hash_file(path: Path) -> Optional[str]:
+    """Get the SHA-256 hex digest of a file, or None if it does not exist."""
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def hash_hole_sources(hole_dir: Path) -> Dict[str, Optional[str]]:
+    """Hash every raw GeoJSON file a hole is converted from."""
+    return {name: hash_file(hole_dir / name) for name in HOLE_FEATURE_FILES}
+
+
+def find_origin_lonlat(hole_dirs: List[Path]) -> Optional[List[float]]:
+    """Find the raw coordinate the shared origin is projected from.
+
+    Mirrors convert_hole_data: the first coordinate of the first feature of the
+    first hole. Only parses JSON, so checking it does not need a projection.
+    """
+    for hole_dir in hole_dirs[:1]:
+        for name in HOLE_FEATURE_FILES:
+            path = hole_dir / name
+            if not path.exists() or path.stat().st_size == 0:
+                continue
+            with open(path, "r") as f:
+                geojson = json.load(f)
+            coords = extract_polygons(geojson, flatten=True)
+            if coords:
+                return list(coords[0][:2])
+    return None
+
+
+def load_manifest() -> Dict[str, Any]:
+    """Load the conversion manifest, or an empty one if missing or outdated."""
+    empty = {"version": MANIFEST_VERSION, "origin": None, "holes": {}, "features": {}}
+    if not MANIFEST_FILE.exists():
+        return empty
+
+    try:
+        with open(MANIFEST_FILE, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read conversion manifest: {e}")
+        return empty
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def save_manifest(manifest: Dict[str, Any]) -> None:
+    """Write the conversion manifest next to the converted course data."""
+    COURSE_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=4)
 
+
+def convert_all_holes(force: bool = False) -> bool:
+    """Convert raw GeoJSON to frontend format, skipping holes whose sources are unchanged.
+
+    Returns True if any course data file was (re)written or removed.
+    """
     hole_dirs = sorted(
-        [d for d in raw_data_dir.iterdir() if d.is_dir() and d.name.startswith("hole_")]
+        [d for d in RAW_DATA_DIR.iterdir() if d.is_dir() and d.name.startswith("hole_")]
     )
 
-    origin_utm = None
-    converted_count = 0
+    manifest = {} if force else load_manifest()
+    origin = manifest.get("origin")
+    origin_lonlat = find_origin_lonlat(hole_dirs)
+
+    # A moved origin shifts every converted coordinate, so everything is redone
+    if not origin or origin["lonlat"] != origin_lonlat:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "origin": None,
+            "holes": {},
+            "features": {},
+        }
+        origin_utm = None
+    else:
+        origin_utm = tuple(origin["utm"])
+
+    # Fix the shared origin up front so the holes can convert independently
+    if origin_utm is None and origin_lonlat:
+        origin_utm = convert_lonlat_to_utm(origin_lonlat[0], origin_lonlat[1])
+
+    changed = False
+    hole_numbers = set()
+    pending = {}
     for hole_dir in hole_dirs:
         hole_number = int(hole_dir.name.split("_")[1])
-        _, origin_utm = convert_hole_data(hole_number, origin_utm)
-        converted_count += 1
-
-    logger.info(f"Successfully converted {converted_count} holes")
+        hole_numbers.add(hole_number)
+
+        source_hashes = hash_hole_sources(hole_dir)
+        output_file = COURSE_DATA_DIR / f"hole_{hole_number:02d}.json"
+        if (
+            manifest["holes"].get(str(hole_number)) == source_hashes
+            and output_file.exists()
+        ):
+            continue
+        pending[hole_number] = source_hashes
+
+    pending_features = {}
+    if origin_utm:
+        for feature in COURSE_FEATURES:
+            source_hash = hash_file(RAW_DATA_DIR / f"{feature}.geojson")
+            output_file = COURSE_DATA_DIR / f"{feature}.json"
+            if (
+                manifest["features"].get(feature) == source_hash
+                and output_file.exists()
+            ):
+                continue
+            pending_features[feature] = source_hash
+
+    # Sequential on purpose: only the batched projection releases the GIL,
+    # while building the dicts, simplifying LODs and writing JSON dominate
+    for hole_number, source_hashes in pending.items():
+        convert_hole_data(hole_number, origin_utm)
+        manifest["holes"][str(hole_number)] = source_hashes
+        changed = True
+
+    for feature, source_hash in pending_features.items():
+        convert_course_feature(feature, origin_utm)
+        manifest["features"][feature] = source_hash
+        changed = True
+
+    converted_count = len(pending)
+
+    # Drop output for holes whose source directory was removed
+    for hole_key in list(manifest["holes"]):
+        if int(hole_key) not in hole_numbers:
+            del manifest["holes"][hole_key]
+            (COURSE_DATA_DIR / f"hole_{int(hole_key):02d}.json").unlink(missing_ok=True)
+            changed = True
+
+    if converted_count:
+        logger.info(f"Successfully converted {converted_count} holes")
+    else:
+        logger.info("All holes up to date, skipping conversion")
 
     if origin_utm:
-        for feature in ["water", "bridges"]:
-            convert_course_feature(feature, origin_utm)
+        manifest["origin"] = {"lonlat": origin_lonlat, "utm": list(origin_utm)}
+
+    if changed:
+        save_manifest(manifest)
+
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert raw GeoJSON course data to the simulation's format."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only reconvert holes and features whose sources changed",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    convert_all_holes(force=not args.incremental)
@@ -0,0 +1,62 @@
+import json
+import logging
+import argparse
+
+from backend.loader import prepare_course_data
+from backend.simulation import CheckpointStore, SimulationEngine
+
+logger = logging.getLogger(__name__)
+
+
+def run_fork(engine: SimulationEngine, ticks: int) -> dict:
+    """Run a forked engine and summarize its shots and completed holes."""
+    start_tick = engine.tick_count
+    shots = 0
+    completed_strokes = []
+
+    for _ in range(ticks):
+        engine.tick()
+        for event in engine.tick_events:
+            if event["type"] == "shot":
+                shots += 1
+            elif event["type"] == "hole_complete":
+                completed_strokes.extend(event["strokes"].values())
+
+    return {
+        "start_tick": start_tick,
+        "end_tick": engine.tick_count,
+        "groups": len(engine.player_groups),
+        "shots": shots,
+        "holes_completed": len(completed_strokes),
+        "average_strokes": (
+            round(sum(completed_strokes) / len(completed_strokes), 3)
+            if completed_strokes
+            else None
+        ),
+    }
+
+
+def fork_runs(snapshot_path: str, runs: int, ticks: int, seed: int):
+    """Run several forks of one snapshot with different seeds, one JSON line each."""
+    prepare_course_data()
+    base = SimulationEngine()
+    snapshot = CheckpointStore.read(snapshot_path)
+
+    for run in range(runs):
+        engine = base.fork(snapshot, seed=seed + run)
+        result = {"run": run, "seed": seed + run, **run_fork(engine, ticks)}
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run what-if simulations forked from one engine snapshot."
+    )
+    parser.add_argument("snapshot", help="Checkpoint file, e.g. from GET /snapshot")
+    parser.add_argument("--runs", type=int, default=4, help="Number of forks")
+    parser.add_argument("--ticks", type=int, default=600, help="Ticks per fork")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first fork")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+    fork_runs(args.snapshot, args.runs, args.ticks, args.seed)
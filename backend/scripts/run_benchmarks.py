@@ -0,0 +1,94 @@
+import json
+import logging
+import argparse
+
+from pathlib import Path
+
+from backend.loader import prepare_course_data
+from backend.benchmarks import BenchmarkRunner, BenchmarkSuite
+from backend.benchmarks.runner import format_seconds
+from backend.constants import BENCHMARK_REGRESSION_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+BASELINE_FILE = Path(__file__).parent.parent / "benchmarks" / "baseline.json"
+
+
+def run_benchmarks(
+    output: Path = None,
+    baseline_path: Path = BASELINE_FILE,
+    threshold: float = BENCHMARK_REGRESSION_THRESHOLD,
+    only: str = None,
+    save_baseline: bool = False,
+) -> bool:
+    """Run the suite, write results and compare them to the baseline. Returns False on regressions."""
+    prepare_course_data()
+    benchmarks = BenchmarkSuite().build()
+    if only:
+        benchmarks = [b for b in benchmarks if only in b.name]
+
+    results = BenchmarkRunner().run(benchmarks)
+
+    if output:
+        output.write_text(json.dumps(results, indent=2))
+        logger.info(f"Wrote results to {output}")
+    if save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        logger.info(f"Saved baseline to {baseline_path}")
+        return True
+
+    if not baseline_path.exists():
+        logger.warning(f"No baseline at {baseline_path}, nothing to compare")
+        return True
+
+    baseline = json.loads(baseline_path.read_text())
+    rows = BenchmarkRunner.compare(results, baseline, threshold)
+    if only:
+        rows = [row for row in rows if only in row["name"]]
+
+    print(f"{'benchmark':<42} {'baseline':>12} {'current':>12} {'ratio':>7}  status")
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+        print(
+            f"{row['name']:<42} {format_seconds(row['baseline']):>12} "
+            f"{format_seconds(row['current']):>12} {ratio:>7}  {row['status']}"
+        )
+
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        logger.warning(
+            f"{len(regressions)} regressions over {threshold:.0%}: {', '.join(regressions)}"
+        )
+    return not regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the simulation hot paths and compare them to a stored baseline."
+    )
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument(
+        "--baseline", type=Path, default=BASELINE_FILE, help="Baseline results JSON"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=BENCHMARK_REGRESSION_THRESHOLD,
+        help="Allowed slowdown against the baseline, e.g. 0.2 for 20%%",
+    )
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+    logging.getLogger("backend.benchmarks").setLevel(logging.INFO)
+    logger.setLevel(logging.INFO)
+
+    if not run_benchmarks(
+        args.output, args.baseline, args.threshold, args.only, args.save_baseline
+    ):
+        raise SystemExit(1)
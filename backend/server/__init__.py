@@ -0,0 +1,20 @@
+from backend.server.course_payload import CoursePayload
+from backend.server.state_delta import StateDeltaEncoder
+from backend.server.frame_codec import FrameCodec
+from backend.server.client_connection import ClientConnection, StateFrames
+from backend.server.state_router import StateRouter
+from backend.server.tick_history import TickHistory
+from backend.server.broker import BrokerProducer, BrokerRelay, elect_role
+
+__all__ = [
+    "CoursePayload",
+    "StateDeltaEncoder",
+    "FrameCodec",
+    "ClientConnection",
+    "StateFrames",
+    "StateRouter",
+    "TickHistory",
+    "BrokerProducer",
+    "BrokerRelay",
+    "elect_role",
+]
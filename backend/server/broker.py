@@ -0,0 +1,272 @@
+import os
+import json
+import fcntl
+import struct
+import asyncio
+import logging
+import itertools
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from ..constants import (
+    BROKER_RELAY_BUFFER_BYTES,
+    BROKER_RECONNECT_SECONDS,
+    BROKER_REQUEST_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Every message is a length-prefixed JSON payload tagged with its kind
+FRAME_HEADER = struct.Struct("<IB")
+KIND_COURSE = 1  # producer -> relay: {"version", "data", "push"}
+KIND_STATE = 2  # producer -> relay: gamestate of one tick
+KIND_COMMAND = 3  # relay -> producer: {"id", "command"}
+KIND_REPLY = 4  # producer -> relay: {"id", "reply"}
+KIND_FLAGS = 5  # producer -> relay: {"flag_updates"} with every current flag
+
+# Held by the producer for its lifetime so exactly one worker runs the simulation
+_role_lock = None
+
+
+def elect_role(socket_path: str) -> str:
+    """Decide whether this worker runs the simulation ("producer") or relays it ("relay").
+
+    GOLF_BROKER_ROLE forces a role; otherwise the first worker to take the
+    lock next to the socket becomes the producer.
+    """
+    role = os.environ.get("GOLF_BROKER_ROLE", "auto")
+    if role in ("producer", "relay"):
+        return role
+    return "producer" if take_producer_lock(socket_path) else "relay"
+
+
+def take_producer_lock(socket_path: str) -> bool:
+    """Try to take the producer lock; the kernel releases it when its holder dies."""
+    global _role_lock
+
+    if _role_lock is not None:
+        return True
+    lock = open(f"{socket_path}.lock", "a+")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+
+    _role_lock = lock
+    return True
+
+
+def _frame(kind: int, payload: Dict[str, Any]) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return FRAME_HEADER.pack(len(body), kind) + body
+
+
+async def _read_frame(reader: asyncio.StreamReader):
+    header = await reader.readexactly(FRAME_HEADER.size)
+    length, kind = FRAME_HEADER.unpack(header)
+    return kind, json.loads(await reader.readexactly(length))
+
+
+class BrokerProducer:
+    """Unix-socket publisher the simulation worker uses to feed relay workers.
+
+    Each tick's gamestate is serialized once and written to every relay.
+    Writes never wait: a relay whose buffer is over BROKER_RELAY_BUFFER_BYTES
+    misses gamestate frames, which its own delta encoders absorb, but always
+    gets course and flag updates.
+    """
+
+    def __init__(
+        self, socket_path: str, command_handler: Callable[[Dict], Dict[str, Any]]
+    ):
+        self.socket_path = socket_path
+        self.command_handler = command_handler
+        self.relays: Set[asyncio.StreamWriter] = set()
+        self.dropped = 0
+        self._server = None
+        self._course: Optional[bytes] = None
+        self._flags: Optional[bytes] = None
+        self._state: Optional[bytes] = None
+
+    async def start(self):
+        """Listen for relays, replacing a socket file left behind by a dead producer."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(
+            self._handle_relay, path=self.socket_path
+        )
+        logger.info(f"Broker producer listening on {self.socket_path}")
+
+    async def close(self):
+        for writer in list(self.relays):
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def publish_course(self, data: Dict[str, Any], version: int, push: bool = True):
+        """Send new course data to every relay; push asks relays to resend it to clients."""
+        self._course = _frame(
+            KIND_COURSE, {"version": version, "data": data, "push": push}
+        )
+        for writer in list(self.relays):
+            writer.write(self._course)
+
+    def publish_flags(self, flag_updates: List[Dict[str, Any]]):
+        """Send every current flag position to every relay after a flag moved."""
+        self._flags = _frame(KIND_FLAGS, {"flag_updates": flag_updates})
+        for writer in list(self.relays):
+            writer.write(self._flags)
+
+    def publish_state(self, game_state: Dict[str, Any]):
+        """Send a tick's gamestate to every relay that is keeping up."""
+        self._state = _frame(KIND_STATE, game_state)
+        for writer in list(self.relays):
+            if writer.transport.get_write_buffer_size() > BROKER_RELAY_BUFFER_BYTES:
+                self.dropped += 1
+                continue
+            writer.write(self._state)
+
+    async def _handle_relay(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self.relays.add(writer)
+        logger.info(f"Relay worker connected. Total relays: {len(self.relays)}")
+
+        # Bring the new relay up to date right away
+        for frame in (self._course, self._flags, self._state):
+            if frame is not None:
+                writer.write(frame)
+
+        try:
+            while True:
+                kind, message = await _read_frame(reader)
+                if kind != KIND_COMMAND:
+                    logger.warning(f"Unexpected broker frame kind {kind} from relay")
+                    continue
+                try:
+                    reply = self.command_handler(message["command"])
+                except Exception as e:
+                    logger.error(f"Relay command failed: {e}")
+                    reply = {"status": 500, "detail": str(e)}
+                writer.write(_frame(KIND_REPLY, {"id": message["id"], "reply": reply}))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.relays.discard(writer)
+            writer.close()
+            logger.info(f"Relay worker disconnected. Total relays: {len(self.relays)}")
+
+
+class BrokerRelay:
+    """Connection from a WebSocket-only worker to the producer, reconnecting if it goes away.
+
+    With on_promote, the relay also retries the producer lock before every
+    connection attempt. Once the producer worker has died and this relay
+    takes the lock, on_promote starts the simulation here and the relay stops.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        on_course: Callable[[Dict[str, Any], int, bool], None],
+        on_state: Callable[[Dict[str, Any]], None],
+        on_flags: Callable[[Dict[str, Any]], None],
+        on_promote: Optional[Callable[[], Awaitable[None]]] = None,
+    ):
+        self.socket_path = socket_path
+        self.on_course = on_course
+        self.on_state = on_state
+        self.on_flags = on_flags
+        self.on_promote = on_promote
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def request(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a command (e.g. an obstacle change) on the producer and get its reply."""
+        if self._writer is None:
+            return {"status": 503, "detail": "Simulation producer not connected"}
+
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(_frame(KIND_COMMAND, {"id": request_id, "command": command}))
+        try:
+            return await asyncio.wait_for(future, BROKER_REQUEST_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Broker command {request_id} timed out")
+            return {"status": 504, "detail": "Simulation producer did not reply"}
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _fail_pending(self):
+        """Answer every command still waiting for the producer with an error."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(
+                    {"status": 503, "detail": "Simulation producer went away"}
+                )
+
+    def _handle_frame(self, kind: int, message: Dict[str, Any]):
+        if kind == KIND_STATE:
+            self.on_state(message)
+        elif kind == KIND_COURSE:
+            self.on_course(message["data"], message["version"], message["push"])
+        elif kind == KIND_FLAGS:
+            self.on_flags(message)
+        elif kind == KIND_REPLY:
+            future = self._pending.get(message["id"])
+            if future is not None and not future.done():
+                future.set_result(message["reply"])
+
+    async def _run(self):
+        while True:
+            if self.on_promote and take_producer_lock(self.socket_path):
+                await self.on_promote()
+                return
+
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(
+                    self.socket_path
+                )
+            except (FileNotFoundError, ConnectionError):
+                await asyncio.sleep(BROKER_RECONNECT_SECONDS)
+                continue
+
+            logger.info(f"Connected to broker at {self.socket_path}")
+            try:
+                while True:
+                    try:
+                        kind, message = await _read_frame(reader)
+                        self._handle_frame(kind, message)
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        raise
+                    except Exception:
+                        # Frames are read whole before decoding, so the next one
+                        # still lines up; one bad frame must not stop the relay
+                        logger.exception("Skipping a broker frame that failed")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                logger.warning("Lost connection to broker, reconnecting")
+            finally:
+                # Also reached when the relay is closed
+                self._writer.close()
+                self._writer = None
+                self._fail_pending()
+
+            await asyncio.sleep(BROKER_RECONNECT_SECONDS)
@@ -0,0 +1,180 @@
+import time
+import asyncio
+import logging
+import itertools
+
+from collections import deque
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .frame_codec import FrameCodec
+from ..constants import CLIENT_SEND_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+_connection_ids = itertools.count(1)
+
+
+class StateFrames:
+    """One tick's gamestate, encoded at most once per frame type and encoding for all clients."""
+
+    def __init__(self, game_state: Dict[str, Any], delta: Optional[Dict] = None):
+        self.game_state = game_state
+        self.delta = delta
+        self._messages: Dict[Tuple[str, bool], Union[str, bytes]] = {}
+        # Time spent encoding frames, reported as tick serialization
+        self.encode_seconds = 0.0
+
+    def message(self, encoding: str = "json", delta: bool = False) -> Union[str, bytes]:
+        """Get the full or delta frame in an encoding, encoding it on first use."""
+        key = (encoding, delta)
+        if key not in self._messages:
+            started = time.perf_counter()
+            if delta:
+                self._messages[key] = FrameCodec.encode(
+                    encoding, "gamestate_delta", self.delta
+                )
+            else:
+                self._messages[key] = FrameCodec.encode(
+                    encoding, "gamestate", self.game_state
+                )
+            self.encode_seconds += time.perf_counter() - started
+        return self._messages[key]
+
+
+class ClientConnection:
+    """A WebSocket client with its own bounded outbound queue and sender task.
+
+    Publishing never waits on the network. When the queue is full, queued
+    gamestate frames are dropped since the newest one supersedes them; a
+    delta client that lost frames gets a full keyframe next.
+    """
+
+    def __init__(self, websocket, max_queue_size: int = CLIENT_SEND_QUEUE_SIZE):
+        self.id = next(_connection_ids)
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.delta_enabled = False
+        self.encoding = "json"
+        # Normalized by StateRouter.subscription_key; None receives every group
+        self.subscription = None
+        # Ticks between gamestate updates, see StateRouter.rate_tier
+        self.rate_tier = 1
+        self.needs_keyframe = True
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.max_queue_depth = 0
+        # (is_state_frame, message text)
+        self._queue: deque = deque()
+        self._ready = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the sender task."""
+        self._sender = asyncio.create_task(self._send_loop())
+
+    async def close(self):
+        """Stop the sender task and discard queued frames."""
+        self.closed = True
+        self._queue.clear()
+        if self._sender:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def publish(self, message: str) -> bool:
+        """Queue a control message such as course_data. Returns False if the client is too far behind."""
+        return self._enqueue(False, message)
+
+    def publish_state(self, frames: StateFrames) -> bool:
+        """Queue this tick's gamestate as a delta if the client can apply one, else in full."""
+        if len(self._queue) >= self.max_queue_size:
+            self._drop_stale_states()
+
+        if (
+            self.delta_enabled
+            and not self.needs_keyframe
+            and frames.delta is not None
+            and self.encoding in FrameCodec.DELTA_ENCODINGS
+        ):
+            return self._enqueue(True, frames.message(self.encoding, delta=True))
+
+        queued = self._enqueue(True, frames.message(self.encoding))
+        if queued:
+            self.needs_keyframe = False
+        return queued
+
+    def _enqueue(self, is_state: bool, message: Union[str, bytes]) -> bool:
+        if self.closed:
+            return False
+        if len(self._queue) >= self.max_queue_size:
+            self._drop_stale_states()
+            if len(self._queue) >= self.max_queue_size:
+                logger.warning(f"Client {self.id} send queue is full of control frames")
+                self.dropped += 1
+                return False
+
+        self._queue.append((is_state, message))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._ready.set()
+        return True
+
+    def _drop_stale_states(self):
+        """Drop queued gamestate frames, keeping control messages in order."""
+        kept = deque(entry for entry in self._queue if not entry[0])
+        dropped = len(self._queue) - len(kept)
+        if dropped:
+            self._queue = kept
+            self.dropped += dropped
+            # A delta chain with a gap cannot be applied, so resync with a keyframe
+            self.needs_keyframe = True
+            logger.debug(f"Client {self.id} dropped {dropped} stale gamestate frames")
+
+    async def _send_loop(self):
+        try:
+            while True:
+                await self._ready.wait()
+                while self._queue:
+                    _, message = self._queue.popleft()
+                    if isinstance(message, bytes):
+                        await self.websocket.send_bytes(message)
+                    else:
+                        await self.websocket.send_text(message)
+                    self.sent += 1
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending to client {self.id}: {e}")
+            self.closed = True
+            self._queue.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue and delivery counters for monitoring."""
+        return {
+            "id": self.id,
+            "delta_enabled": self.delta_enabled,
+            "encoding": self.encoding,
+            "subscription": self.describe_subscription(),
+            "rate_tier": self.rate_tier,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+    def describe_subscription(self) -> Optional[Dict[str, Any]]:
+        """Get the subscribed holes and groups, or None if subscribed to everything."""
+        if self.subscription is None:
+            return None
+        holes, groups = self.subscription
+        return {
+            "holes": sorted(holes) if holes else [],
+            "groups": sorted(groups) if groups else [],
+        }
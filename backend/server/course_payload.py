@@ -0,0 +1,168 @@
+import gzip
+import json
+import asyncio
+import hashlib
+import logging
+
+from functools import partial
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class CoursePayload:
+    """The course_data message, serialized and compressed once per geometry version.
+
+    Flag positions change during play, so they are kept apart from the
+    geometry: moves come in with the gamestates and only invalidate the
+    WebSocket message, which is rebuilt when the next client connects. The
+    geometry body, its ETag and the gzip/brotli variants served over HTTP
+    change only with the geometry, and are compressed off the event loop.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        # Course geometry without flag positions
+        self.data: Dict = {}
+        self.flags: Dict[int, Dict[str, float]] = {}
+        self.body = b""
+        self.etag = ""
+        self.encoded: Dict[str, bytes] = {}
+        self._message: Optional[str] = None
+
+    def refresh(self, simulation_engine, tick_interval: float) -> bool:
+        """Rebuild the payload if the engine's course geometry changed. Returns True if rebuilt."""
+        if self.version == simulation_engine.course_version:
+            return False
+
+        data = {**simulation_engine.get_course_data(), "tick_interval": tick_interval}
+        self.build(data, simulation_engine.course_version)
+        return True
+
+    def build(self, data: Dict, version: int):
+        """Take course data for a geometry version, recompressing only if the geometry changed."""
+        holes = data.get("holes", [])
+        self.flags = {
+            number: hole["flag"]
+            for number, hole in enumerate(holes, 1)
+            if "flag" in hole
+        }
+        self.version = version
+        self._message = None
+
+        geometry = {
+            **data,
+            "holes": [
+                {name: value for name, value in hole.items() if name != "flag"}
+                for hole in holes
+            ],
+        }
+        body = json.dumps(geometry, separators=(",", ":")).encode("utf-8")
+        if body == self.body:
+            return
+
+        self.data = geometry
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        # Identity responses until the compressed variants are ready
+        self.encoded = {}
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._set_encoded(body, self.compress(body))
+            return
+        future = loop.run_in_executor(None, self.compress, body)
+        future.add_done_callback(partial(self._compressed, body))
+
+    @staticmethod
+    def compress(body: bytes) -> Dict[str, bytes]:
+        """Build the gzip (and brotli, if installed) variants of a body."""
+        encoded = {"gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body, quality=11)
+        return encoded
+
+    def _compressed(self, body: bytes, future: asyncio.Future):
+        if future.cancelled():
+            return
+        if future.exception():
+            logger.error(f"Compressing the course payload failed: {future.exception()}")
+            return
+        self._set_encoded(body, future.result())
+
+    def _set_encoded(self, body: bytes, encoded: Dict[str, bytes]):
+        # A newer geometry may have replaced the body while compressing
+        if body is not self.body:
+            return
+        self.encoded = encoded
+        logger.info(
+            f"Built course payload v{self.version}: {len(body)} bytes, "
+            + ", ".join(f"{name} {len(data)}" for name, data in encoded.items())
+        )
+
+    def track_flags(self, game_state: Dict) -> bool:
+        """Apply the flag moves of a gamestate or flags message. Returns True if a flag moved."""
+        moved = False
+        for flag_update in game_state.get("flag_updates") or [
+            game_state.get("flag_update")
+        ]:
+            if flag_update:
+                self.flags[flag_update["hole"]] = flag_update["position"]
+                moved = True
+        if moved:
+            self._message = None
+        return moved
+
+    def flag_updates(self) -> List[Dict]:
+        """All current flag positions, in the flag_updates format of gamestates."""
+        return [
+            {"hole": number, "position": position}
+            for number, position in sorted(self.flags.items())
+        ]
+
+    def course_data(self) -> Dict:
+        """The geometry with the current flag positions, as sent in course_data."""
+        holes = [
+            {**hole, "flag": self.flags[number]} if number in self.flags else hole
+            for number, hole in enumerate(self.data.get("holes", []), 1)
+        ]
+        return {**self.data, "holes": holes}
+
+    @property
+    def message(self) -> str:
+        """The course_data message text, rebuilt after geometry changes and flag moves."""
+        if self._message is None:
+            self._message = json.dumps(
+                {"type": "course_data", "data": self.course_data()}
+            )
+        return self._message
+
+    @property
+    def flags_message(self) -> str:
+        """Current flag positions, for clients that already have the geometry."""
+        return json.dumps({"type": "flags", "flag_updates": self.flag_updates()})
+
+    def pick_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Choose the smallest prebuilt encoding the client accepts, or None for identity."""
+        accepted = set()
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+                continue
+            accepted.add(name.strip().lower())
+
+        for name in ("br", "gzip"):
+            if name in self.encoded and (name in accepted or "*" in accepted):
+                return name
+        return None
+
+    def matches(self, if_none_match: str) -> bool:
+        """Check an If-None-Match header against the current ETag."""
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
@@ -0,0 +1,223 @@
+import json
+import struct
+import logging
+
+from typing import Any, Dict, List, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Enum codes used by the struct encoding; unknown values are sent as 255
+LIE_CODES = {
+    "tee": 0,
+    "fairway": 1,
+    "rough": 2,
+    "bunker": 3,
+    "green": 4,
+    "water": 5,
+    "hole": 6,
+}
+PLAYER_STATE_CODES = {"idle": 0, "walking": 1, "hitting": 2}
+GREENKEEPER_STATE_CODES = {
+    "idle": 0,
+    "walking_to_hole": 1,
+    "placing_flag": 2,
+    "walking_to_green_center": 3,
+}
+UNKNOWN_CODE = 255
+
+STRUCT_MAGIC = b"GS"
+STRUCT_VERSION = 2
+
+# Little-endian; coordinates are int32 centimeters, wind is in tenths
+HEADER = struct.Struct(
+    "<2sBBIHH"
+)  # magic, version, flag updates, tick, groups, players
+GREENKEEPER = struct.Struct("<HiiBBB")  # id, x, y, state, current hole, holes
+WIND = struct.Struct("<HH")  # direction, speed
+FLAG_UPDATE = struct.Struct("<Bii")  # hole, x, y
+GROUP = struct.Struct("<IBB")  # id, current hole, player count
+PLAYER = struct.Struct("<IiiiiHBB")  # id, x, y, ball x, ball y, strokes, lie, state
+
+
+class FrameCodec:
+    """Wire encodings for gamestate frames: JSON text, MessagePack or a fixed struct layout.
+
+    The struct layout only carries full gamestates, so struct clients do not
+    receive deltas.
+    """
+
+    ENCODINGS = ("json", "msgpack", "struct")
+    DELTA_ENCODINGS = ("json", "msgpack")
+
+    @staticmethod
+    def available_encodings() -> List[str]:
+        """Get the encodings this server can produce; msgpack needs the msgpack package."""
+        return [
+            encoding
+            for encoding in FrameCodec.ENCODINGS
+            if encoding != "msgpack" or msgpack is not None
+        ]
+
+    @staticmethod
+    def encode(
+        encoding: str, message_type: str, data: Dict[str, Any]
+    ) -> Union[str, bytes]:
+        """Encode a message; text for JSON, bytes for the binary encodings."""
+        if encoding == "msgpack":
+            return msgpack.packb({"type": message_type, "data": data})
+        if encoding == "struct":
+            if message_type != "gamestate":
+                raise ValueError(f"struct encoding cannot carry {message_type} frames")
+            return FrameCodec.encode_struct_state(data)
+        return json.dumps({"type": message_type, "data": data})
+
+    @staticmethod
+    def encode_struct_state(state: Dict[str, Any]) -> bytes:
+        """Pack a full gamestate into the fixed struct layout."""
+        flag_updates = state.get("flag_updates") or (
+            [state["flag_update"]] if state.get("flag_update") else []
+        )
+        player_count = sum(len(group["players"]) for group in state["groups"])
+        parts = [
+            HEADER.pack(
+                STRUCT_MAGIC,
+                STRUCT_VERSION,
+                len(flag_updates),
+                state["tick"],
+                len(state["groups"]),
+                player_count,
+            )
+        ]
+
+        greenkeeper = state["greenkeeper"]
+        parts.append(
+            GREENKEEPER.pack(
+                greenkeeper["id"],
+                FrameCodec._cm(greenkeeper["position"]["x"]),
+                FrameCodec._cm(greenkeeper["position"]["y"]),
+                GREENKEEPER_STATE_CODES.get(greenkeeper["state"], UNKNOWN_CODE),
+                greenkeeper["current_hole"] or 0,
+                greenkeeper["holes_needing_service"],
+            )
+        )
+
+        wind = state["wind"]
+        parts.append(
+            WIND.pack(round(wind["direction"] * 10) % 3600, round(wind["speed"] * 10))
+        )
+
+        for flag_update in flag_updates:
+            parts.append(
+                FLAG_UPDATE.pack(
+                    flag_update["hole"],
+                    FrameCodec._cm(flag_update["position"]["x"]),
+                    FrameCodec._cm(flag_update["position"]["y"]),
+                )
+            )
+
+        for group in state["groups"]:
+            parts.append(
+                GROUP.pack(group["id"], group["current_hole"], len(group["players"]))
+            )
+        for group in state["groups"]:
+            for player in group["players"]:
+                parts.append(
+                    PLAYER.pack(
+                        player["id"],
+                        FrameCodec._cm(player["position"]["x"]),
+                        FrameCodec._cm(player["position"]["y"]),
+                        FrameCodec._cm(player["ball_position"]["x"]),
+                        FrameCodec._cm(player["ball_position"]["y"]),
+                        player["strokes"],
+                        LIE_CODES.get(player["current_lie"], UNKNOWN_CODE),
+                        PLAYER_STATE_CODES.get(player["state"], UNKNOWN_CODE),
+                    )
+                )
+
+        return b"".join(parts)
+
+    @staticmethod
+    def decode_struct_state(payload: bytes) -> Dict[str, Any]:
+        """Unpack a struct gamestate; the reference for client decoders."""
+        lies = {code: name for name, code in LIE_CODES.items()}
+        player_states = {code: name for name, code in PLAYER_STATE_CODES.items()}
+        greenkeeper_states = {
+            code: name for name, code in GREENKEEPER_STATE_CODES.items()
+        }
+
+        magic, version, flag_count, tick, group_count, player_count = (
+            HEADER.unpack_from(payload, 0)
+        )
+        if magic != STRUCT_MAGIC or version != STRUCT_VERSION:
+            raise ValueError("Not a struct gamestate frame")
+        offset = HEADER.size
+
+        gk_id, gk_x, gk_y, gk_state, gk_hole, gk_holes = GREENKEEPER.unpack_from(
+            payload, offset
+        )
+        offset += GREENKEEPER.size
+        direction, speed = WIND.unpack_from(payload, offset)
+        offset += WIND.size
+
+        state = {
+            "tick": tick,
+            "groups": [],
+            "greenkeeper": {
+                "id": gk_id,
+                "position": {"x": gk_x / 100, "y": gk_y / 100},
+                "state": greenkeeper_states.get(gk_state),
+                "current_hole": gk_hole or None,
+                "holes_needing_service": gk_holes,
+            },
+            "wind": {"direction": direction / 10, "speed": speed / 10},
+        }
+
+        flag_updates = []
+        for _ in range(flag_count):
+            hole, x, y = FLAG_UPDATE.unpack_from(payload, offset)
+            offset += FLAG_UPDATE.size
+            flag_updates.append(
+                {"hole": hole, "position": {"x": x / 100, "y": y / 100}}
+            )
+        if flag_updates:
+            state["flag_update"] = flag_updates[-1]
+        if len(flag_updates) > 1:
+            state["flag_updates"] = flag_updates
+
+        group_sizes = []
+        for _ in range(group_count):
+            group_id, current_hole, size = GROUP.unpack_from(payload, offset)
+            offset += GROUP.size
+            state["groups"].append(
+                {"id": group_id, "current_hole": current_hole, "players": []}
+            )
+            group_sizes.append(size)
+
+        for group, size in zip(state["groups"], group_sizes):
+            for _ in range(size):
+                player_id, x, y, ball_x, ball_y, strokes, lie, player_state = (
+                    PLAYER.unpack_from(payload, offset)
+                )
+                offset += PLAYER.size
+                group["players"].append(
+                    {
+                        "id": player_id,
+                        "position": {"x": x / 100, "y": y / 100},
+                        "ball_position": {"x": ball_x / 100, "y": ball_y / 100},
+                        "strokes": strokes,
+                        "current_lie": lies.get(lie),
+                        "state": player_states.get(player_state),
+                    }
+                )
+
+        return state
+
+    @staticmethod
+    def _cm(meters: float) -> int:
+        """Quantize meters to integer centimeters."""
+        return int(round(meters * 100))
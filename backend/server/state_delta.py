@@ -0,0 +1,173 @@
+import logging
+
+from typing import Any, Dict, Optional
+
+from ..constants import STATE_KEYFRAME_INTERVAL_TICKS
+
+logger = logging.getLogger(__name__)
+
+
+class StateDeltaEncoder:
+    """Turns successive gamestates into deltas against the previously encoded one.
+
+    Groups and players are keyed by id; only fields that changed are included,
+    plus the ids of groups and players that left the course. Every
+    keyframe_interval ticks no delta is produced so clients get a full state.
+    """
+
+    def __init__(self, keyframe_interval: int = STATE_KEYFRAME_INTERVAL_TICKS):
+        self.keyframe_interval = keyframe_interval
+        self.last_tick: Optional[int] = None
+        self.last_keyframe_tick: Optional[int] = None
+        self._groups: Dict[int, Dict[str, Any]] = {}
+        self._players: Dict[int, Dict[str, Any]] = {}
+        self._greenkeeper: Dict[str, Any] = {}
+        self._wind: Dict[str, Any] = {}
+
+    def encode(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Record a gamestate and get its delta, or None when a keyframe is due."""
+        groups, players = self._index(state)
+        keyframe_due = (
+            self.last_tick is None
+            or self.last_keyframe_tick is None
+            or state["tick"] - self.last_keyframe_tick >= self.keyframe_interval
+        )
+
+        delta = None
+        if not keyframe_due:
+            delta = {"tick": state["tick"], "base_tick": self.last_tick}
+            self._diff_entities(delta, "groups", self._groups, groups)
+            self._diff_entities(delta, "players", self._players, players)
+
+            greenkeeper = self._diff_fields(self._greenkeeper, state["greenkeeper"])
+            if greenkeeper:
+                delta["greenkeeper"] = greenkeeper
+            wind = self._diff_fields(self._wind, state["wind"])
+            if wind:
+                delta["wind"] = wind
+            if "flag_update" in state:
+                delta["flag_update"] = state["flag_update"]
+            if "flag_updates" in state:
+                delta["flag_updates"] = state["flag_updates"]
+        else:
+            self.last_keyframe_tick = state["tick"]
+
+        self.last_tick = state["tick"]
+        self._groups = groups
+        self._players = players
+        self._greenkeeper = self._snapshot(state["greenkeeper"])
+        self._wind = self._snapshot(state["wind"])
+        return delta
+
+    def force_keyframe(self):
+        """Make the next encode produce a keyframe."""
+        self.last_keyframe_tick = None
+
+    @staticmethod
+    def apply(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild the gamestate a delta was encoded from, given the state at its base tick."""
+        groups, players = StateDeltaEncoder._index(state)
+
+        for name, entities in (("groups", groups), ("players", players)):
+            for entity_id in delta.get(f"removed_{name}", []):
+                entities.pop(int(entity_id), None)
+            for entity_id, fields in delta.get(name, {}).items():
+                entities.setdefault(int(entity_id), {}).update(fields)
+
+        new_state = {
+            "tick": delta["tick"],
+            "groups": [
+                {
+                    "id": group_id,
+                    **fields,
+                    "players": [
+                        {key: value for key, value in player.items() if key != "group"}
+                        for player in players.values()
+                        if player["group"] == group_id
+                    ],
+                }
+                for group_id, fields in groups.items()
+            ],
+            "greenkeeper": {**state["greenkeeper"], **delta.get("greenkeeper", {})},
+            "wind": {**state["wind"], **delta.get("wind", {})},
+        }
+        for name in ("flag_update", "flag_updates"):
+            if name in delta:
+                new_state[name] = delta[name]
+        return new_state
+
+    @staticmethod
+    def copy_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a gamestate deep enough that later ticks cannot change it."""
+        return {
+            **state,
+            "groups": [
+                {
+                    **group,
+                    "players": [
+                        StateDeltaEncoder._snapshot(player)
+                        for player in group["players"]
+                    ],
+                }
+                for group in state["groups"]
+            ],
+            "greenkeeper": StateDeltaEncoder._snapshot(state["greenkeeper"]),
+            "wind": StateDeltaEncoder._snapshot(state["wind"]),
+        }
+
+    @staticmethod
+    def _index(state: Dict[str, Any]):
+        """Flatten a gamestate into groups and players keyed by id."""
+        groups, players = {}, {}
+        for group in state["groups"]:
+            groups[group["id"]] = {"current_hole": group["current_hole"]}
+            for player in group["players"]:
+                players[player["id"]] = {
+                    **StateDeltaEncoder._snapshot(player),
+                    "group": group["id"],
+                }
+        return groups, players
+
+    @staticmethod
+    def _snapshot(fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy nested position dicts, which agents update in place."""
+        return {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in fields.items()
+        }
+
+    @staticmethod
+    def _diff_entities(
+        delta: Dict[str, Any],
+        name: str,
+        previous: Dict[int, Dict[str, Any]],
+        current: Dict[int, Dict[str, Any]],
+    ):
+        """Add changed entities and removed ids of one kind to a delta."""
+        changed = {}
+        for entity_id, fields in current.items():
+            if entity_id not in previous:
+                changed[entity_id] = fields
+            else:
+                fields_changed = StateDeltaEncoder._diff_fields(
+                    previous[entity_id], fields
+                )
+                if fields_changed:
+                    changed[entity_id] = fields_changed
+
+        removed = [entity_id for entity_id in previous if entity_id not in current]
+        if changed:
+            delta[name] = changed
+        if removed:
+            delta[f"removed_{name}"] = removed
+
+    @staticmethod
+    def _diff_fields(
+        previous: Dict[str, Any], current: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Get the fields of current whose values differ from previous."""
+        return {
+            key: value
+            for key, value in current.items()
+            if key not in previous or previous[key] != value
+        }
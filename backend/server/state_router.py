@@ -0,0 +1,143 @@
+import math
+import time
+import logging
+
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .state_delta import StateDeltaEncoder
+from .client_connection import ClientConnection, StateFrames
+
+logger = logging.getLogger(__name__)
+
+# (subscribed holes, subscribed group ids); None means everything
+SubscriptionKey = Tuple[Optional[FrozenSet[int]], Optional[FrozenSet[int]]]
+
+# (subscription, rate tier in ticks between updates)
+StreamKey = Tuple[Optional[SubscriptionKey], int]
+DEFAULT_STREAM: StreamKey = (None, 1)
+
+
+class StateRouter:
+    """Fans a tick's gamestate out to clients grouped by subscription.
+
+    Each distinct subscription and rate tier gets one filtered view, one delta
+    encoder and one set of encoded frames, so the work scales with distinct
+    views rather than with the number of clients. A tier of N ticks publishes
+    every Nth tick; its deltas span the skipped ticks and it collects the flag
+    updates made in between.
+    """
+
+    def __init__(self):
+        self._encoders: Dict[StreamKey, StateDeltaEncoder] = {}
+        self._pending_flags: Dict[StreamKey, Dict[int, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def subscription_key(
+        holes: Optional[Iterable[int]] = None, groups: Optional[Iterable[int]] = None
+    ) -> Optional[SubscriptionKey]:
+        """Normalize a subscription; None means the client sees every group."""
+        holes = frozenset(int(hole) for hole in holes) if holes else None
+        groups = frozenset(int(group) for group in groups) if groups else None
+        if holes is None and groups is None:
+            return None
+        return holes, groups
+
+    @staticmethod
+    def filter_state(
+        state: Dict[str, Any], key: Optional[SubscriptionKey]
+    ) -> Dict[str, Any]:
+        """Keep only the groups on subscribed holes or with subscribed ids."""
+        if key is None:
+            return state
+
+        holes, groups = key
+        return {
+            **state,
+            "groups": [
+                group
+                for group in state["groups"]
+                if (holes is not None and group["current_hole"] in holes)
+                or (groups is not None and group["id"] in groups)
+            ],
+        }
+
+    def publish(
+        self, game_state: Dict[str, Any], connections: Iterable[ClientConnection]
+    ) -> float:
+        """Queue this tick's frames for every open connection due an update.
+
+        Returns the seconds spent encoding deltas and frames, so callers can
+        report serialization apart from the fan-out.
+        """
+        # The default stream always keeps its delta base current, so resumed
+        # clients (see TickHistory) can continue with deltas right away
+        streams: Dict[StreamKey, List[ClientConnection]] = defaultdict(list)
+        streams[DEFAULT_STREAM] = []
+        for connection in connections:
+            if not connection.closed:
+                streams[(connection.subscription, connection.rate_tier)].append(
+                    connection
+                )
+
+        # Encoders of views nobody watches any more would hold stale bases
+        for key in list(self._encoders):
+            if key not in streams:
+                del self._encoders[key]
+        for key in list(self._pending_flags):
+            if key not in streams:
+                del self._pending_flags[key]
+
+        encode_seconds = 0.0
+        views: Dict[Optional[SubscriptionKey], Dict[str, Any]] = {}
+        for key, stream in streams.items():
+            subscription, rate_tier = key
+
+            flag_updates = None
+            if rate_tier > 1:
+                # Slower tiers skip ticks, so hold on to the flag moves they skip
+                pending = self._pending_flags.setdefault(key, {})
+                flag_update = game_state.get("flag_update")
+                if flag_update:
+                    # Re-inserted so the latest move stays last
+                    pending.pop(flag_update["hole"], None)
+                    pending[flag_update["hole"]] = flag_update
+                if game_state["tick"] % rate_tier:
+                    continue
+                flag_updates = list(self._pending_flags.pop(key).values())
+
+            if subscription not in views:
+                views[subscription] = self.filter_state(game_state, subscription)
+            view = views[subscription]
+            if flag_updates:
+                view = {
+                    **view,
+                    "flag_update": flag_updates[-1],
+                    "flag_updates": flag_updates,
+                }
+
+            delta = None
+            if key == DEFAULT_STREAM or any(
+                connection.delta_enabled for connection in stream
+            ):
+                encoder = self._encoders.get(key)
+                if encoder is None:
+                    encoder = self._encoders[key] = StateDeltaEncoder()
+                started = time.perf_counter()
+                delta = encoder.encode(view)
+                encode_seconds += time.perf_counter() - started
+            else:
+                self._encoders.pop(key, None)
+
+            frames = StateFrames(view, delta)
+            for connection in stream:
+                connection.publish_state(frames)
+            encode_seconds += frames.encode_seconds
+        return encode_seconds
+
+    @staticmethod
+    def rate_tier(max_rate: Optional[float], tick_interval: float) -> int:
+        """Ticks between updates for a client wanting at most max_rate updates per second."""
+        if not max_rate or max_rate <= 0:
+            return 1
+        return max(1, math.ceil(1 / (max_rate * tick_interval) - 1e-9))
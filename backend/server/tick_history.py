@@ -0,0 +1,74 @@
+import json
+import logging
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .state_delta import StateDeltaEncoder
+from ..constants import TICK_HISTORY_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class TickHistory:
+    """Ring buffer of recent gamestates, used to resume reconnecting clients.
+
+    A client that saw tick N gets one delta from N to the latest tick, with
+    every flag move in between, instead of a keyframe. Catch-up messages are
+    cached per resume tick until the next tick, so a crowd reconnecting at
+    once costs one diff per distinct tick.
+    """
+
+    def __init__(self, size: int = TICK_HISTORY_SIZE):
+        self.size = size
+        self._states: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._flag_updates: Dict[int, Dict[str, Any]] = {}
+        self._catch_up: Dict[int, Optional[str]] = {}
+
+    @property
+    def latest_tick(self) -> Optional[int]:
+        return next(reversed(self._states)) if self._states else None
+
+    def record(self, game_state: Dict[str, Any]):
+        """Store a copy of a tick's gamestate, since agents update positions in place."""
+        tick = game_state["tick"]
+        if self._states and tick <= self.latest_tick:
+            # The simulation restarted; older ticks no longer apply
+            self._states.clear()
+            self._flag_updates.clear()
+
+        self._states[tick] = StateDeltaEncoder.copy_state(game_state)
+        if "flag_update" in game_state:
+            self._flag_updates[tick] = game_state["flag_update"]
+
+        while len(self._states) > self.size:
+            old_tick, _ = self._states.popitem(last=False)
+            self._flag_updates.pop(old_tick, None)
+        self._catch_up.clear()
+
+    def catch_up_message(self, last_tick: int) -> Optional[str]:
+        """Get a gamestate_delta message from last_tick to the latest tick, or None if too old."""
+        if last_tick not in self._states:
+            return None
+        if last_tick not in self._catch_up:
+            self._catch_up[last_tick] = self._build_catch_up(last_tick)
+        return self._catch_up[last_tick]
+
+    def _build_catch_up(self, last_tick: int) -> str:
+        encoder = StateDeltaEncoder(keyframe_interval=self.size + 1)
+        encoder.encode(self._states[last_tick])
+        current = dict(self._states[self.latest_tick])
+        current.pop("flag_update", None)
+
+        # Latest move per hole, oldest first
+        moves: Dict[int, Dict[str, Any]] = {}
+        for tick, flag_update in self._flag_updates.items():
+            if tick > last_tick:
+                moves.pop(flag_update["hole"], None)
+                moves[flag_update["hole"]] = flag_update
+        if moves:
+            current["flag_update"] = list(moves.values())[-1]
+            current["flag_updates"] = list(moves.values())
+
+        delta = encoder.encode(current)
+        return json.dumps({"type": "gamestate_delta", "data": delta})
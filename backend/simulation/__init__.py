@@ -1,3 +1,4 @@
 from backend.simulation.simulation_engine import SimulationEngine
+from backend.simulation.checkpoints import CheckpointStore
 
-__all__ = ["SimulationEngine"]
+__all__ = ["SimulationEngine", "CheckpointStore"]
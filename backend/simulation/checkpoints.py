@@ -0,0 +1,65 @@
+import os
+import json
+import zlib
+import logging
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..constants import CHECKPOINT_KEEP
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """Engine snapshots as numbered, zlib-compressed JSON files in one directory.
+
+    Files are named by tick and written atomically, so the newest file is
+    always complete; only the newest keep files are retained.
+    """
+
+    def __init__(self, directory: str, keep: int = CHECKPOINT_KEEP):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+
+    @staticmethod
+    def encode(snapshot: Dict[str, Any]) -> bytes:
+        """Serialize a snapshot to compact compressed bytes."""
+        return zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode())
+
+    @staticmethod
+    def decode(data: bytes) -> Dict[str, Any]:
+        """Deserialize a snapshot written by encode."""
+        return json.loads(zlib.decompress(data))
+
+    @staticmethod
+    def read(path: str) -> Dict[str, Any]:
+        """Read a snapshot file."""
+        with open(path, "rb") as f:
+            return CheckpointStore.decode(f.read())
+
+    def checkpoints(self) -> List[Path]:
+        """Get the checkpoint files, oldest first."""
+        return sorted(self.directory.glob("checkpoint-*.snap"))
+
+    def save(self, snapshot: Dict[str, Any]) -> Path:
+        """Write a snapshot as the newest checkpoint and drop the oldest ones."""
+        path = self.directory / f"checkpoint-{snapshot['tick']:010d}.snap"
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(self.encode(snapshot))
+        os.replace(temp_path, path)
+
+        for old_path in self.checkpoints()[: -self.keep]:
+            old_path.unlink()
+
+        logger.info(f"Saved checkpoint {path.name} ({path.stat().st_size} bytes)")
+        return path
+
+    def load_latest(self) -> Optional[Dict[str, Any]]:
+        """Read the newest checkpoint, or None if there is none."""
+        checkpoints = self.checkpoints()
+        if not checkpoints:
+            return None
+        return self.read(checkpoints[-1])
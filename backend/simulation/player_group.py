@@ -1,6 +1,8 @@
 import logging
 from ..agents.player_agent import PlayerAgent
 from ..utils.calculations import Calculations
+from ..utils.event_log import event_log
+from ..utils.flow_field import FlowFieldCache
 from ..constants import SHOT_TAKING_DISTANCE
 
 logger = logging.getLogger(__name__)
@@ -31,10 +33,12 @@ class PlayerGroup:
         next_player_index = 0
         max_distance = float("-inf")
 
-        logger.debug(
-            f"Group {self.group_id}: Determining current turn index. "
-            f"players_need_to_shoot: {self.players_need_to_shoot}"
-        )
+        if event_log.enabled("turn_candidates"):
+            event_log.emit(
+                "turn_candidates",
+                self.group_id,
+                sorted(self.players_need_to_shoot),
+            )
 
         players_eligible_to_shoot = []
         for i, player in enumerate(self.players):
@@ -56,9 +60,12 @@ class PlayerGroup:
             self.current_turn_index = 0
         else:
             self.current_turn_index = next_player_index
-            logger.debug(
-                f"Group {self.group_id}: Set current turn to index {next_player_index} "
-                f"(Player {self.players[next_player_index].id}, max distance: {max_distance:.2f}m)"
+            event_log.emit(
+                "turn_set",
+                self.group_id,
+                next_player_index,
+                self.players[next_player_index].id,
+                max_distance,
             )
 
     def are_all_players_at_ball(self) -> bool:
@@ -66,40 +73,77 @@ class PlayerGroup:
         all_at_ball = True
         for player in self.players:
             if player.is_complete:
-                logger.debug(
-                    f"Group {self.group_id}, Player {player.id}: completed, skipping"
-                )
+                event_log.emit("player_complete_skipped", self.group_id, player.id)
                 continue
             distance = Calculations.get_distance(
                 player.player_position, player.ball_position
             )
-            logger.debug(
-                f"Group {self.group_id}, Player {player.id}: distance to ball = {distance:.2f}m "
-                f"(threshold: {SHOT_TAKING_DISTANCE}m)"
+            event_log.emit(
+                "player_distance_to_ball",
+                self.group_id,
+                player.id,
+                distance,
+                SHOT_TAKING_DISTANCE,
             )
             if distance >= SHOT_TAKING_DISTANCE:
                 all_at_ball = False
 
         return all_at_ball
 
-    def walk_all_players_to_balls(self):
-        """Move all players one step towards their balls."""
+    def walk_all_players_to_balls(self, flow_fields: FlowFieldCache = None):
+        """Move all players one step towards their balls, around water when flow fields are given."""
         for player in self.players:
             if not player.is_complete:
-                player.walk_to_ball()
+                flow_field = ball_field = None
+                if flow_fields is not None:
+                    flow_field = flow_fields.get_field(
+                        self.current_hole_number, player.ball_position
+                    )
+                    ball_field = flow_fields.get_ball_field(
+                        self.current_hole_number, player.ball_position
+                    )
+                player.walk_to_ball(flow_field, ball_field)
 
     def mark_all_players_need_to_shoot(self):
         """Mark all incomplete players as needing to shoot this round."""
-        before = self.players_need_to_shoot.copy()
+        before = self.players_need_to_shoot
         self.players_need_to_shoot = {
             i for i, player in enumerate(self.players) if not player.is_complete
         }
-        logger.debug(
-            f"Group {self.group_id} mark_all_players_need_to_shoot: "
-            f"before={before}, after={self.players_need_to_shoot}. "
-            f"Player completion status: {[(i, p.is_complete) for i, p in enumerate(self.players)]}"
-        )
+        if event_log.enabled("players_need_to_shoot"):
+            event_log.emit(
+                "players_need_to_shoot",
+                self.group_id,
+                sorted(before),
+                sorted(self.players_need_to_shoot),
+            )
 
     def all_shots_taken_this_round(self) -> bool:
         """Check if all players who need to shoot have taken their shots."""
         return len(self.players_need_to_shoot) == 0
+
+    def snapshot(self) -> dict:
+        """Get the complete group state, including its players, for checkpoints."""
+        return {
+            "id": self.group_id,
+            "players": [player.snapshot() for player in self.players],
+            "current_hole_number": self.current_hole_number,
+            "tee_time": self.tee_time,
+            "current_turn_index": self.current_turn_index,
+            "is_complete": self.is_complete,
+            "players_need_to_shoot": sorted(self.players_need_to_shoot),
+        }
+
+    @staticmethod
+    def from_snapshot(snapshot: dict, seed: int) -> "PlayerGroup":
+        """Recreate a group and its players from a checkpoint snapshot of a run with this seed."""
+        group = PlayerGroup(
+            id=snapshot["id"],
+            players=[PlayerAgent.from_snapshot(p, seed) for p in snapshot["players"]],
+            starting_hole=snapshot["current_hole_number"],
+            tee_time=snapshot["tee_time"],
+        )
+        group.current_turn_index = snapshot["current_turn_index"]
+        group.is_complete = snapshot["is_complete"]
+        group.players_need_to_shoot = set(snapshot["players_need_to_shoot"])
+        return group
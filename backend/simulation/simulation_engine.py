@@ -1,21 +1,45 @@
+import copy
+import hashlib
 import json
+import time
 import logging
-import random
 
 from pathlib import Path
 
 from ..agents.player_agent import PlayerAgent
+from ..agents.greenkeeper_agent import GreenkeeperAgent
+from ..agents.wind_agent import WindAgent
 from ..utils.pathfinding import PathFinder
+from ..utils.flow_field import FlowFieldCache
+from ..utils.course_artifact import CourseArtifact
+from ..utils.polygon_lod import PolygonLOD
 from ..utils.calculations import Calculations
+from ..utils.event_log import event_log
+from ..utils.random_stream import RandomStream
+from ..utils.tick_metrics import HotPathCounters, TickMetrics
 from ..simulation.player_group import PlayerGroup
-from ..constants import MIN_DISTANCE_FROM_TEE_TO_SPAWN_NEW_GROUP
+from ..constants import (
+    DECISION_COST_SMOOTHING,
+    MIN_DISTANCE_FROM_TEE_TO_SPAWN_NEW_GROUP,
+    TICK_BUDGET_DEFER_AT,
+    TICK_BUDGET_DEGRADE_AT,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Bumped whenever the snapshot layout changes
+SNAPSHOT_VERSION = 2
+
 
 class SimulationEngine:
-    def __init__(self):
+    def __init__(
+        self,
+        use_artifact: bool = True,
+        seed: int = None,
+        metrics: TickMetrics = None,
+        tick_budget: float = None,
+    ):
         self.holes = {}
         self.player_groups = []
         self.greenkeeper = None
@@ -23,16 +47,68 @@ class SimulationEngine:
         self.tick_count = 0
         self.water = []
         self.bridges = []
+        self.water_lod = []
+        self.bridges_lod = []
         self.greenkeeper_paths = {}
+        self.pathfinder = None
+        self.navigation_graph = None
+
+        # Every agent draws from its own stream derived from the run seed
+        self.seed = seed if seed is not None else RandomStream.new_seed()
+        logger.info(f"Run seed {self.seed}")
 
         # Dynamic group spawning
         self.next_group_id = 1
         self.next_player_id = 1
-
-        self._load_all_holes()
-        self._load_course_features()
-        self._compute_greenkeeper_paths()
+        self.spawn_rng = self.random_stream("spawn")
+
+        # Bumped whenever client-visible geometry changes, e.g. obstacles
+        self.course_version = 0
+
+        # Shots, spawns, flag moves and hole completions of the last tick
+        self.tick_events = []
+
+        # Rolling durations of the tick phases
+        self.metrics = metrics or TickMetrics()
+
+        # Seconds a tick may take before shot decisions degrade; None never
+        # degrades, which keeps runs reproducible from their seed
+        self.tick_budget = tick_budget
+        # Smoothed seconds of each group's last shot decisions
+        self.group_decision_seconds = {}
+        # Groups whose decision was postponed; they go first next tick
+        self.deferred_groups = set()
+
+        loaded_artifact = use_artifact and self._load_course_artifact()
+        if not loaded_artifact:
+            self._load_all_holes()
+            self._load_course_features()
+        self._attach_polygon_lods()
+        if not loaded_artifact:
+            # After the LODs: their bounding boxes skip most water checks
+            self._compute_greenkeeper_paths()
         self.num_holes = len(self.holes)
+        self.flow_fields = FlowFieldCache(self.holes, self.water, self.bridges)
+
+    def _load_course_artifact(self) -> bool:
+        """Load holes, features and paths from the compiled course artifact if it is current."""
+        artifact = CourseArtifact.open_if_current()
+        if artifact is None:
+            return False
+
+        # Everything is copied into engine-owned structures, then released
+        try:
+            self.holes = artifact.build_holes()
+            self.water = artifact.build_feature("water")
+            self.bridges = artifact.build_feature("bridges")
+            self.water_lod = artifact.build_feature_lods("water")
+            self.bridges_lod = artifact.build_feature_lods("bridges")
+            self.greenkeeper_paths = artifact.build_paths()
+            self.navigation_graph = artifact.build_graph_data()
+        finally:
+            artifact.close()
+        logger.info(f"Loaded course from compiled artifact {artifact.path.name}")
+        return True
 
     def _load_all_holes(self):
         """Load all hole data into the simulation engine."""
@@ -56,6 +132,7 @@ class SimulationEngine:
             with open(water_file, "r") as f:
                 water_data = json.load(f)
                 self.water = water_data.get("water", [])
+                self.water_lod = water_data.get("water_lod", [])
 
         # Load bridges
         bridges_file = course_data_dir / "bridges.json"
@@ -63,6 +140,32 @@ class SimulationEngine:
             with open(bridges_file, "r") as f:
                 bridges_data = json.load(f)
                 self.bridges = bridges_data.get("bridges", [])
+                self.bridges_lod = bridges_data.get("bridges_lod", [])
+
+    def _attach_polygon_lods(self):
+        """Attach the precomputed polygon LODs used for fast lie and water checks."""
+        for hole_data in self.holes.values():
+            lods = hole_data.get("lod", {})
+            for name in ("fairway", "green"):
+                if name in lods and name in hole_data:
+                    hole_data[name] = PolygonLOD.attach(hole_data[name], lods[name])
+            for name in ("tees", "bunkers"):
+                if name in lods and len(lods[name]) == len(hole_data.get(name, ())):
+                    hole_data[name] = [
+                        PolygonLOD.attach(polygon, lod)
+                        for polygon, lod in zip(hole_data[name], lods[name])
+                    ]
+
+        if len(self.water_lod) == len(self.water):
+            self.water = [
+                PolygonLOD.attach(polygon, lod)
+                for polygon, lod in zip(self.water, self.water_lod)
+            ]
+        if len(self.bridges_lod) == len(self.bridges):
+            self.bridges = [
+                PolygonLOD.attach(polygon, lod)
+                for polygon, lod in zip(self.bridges, self.bridges_lod)
+            ]
 
     def _compute_greenkeeper_paths(self):
         """Pre-compute shortest water-avoiding paths between all holes."""
@@ -73,29 +176,44 @@ class SimulationEngine:
             Path(__file__).parent.parent / "data" / "navigation_paths_cache.json"
         )
 
+        course_digest = self._course_digest()
+
         if cache_file.exists():
             try:
                 logger.info("Loading greenkeeper paths from cache...")
                 with open(cache_file, "r") as f:
                     cache_data = json.load(f)
+
+                # Caches without a digest predate it and are rebuilt as well
+                if cache_data.get("course_digest") == course_digest:
+                    self.navigation_graph = cache_data["graph"]
                     self.greenkeeper_paths = {
-                        tuple(map(int, k.split(","))): v for k, v in cache_data.items()
+                        tuple(map(int, k.split(","))): v
+                        for k, v in cache_data["paths"].items()
                     }
-                logger.info(f"Loaded {len(self.greenkeeper_paths)} paths from cache")
-                return
+                    logger.info(
+                        f"Loaded {len(self.greenkeeper_paths)} paths from cache"
+                    )
+                    return
+                logger.info("Path cache does not match the course. Recomputing...")
             except Exception as e:
                 logger.warning(f"Failed to load path cache: {e}. Recomputing...")
 
         logger.info("Computing greenkeeper paths between all holes...")
-        pathfinder = PathFinder(self.water, self.bridges, self.holes)
-        self.greenkeeper_paths = pathfinder.compute_all_paths(self.holes)
+        self.pathfinder = PathFinder(self.water, self.bridges, self.holes)
+        self.greenkeeper_paths = self.pathfinder.compute_all_paths(self.holes)
         logger.info(
             f"Computed {len(self.greenkeeper_paths)} paths for greenkeeper navigation"
         )
 
         try:
+            self.navigation_graph = self.pathfinder.export_graph()
             cache_data = {
-                f"{k[0]},{k[1]}": v for k, v in self.greenkeeper_paths.items()
+                "course_digest": course_digest,
+                "paths": {
+                    f"{k[0]},{k[1]}": v for k, v in self.greenkeeper_paths.items()
+                },
+                "graph": self.navigation_graph,
             }
             with open(cache_file, "w") as f:
                 json.dump(cache_data, f)
@@ -103,17 +221,78 @@ class SimulationEngine:
         except Exception as e:
             logger.warning(f"Failed to save path cache: {e}")
 
+    def _course_digest(self) -> str:
+        """Digest of the holes, water and bridges the greenkeeper paths are computed from."""
+        course = json.dumps([self.holes, self.water, self.bridges], sort_keys=True)
+        return hashlib.sha256(course.encode()).hexdigest()
+
+    def _get_pathfinder(self) -> PathFinder:
+        """Get the path finder used for incremental repairs, adopting cached paths on first use."""
+        if self.pathfinder is None:
+            self.pathfinder = PathFinder(self.water, self.bridges, self.holes)
+            self.pathfinder.load_paths(
+                self.holes, self.greenkeeper_paths, self.navigation_graph
+            )
+        return self.pathfinder
+
+    def add_obstacle(self, polygon: list[dict]) -> int:
+        """Close an area of the course (e.g. ground under repair) for greenkeeper routing."""
+        pathfinder = self._get_pathfinder()
+        obstacle_id, affected_pairs = pathfinder.add_obstacle(polygon)
+        self.flow_fields.set_obstacles(list(pathfinder.obstacles.values()))
+        self.course_version += 1
+
+        if self.greenkeeper:
+            self.greenkeeper.reroute(affected_pairs)
+
+        logger.info(
+            f"Added obstacle {obstacle_id}, repaired {len(affected_pairs)} greenkeeper paths"
+        )
+        return obstacle_id
+
+    def remove_obstacle(self, obstacle_id: int) -> bool:
+        """Reopen a previously closed area. Returns False if the obstacle is unknown."""
+        pathfinder = self._get_pathfinder()
+        if obstacle_id not in pathfinder.obstacles:
+            return False
+
+        affected_pairs = pathfinder.remove_obstacle(obstacle_id)
+        self.flow_fields.set_obstacles(list(pathfinder.obstacles.values()))
+        self.course_version += 1
+
+        if self.greenkeeper:
+            self.greenkeeper.reroute(affected_pairs)
+
+        logger.info(
+            f"Removed obstacle {obstacle_id}, repaired {len(affected_pairs)} greenkeeper paths"
+        )
+        return True
+
+    def get_obstacles(self) -> dict[int, list[dict]]:
+        """Get the currently active dynamic obstacles by id."""
+        if self.pathfinder is None:
+            return {}
+        return dict(self.pathfinder.obstacles)
+
     def tick(self):
         """Process one simulation step for all active groups."""
+        clock = time.perf_counter
+        metrics = self.metrics
+        started = clock()
         self.tick_count += 1
+        self.tick_events = []
         flag_update = None
 
         if self.can_spawn_new_group():
             self.spawn_new_group()
+        spawned = clock()
+        metrics.observe("spawn", spawned - started)
 
         # Update wind conditions
         if self.wind_agent:
             self.wind_agent.update()
+        wind_updated = clock()
+        metrics.observe("wind", wind_updated - spawned)
 
         if self.greenkeeper:
             greenkeeper_result = self.greenkeeper.update()
@@ -123,24 +302,43 @@ class SimulationEngine:
                 new_flag_pos = greenkeeper_result["new_flag_position"]
                 self.holes[hole_num]["flag"] = new_flag_pos
                 flag_update = {"hole": hole_num, "position": new_flag_pos}
-                logger.info(
-                    f"Greenkeeper changed flag on hole {hole_num} to position {new_flag_pos}"
+                self.tick_events.append({"type": "flag_update", **flag_update})
+                event_log.emit(
+                    "flag_changed", hole_num, new_flag_pos["x"], new_flag_pos["y"]
                 )
-
-        for group in self.player_groups:
+        groups_started = clock()
+        metrics.observe("greenkeeper", groups_started - wind_updated)
+
+        shot_search_seconds = walking_seconds = 0.0
+        budget = self.tick_budget
+        reduced = deferred = 0
+        groups = self.player_groups
+        if self.deferred_groups:
+            groups = sorted(
+                groups, key=lambda group: group.group_id not in self.deferred_groups
+            )
+            self.deferred_groups = set()
+        for group in groups:
             if not group.is_complete:
                 hole_data = self.holes[group.current_hole_number]
 
                 if all(p.is_complete for p in group.players):
-                    logger.info(
-                        f"[Tick {self.tick_count}] All players in Group {group.group_id} complete! Advancing to next hole."
+                    event_log.emit(
+                        "group_hole_complete", self.tick_count, group.group_id
+                    )
+                    self.tick_events.append(
+                        {
+                            "type": "hole_complete",
+                            "group_id": group.group_id,
+                            "hole": group.current_hole_number,
+                            "strokes": {p.id: p.strokes for p in group.players},
+                        }
                     )
                     completed_course = self._advance_group_to_next_hole(group)
                     if completed_course:
                         self.player_groups.remove(group)
-                        logger.info(
-                            f"Group {group.group_id} removed from course after completing all holes"
-                        )
+                        self.group_decision_seconds.pop(group.group_id, None)
+                        event_log.emit("group_finished", group.group_id)
                     continue
 
                 if not group.all_shots_taken_this_round():
@@ -151,6 +349,21 @@ class SimulationEngine:
                         not player.is_complete
                         and group.current_turn_index in group.players_need_to_shoot
                     ):
+                        decision_started = clock()
+                        level = 0
+                        if budget:
+                            level = self._degradation_level(
+                                decision_started - started, group.group_id
+                            )
+                            if level == 2:
+                                HotPathCounters.deferred_group_updates += 1
+                                self.deferred_groups.add(group.group_id)
+                                deferred += 1
+                                continue
+                            if level == 1:
+                                HotPathCounters.reduced_searches += 1
+                                reduced += 1
+
                         greenkeeper_pos = self.greenkeeper.position
                         wind_conditions = self.wind_agent.get_current_conditions()
 
@@ -164,29 +377,106 @@ class SimulationEngine:
                             wind_conditions,
                             other_group_positions,
                             self.water,
+                            group.current_hole_number,
+                            self.holes,
+                            reduced_search=level == 1,
+                            reuse_plan=level == 1,
                         )
 
                         if can_shoot:
+                            lie = player.current_lie
                             shot_result = player.take_shot(
                                 hole_data,
                                 wind_conditions,
                                 self.water,
                                 group.current_hole_number,
                                 self.holes,
+                                reduced_search=level == 1,
                             )
                             group.players_need_to_shoot.discard(
                                 group.current_turn_index
                             )
+                            self.tick_events.append(
+                                {
+                                    "type": "shot",
+                                    "group_id": group.group_id,
+                                    "hole": group.current_hole_number,
+                                    "lie": lie,
+                                    "landing_lie": player.current_lie,
+                                    "wind": wind_conditions,
+                                    **shot_result,
+                                }
+                            )
+                        else:
+                            HotPathCounters.blocked_shots += 1
+                        decision_seconds = clock() - decision_started
+                        shot_search_seconds += decision_seconds
+                        self._track_decision(group.group_id, decision_seconds)
                     elif player.is_complete:
                         group.players_need_to_shoot.discard(group.current_turn_index)
 
                 elif not group.are_all_players_at_ball():
-                    group.walk_all_players_to_balls()
+                    walking_started = clock()
+                    # Walking can wait a tick; building a flow field may not fit the budget
+                    if (
+                        budget
+                        and walking_started - started > budget * TICK_BUDGET_DEFER_AT
+                    ):
+                        HotPathCounters.deferred_group_updates += 1
+                        self.deferred_groups.add(group.group_id)
+                        deferred += 1
+                        continue
+                    group.walk_all_players_to_balls(self.flow_fields)
+                    walking_seconds += clock() - walking_started
 
                 else:
                     group.mark_all_players_need_to_shoot()
+        metrics.observe("shot_search", shot_search_seconds)
+        metrics.observe("walking", walking_seconds)
+
+        state_started = clock()
+        state = self.get_state(flag_update)
+        finished = clock()
+        metrics.observe("state", finished - state_started)
+        metrics.observe("tick", finished - started)
+
+        if budget:
+            if finished - started > budget:
+                HotPathCounters.budget_overruns += 1
+            if reduced or deferred:
+                event_log.emit(
+                    "tick_degraded",
+                    self.tick_count,
+                    reduced,
+                    deferred,
+                    (finished - started) / budget,
+                )
+        return state
 
-        return self.get_state(flag_update)
+    def _degradation_level(self, elapsed: float, group_id: int) -> int:
+        """How far to degrade a group's shot decision with elapsed seconds of this tick.
+
+        0 decides normally, 1 searches coarser and reuses earlier plans when
+        the decision is projected to push the tick past TICK_BUDGET_DEGRADE_AT
+        of the budget, and 2 postpones it to the next tick once
+        TICK_BUDGET_DEFER_AT of the budget is spent, like walking steps.
+        """
+        if elapsed > self.tick_budget * TICK_BUDGET_DEFER_AT:
+            return 2
+        projected = elapsed + self.group_decision_seconds.get(group_id, 0.0)
+        if projected > self.tick_budget * TICK_BUDGET_DEGRADE_AT:
+            return 1
+        return 0
+
+    def _track_decision(self, group_id: int, seconds: float):
+        """Fold a decision's duration into the group's smoothed decision cost."""
+        previous = self.group_decision_seconds.get(group_id)
+        if previous is None:
+            self.group_decision_seconds[group_id] = seconds
+        else:
+            self.group_decision_seconds[group_id] = (
+                previous + DECISION_COST_SMOOTHING * (seconds - previous)
+            )
 
     def _get_other_group_positions_on_same_hole(
         self, current_group: PlayerGroup, current_player
@@ -261,15 +551,18 @@ class SimulationEngine:
 
     def spawn_new_group(self):
         """Spawn a new player group on hole 1 with random players."""
-        num_players = random.randint(2, 4)
+        num_players = self.spawn_rng.randint(2, 4)
         players = []
 
         for i in range(num_players):
-            accuracy = random.uniform(0.7, 0.9)
-            strength = random.uniform(0.75, 0.95)
+            accuracy = self.spawn_rng.uniform(0.7, 0.9)
+            strength = self.spawn_rng.uniform(0.75, 0.95)
 
             player = PlayerAgent(
-                id=self.next_player_id, accuracy=accuracy, strength=strength
+                id=self.next_player_id,
+                accuracy=accuracy,
+                strength=strength,
+                rng=self.random_stream(f"player:{self.next_player_id}"),
             )
             players.append(player)
             self.next_player_id += 1
@@ -289,11 +582,18 @@ class SimulationEngine:
             player.ball_position = tee_position.copy()
 
         self.player_groups.append(new_group)
+        self.tick_events.append(
+            {
+                "type": "spawn",
+                "group_id": new_group.group_id,
+                "player_ids": [player.id for player in new_group.players],
+            }
+        )
 
         self.next_group_id += 1
 
-        logger.info(
-            f"[Tick {self.tick_count}] Spawned Group {new_group.group_id} on hole 1 with {num_players} players"
+        event_log.emit(
+            "group_spawned", self.tick_count, new_group.group_id, num_players
         )
 
         return new_group
@@ -304,12 +604,177 @@ class SimulationEngine:
         avg_y = sum(p["y"] for p in tee_box) / len(tee_box)
         return {"x": avg_x, "y": avg_y}
 
+    def get_course_data(self) -> dict:
+        """Get course geometry for clients, using the coarse polygon LODs where available."""
+
+        def coarse(polygon, lod):
+            return lod["coarse"] if lod and "coarse" in lod else polygon
+
+        holes = []
+        for hole_num in sorted(self.holes):
+            hole_data = self.holes[hole_num]
+            lods = hole_data.get("lod", {})
+            client_hole = {}
+            for name in ("fairway", "green"):
+                if name in hole_data:
+                    client_hole[name] = coarse(hole_data[name], lods.get(name))
+            for name in ("tees", "bunkers"):
+                if name in hole_data:
+                    polygon_lods = lods.get(name) or [None] * len(hole_data[name])
+                    client_hole[name] = [
+                        coarse(polygon, lod)
+                        for polygon, lod in zip(hole_data[name], polygon_lods)
+                    ]
+            if "flag" in hole_data:
+                client_hole["flag"] = hole_data["flag"]
+            holes.append(client_hole)
+
+        return {
+            "holes": holes,
+            "water": [
+                coarse(polygon, lod)
+                for polygon, lod in zip(
+                    self.water, self.water_lod or [None] * len(self.water)
+                )
+            ],
+            "bridges": [
+                coarse(polygon, lod)
+                for polygon, lod in zip(
+                    self.bridges, self.bridges_lod or [None] * len(self.bridges)
+                )
+            ],
+            "obstacles": [
+                {"id": obstacle_id, "polygon": polygon}
+                for obstacle_id, polygon in self.get_obstacles().items()
+            ],
+        }
+
+    def random_stream(self, name: str) -> RandomStream:
+        """Get a fresh random stream for an agent or subsystem of this run."""
+        return RandomStream(self.seed, name)
+
+    def snapshot(self) -> dict:
+        """Capture all mutable simulation state, including the RNG streams, as JSON-compatible data."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "seed": self.seed,
+            "tick": self.tick_count,
+            "next_group_id": self.next_group_id,
+            "next_player_id": self.next_player_id,
+            "spawn_rng": self.spawn_rng.counter,
+            "course_version": self.course_version,
+            "flags": {
+                str(hole_num): dict(hole_data["flag"])
+                for hole_num, hole_data in self.holes.items()
+                if "flag" in hole_data
+            },
+            "obstacles": [
+                [obstacle_id, polygon]
+                for obstacle_id, polygon in self.get_obstacles().items()
+            ],
+            "next_obstacle_id": (
+                self.pathfinder.next_obstacle_id if self.pathfinder else 1
+            ),
+            "groups": [group.snapshot() for group in self.player_groups],
+            "greenkeeper": self.greenkeeper.snapshot() if self.greenkeeper else None,
+            "wind": self.wind_agent.snapshot() if self.wind_agent else None,
+        }
+
+    def restore(self, snapshot: dict):
+        """Resume from a snapshot taken on an engine with the same course."""
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {snapshot.get('version')}, expected {SNAPSHOT_VERSION}"
+            )
+
+        for hole_num, flag in snapshot["flags"].items():
+            self.holes[int(hole_num)]["flag"] = dict(flag)
+        self._restore_obstacles(snapshot["obstacles"], snapshot["next_obstacle_id"])
+
+        self.seed = snapshot["seed"]
+        self.spawn_rng = RandomStream(self.seed, "spawn", snapshot["spawn_rng"])
+        self.player_groups = [
+            PlayerGroup.from_snapshot(g, self.seed) for g in snapshot["groups"]
+        ]
+        if self.greenkeeper and snapshot["greenkeeper"]:
+            self.greenkeeper.rng = self.random_stream("greenkeeper")
+            self.greenkeeper.restore(snapshot["greenkeeper"])
+        if self.wind_agent and snapshot["wind"]:
+            self.wind_agent.rng = self.random_stream("wind")
+            self.wind_agent.restore(snapshot["wind"])
+
+        self.tick_count = snapshot["tick"]
+        self.next_group_id = snapshot["next_group_id"]
+        self.next_player_id = snapshot["next_player_id"]
+        # Flags and obstacles changed under any course data built before
+        self.course_version = snapshot["course_version"] + 1
+        self.tick_events = []
+        self.group_decision_seconds = {}
+        self.deferred_groups = set()
+
+        logger.info(
+            f"Restored snapshot at tick {self.tick_count} with {len(self.player_groups)} groups"
+        )
+
+    def _restore_obstacles(self, obstacles: list, next_obstacle_id: int):
+        """Replace the active obstacles, keeping their ids."""
+        if not obstacles and self.pathfinder is None:
+            return
+
+        pathfinder = self._get_pathfinder()
+        for obstacle_id in list(pathfinder.obstacles):
+            pathfinder.remove_obstacle(obstacle_id)
+        for obstacle_id, polygon in obstacles:
+            pathfinder.next_obstacle_id = obstacle_id
+            pathfinder.add_obstacle(polygon)
+        pathfinder.next_obstacle_id = next_obstacle_id
+        self.flow_fields.set_obstacles(list(pathfinder.obstacles.values()))
+
+    def fork(self, snapshot: dict = None, seed: int = None) -> "SimulationEngine":
+        """Create an independent engine from a snapshot, sharing this engine's loaded course.
+
+        Only the course geometry is shared, so forks are cheap to create for
+        batch what-if runs. A seed replaces the snapshot's run seed, so every
+        agent continues with a different stream.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        if seed is not None:
+            snapshot = dict(snapshot, seed=seed)
+
+        engine = copy.copy(self)
+        engine.holes = {
+            hole_num: dict(hole_data) for hole_num, hole_data in self.holes.items()
+        }
+        engine.greenkeeper_paths = dict(
+            self.pathfinder.base_paths if self.pathfinder else self.greenkeeper_paths
+        )
+        engine.pathfinder = None
+        engine.metrics = TickMetrics(self.metrics.window)
+        engine.group_decision_seconds = {}
+        engine.deferred_groups = set()
+        engine.flow_fields = FlowFieldCache(engine.holes, engine.water, engine.bridges)
+        engine.player_groups = []
+        engine.greenkeeper = GreenkeeperAgent(
+            id=1,
+            num_holes=engine.num_holes,
+            holes_data=engine.holes,
+            navigation_paths=engine.greenkeeper_paths,
+            water=engine.water,
+            bridges=engine.bridges,
+            rng=engine.random_stream("greenkeeper"),
+        )
+        engine.wind_agent = WindAgent(rng=engine.random_stream("wind"))
+        engine.restore(snapshot)
+        return engine
+
     def get_state(self, flag_update=None):
         """Get current simulation state."""
         state = {
             "tick": self.tick_count,
             "groups": [
                 {
+                    "id": group.group_id,
                     "current_hole": group.current_hole_number,
                     "players": [player.get_state() for player in group.players],
                 }
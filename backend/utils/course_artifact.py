@@ -0,0 +1,323 @@
+import os
+import json
+import struct
+import hashlib
+import logging
+
+from array import array
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+ARTIFACT_FILE = DATA_DIR / "course" / "course.artifact"
+MANIFEST_FILE = DATA_DIR / "course" / "manifest.json"
+NAVIGATION_CACHE_FILE = DATA_DIR / "navigation_paths_cache.json"
+
+MAGIC = b"GOLFCRSE"
+
+# Bump whenever the section layout changes; older artifacts are then ignored
+ARTIFACT_VERSION = 3
+
+# magic, version, section count, reserved
+HEADER = struct.Struct("<8sHHI")
+# name, byte offset, byte length
+SECTION_ENTRY = struct.Struct("<16sQQ")
+
+# Array typecode of every binary section ("meta" is UTF-8 JSON)
+SECTION_TYPES = {
+    "vertices": "d",  # x, y per vertex
+    "polygons": "I",  # first vertex, vertex count per polygon
+    "bboxes": "d",  # min_x, min_y, max_x, max_y per polygon, for the LOD records
+    "waypoints": "d",  # x, y per navigation waypoint
+    "graph_offsets": "I",  # CSR row offsets, one per waypoint plus one
+    "graph_targets": "I",  # CSR neighbor waypoint indices
+    "graph_weights": "d",  # CSR edge lengths in meters
+    "path_offsets": "I",  # first path vertex per stored path, plus one
+    "path_vertices": "d",  # x, y per path vertex
+}
+
+
+class CourseArtifact:
+    """A compiled course, a fast-load format for startup.
+
+    The file is read in one go and its sections are cast in place to typed
+    arrays, which the engine materializes into its own holes, features and
+    paths. Nothing is shared between processes: every process builds its
+    own copies, only without parsing JSON or rebuilding navigation paths.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        data = path.read_bytes()
+        self._sections = {}
+
+        if len(data) < HEADER.size:
+            raise ValueError(f"Unsupported course artifact: {path}")
+        magic, version, section_count, _ = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported course artifact: {path}")
+
+        self._buffer = memoryview(data)
+        for i in range(section_count):
+            raw_name, offset, length = SECTION_ENTRY.unpack_from(
+                data, HEADER.size + i * SECTION_ENTRY.size
+            )
+            name = raw_name.rstrip(b"\0").decode("ascii")
+            view = self._buffer[offset : offset + length]
+            if name in SECTION_TYPES:
+                view = view.cast(SECTION_TYPES[name])
+            self._sections[name] = view
+
+        self.meta = json.loads(bytes(self._sections["meta"]))
+        self.vertices = self._sections["vertices"]
+        self.polygons = self._sections["polygons"]
+        self.bboxes = self._sections["bboxes"]
+
+    @classmethod
+    def open_if_current(
+        cls, path: Path = ARTIFACT_FILE, digest: Optional[str] = None
+    ) -> Optional["CourseArtifact"]:
+        """Open the artifact if it exists and was compiled from the current sources."""
+        if not path.exists():
+            return None
+
+        try:
+            artifact = cls(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to open course artifact: {e}")
+            return None
+
+        if artifact.meta.get("source_digest") != (digest or source_digest()):
+            artifact.close()
+            return None
+        return artifact
+
+    def close(self):
+        """Release the section views and the file contents."""
+        for view in self._sections.values():
+            view.release()
+        self._sections = {}
+        self._buffer.release()
+
+    def polygon_points(self, polygon_id: int) -> List[Dict[str, float]]:
+        """Get a polygon as the list of points used throughout the simulation."""
+        start, count = self.polygons[2 * polygon_id], self.polygons[2 * polygon_id + 1]
+        vertices = self.vertices
+        return [
+            {"x": vertices[2 * i], "y": vertices[2 * i + 1]}
+            for i in range(start, start + count)
+        ]
+
+    def build_holes(self) -> Dict[int, Dict[str, Any]]:
+        """Materialize hole data in the same shape as the converted hole JSON files."""
+        holes = {}
+        for hole_key, layout in self.meta["holes"].items():
+            hole_data = {}
+            for name in ("fairway", "green"):
+                if layout.get(name) is not None:
+                    hole_data[name] = self.polygon_points(layout[name])
+            for name in ("tees", "bunkers"):
+                if layout.get(name) is not None:
+                    hole_data[name] = [self.polygon_points(p) for p in layout[name]]
+            if layout.get("flag") is not None:
+                hole_data["flag"] = {"x": layout["flag"][0], "y": layout["flag"][1]}
+            if layout.get("lod") is not None:
+                hole_data["lod"] = self._build_hole_lods(layout)
+            holes[int(hole_key)] = hole_data
+        return holes
+
+    def _build_lod(self, polygon_id: int, lod_ids: Dict[str, int]) -> Dict[str, Any]:
+        """Materialize a PolygonLOD record from the polygon's bbox and its LOD rings."""
+        return {
+            "bbox": list(self.bboxes[4 * polygon_id : 4 * polygon_id + 4]),
+            "hull": self.polygon_points(lod_ids["hull"]),
+            "coarse": self.polygon_points(lod_ids["coarse"]),
+        }
+
+    def _build_hole_lods(self, layout: Dict[str, Any]) -> Dict[str, Any]:
+        """Materialize the LOD records of every polygon of a hole."""
+        lods = {}
+        for name in ("fairway", "green"):
+            if name in layout["lod"]:
+                lods[name] = self._build_lod(layout[name], layout["lod"][name])
+        for name in ("tees", "bunkers"):
+            if name in layout["lod"]:
+                lods[name] = [
+                    self._build_lod(polygon_id, lod_ids)
+                    for polygon_id, lod_ids in zip(layout[name], layout["lod"][name])
+                ]
+        return lods
+
+    def build_feature_lods(self, feature_name: str) -> List[Dict[str, Any]]:
+        """Materialize the LOD records of a course-wide feature."""
+        return [
+            self._build_lod(polygon_id, lod_ids)
+            for polygon_id, lod_ids in zip(
+                self.meta.get(feature_name, []),
+                self.meta.get(f"{feature_name}_lod", []),
+            )
+        ]
+
+    def build_feature(self, feature_name: str) -> List[List[Dict[str, float]]]:
+        """Materialize a course-wide feature such as water or bridges."""
+        return [self.polygon_points(p) for p in self.meta.get(feature_name, [])]
+
+    def build_paths(self) -> Dict[Tuple[int, int], List[Dict[str, float]]]:
+        """Materialize the greenkeeper navigation paths."""
+        offsets = self._sections["path_offsets"]
+        vertices = self._sections["path_vertices"]
+        paths = {}
+        for i, (hole_a, hole_b) in enumerate(self.meta["paths"]):
+            paths[(hole_a, hole_b)] = [
+                {"x": vertices[2 * v], "y": vertices[2 * v + 1]}
+                for v in range(offsets[i], offsets[i + 1])
+            ]
+        return paths
+
+    def build_graph_data(self) -> Optional[Dict[str, Any]]:
+        """Materialize the navigation graph in PathFinder.export_graph format."""
+        waypoint_info = self.meta.get("waypoints")
+        if not waypoint_info:
+            return None
+
+        coords = self._sections["waypoints"]
+        offsets = self._sections["graph_offsets"]
+        targets = self._sections["graph_targets"]
+        weights = self._sections["graph_weights"]
+
+        waypoints = [
+            {"x": coords[2 * i], "y": coords[2 * i + 1], **info}
+            for i, info in enumerate(waypoint_info)
+        ]
+        edges = [
+            [i, targets[e], weights[e]]
+            for i in range(len(waypoints))
+            for e in range(offsets[i], offsets[i + 1])
+            if i < targets[e]
+        ]
+        return {"waypoints": waypoints, "edges": edges}
+
+    @staticmethod
+    def write(
+        path: Path,
+        holes: Dict[int, Dict[str, Any]],
+        water: List[List[Dict]],
+        bridges: List[List[Dict]],
+        water_lod: List[Dict[str, Any]],
+        bridges_lod: List[Dict[str, Any]],
+        paths: Dict[Tuple[int, int], List[Dict[str, float]]],
+        graph_data: Optional[Dict[str, Any]],
+        digest: str,
+    ):
+        """Compile course data into a single artifact, replacing any existing one atomically."""
+        arrays = {name: array(code) for name, code in SECTION_TYPES.items()}
+
+        def add_polygon(points: List[Dict[str, float]]) -> int:
+            polygon_id = len(arrays["polygons"]) // 2
+            arrays["polygons"].extend([len(arrays["vertices"]) // 2, len(points)])
+            xs = [p["x"] for p in points]
+            ys = [p["y"] for p in points]
+            for x, y in zip(xs, ys):
+                arrays["vertices"].extend([x, y])
+            if points:
+                arrays["bboxes"].extend([min(xs), min(ys), max(xs), max(ys)])
+            else:
+                arrays["bboxes"].extend([0.0, 0.0, 0.0, 0.0])
+            return polygon_id
+
+        def add_lod(lod: Dict[str, Any]) -> Dict[str, int]:
+            # The bbox is the exact polygon's, so only the rings are stored
+            return {
+                "hull": add_polygon(lod["hull"]),
+                "coarse": add_polygon(lod["coarse"]),
+            }
+
+        meta = {"source_digest": digest, "holes": {}}
+        for hole_num in sorted(holes):
+            hole_data = holes[hole_num]
+            layout = {}
+            for name in ("fairway", "green"):
+                if name in hole_data:
+                    layout[name] = add_polygon(hole_data[name])
+            for name in ("tees", "bunkers"):
+                if name in hole_data:
+                    layout[name] = [add_polygon(p) for p in hole_data[name]]
+            if "flag" in hole_data:
+                layout["flag"] = [hole_data["flag"]["x"], hole_data["flag"]["y"]]
+            if "lod" in hole_data:
+                lods = hole_data["lod"]
+                layout["lod"] = {}
+                for name in ("fairway", "green"):
+                    if name in lods:
+                        layout["lod"][name] = add_lod(lods[name])
+                for name in ("tees", "bunkers"):
+                    if name in lods:
+                        layout["lod"][name] = [add_lod(lod) for lod in lods[name]]
+            meta["holes"][str(hole_num)] = layout
+
+        meta["water"] = [add_polygon(p) for p in water]
+        meta["bridges"] = [add_polygon(p) for p in bridges]
+        meta["water_lod"] = [add_lod(lod) for lod in water_lod]
+        meta["bridges_lod"] = [add_lod(lod) for lod in bridges_lod]
+
+        if graph_data:
+            waypoints = graph_data["waypoints"]
+            meta["waypoints"] = [
+                {k: v for k, v in wp.items() if k not in ("x", "y")} for wp in waypoints
+            ]
+            for wp in waypoints:
+                arrays["waypoints"].extend([wp["x"], wp["y"]])
+
+            adjacency = {i: [] for i in range(len(waypoints))}
+            for i, j, distance in graph_data["edges"]:
+                adjacency[i].append((j, distance))
+                adjacency[j].append((i, distance))
+            arrays["graph_offsets"].append(0)
+            for i in range(len(waypoints)):
+                for j, distance in adjacency[i]:
+                    arrays["graph_targets"].append(j)
+                    arrays["graph_weights"].append(distance)
+                arrays["graph_offsets"].append(len(arrays["graph_targets"]))
+
+        meta["paths"] = []
+        arrays["path_offsets"].append(0)
+        for pair in sorted(paths):
+            meta["paths"].append(list(pair))
+            for point in paths[pair]:
+                arrays["path_vertices"].extend([point["x"], point["y"]])
+            arrays["path_offsets"].append(len(arrays["path_vertices"]) // 2)
+
+        sections = [("meta", json.dumps(meta).encode("utf-8"))]
+        sections += [(name, data.tobytes()) for name, data in arrays.items()]
+
+        # Sections start on 8 byte boundaries so every array can be cast in place
+        offset = HEADER.size + SECTION_ENTRY.size * len(sections)
+        table, blobs = [], []
+        for name, blob in sections:
+            padding = -offset % 8
+            blobs.append(b"\0" * padding + blob)
+            offset += padding
+            table.append(SECTION_ENTRY.pack(name.encode("ascii"), offset, len(blob)))
+            offset += len(blob)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, ARTIFACT_VERSION, len(sections), 0))
+            f.writelines(table)
+            f.writelines(blobs)
+
+        # Replacing (not rewriting) never exposes a half written artifact
+        os.replace(tmp_path, path)
+
+
+def source_digest() -> str:
+    """Digest of the inputs an artifact is compiled from: the conversion manifest and path cache."""
+    digest = hashlib.sha256()
+    for source in (MANIFEST_FILE, NAVIGATION_CACHE_FILE):
+        if source.exists():
+            digest.update(source.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1,314 @@
+import json
+import time
+import logging
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..constants import (
+    EVENT_LOG_CAPACITY,
+    EVENT_LOG_LEVEL,
+    EVENT_SAMPLE_EVERY,
+    EVENT_SINK_FLUSH_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Event kinds: (level, field names, message template filled from the fields)
+EVENT_TYPES: Dict[str, Tuple[int, Tuple[str, ...], str]] = {
+    "tick": (logging.INFO, ("tick",), "TICK {tick}"),
+    "tick_degraded": (
+        logging.INFO,
+        ("tick", "reduced", "deferred", "budget_used"),
+        "[Tick {tick}] Degraded to stay in budget: {reduced} reduced shot searches, "
+        "{deferred} deferred group updates, {budget_used:.0%} of the budget used",
+    ),
+    "group_spawned": (
+        logging.INFO,
+        ("tick", "group", "players"),
+        "[Tick {tick}] Spawned Group {group} on hole 1 with {players} players",
+    ),
+    "group_hole_complete": (
+        logging.INFO,
+        ("tick", "group"),
+        "[Tick {tick}] All players in Group {group} complete! Advancing to next hole.",
+    ),
+    "group_finished": (
+        logging.INFO,
+        ("group",),
+        "Group {group} removed from course after completing all holes",
+    ),
+    "flag_changed": (
+        logging.INFO,
+        ("hole", "x", "y"),
+        "Greenkeeper changed flag on hole {hole} to position ({x:.2f}, {y:.2f})",
+    ),
+    "shot_blocked_by_greenkeeper": (
+        logging.INFO,
+        ("player", "distance", "limit"),
+        "Player {player} cannot shoot: greenkeeper too close ({distance:.2f}m < {limit}m)",
+    ),
+    "shot_blocked_by_player": (
+        logging.INFO,
+        ("player", "distance", "required"),
+        "Player {player} cannot shoot: other player too close ({distance:.2f}m < {required:.2f}m)",
+    ),
+    "shot_started": (
+        logging.INFO,
+        ("player", "stroke", "x", "y", "distance_to_flag", "lie"),
+        "Player {player} taking shot #{stroke}: from ({x:.2f}, {y:.2f}), "
+        "distance to flag: {distance_to_flag:.2f}m, lie: {lie}",
+    ),
+    "ball_in_water": (
+        logging.INFO,
+        ("player", "x", "y"),
+        "Player {player} ball landed in WATER at ({x:.2f}, {y:.2f})",
+    ),
+    "penalty_drop": (
+        logging.INFO,
+        ("player", "x", "y"),
+        "Player {player} PENALTY: Ball dropped at ({x:.2f}, {y:.2f}) - 2m before water entry point",
+    ),
+    "penalty_drop_at_origin": (
+        logging.INFO,
+        ("player",),
+        "Player {player} PENALTY: Ball dropped at original position (couldn't find entry point)",
+    ),
+    "shot_finished": (
+        logging.INFO,
+        ("player", "distance_to_flag"),
+        "Player {player} after shot: distance to flag = {distance_to_flag:.2f}m",
+    ),
+    "player_holed_out": (
+        logging.INFO,
+        ("player", "distance_to_flag", "strokes"),
+        "Player {player} COMPLETED HOLE! Distance to hole: {distance_to_flag:.2f}m, strokes: {strokes}",
+    ),
+    "water_options_rejected": (
+        logging.INFO,
+        ("rejected", "total", "club", "lie"),
+        "Shot selection: Rejected {rejected}/{total} options due to water. "
+        "Selected: club={club}, lie={lie}",
+    ),
+    "wind_initial": (
+        logging.INFO,
+        ("direction", "speed"),
+        "Initial Wind: direction {direction:.1f}°, speed {speed:.1f} m/s",
+    ),
+    "wind_changed": (
+        logging.INFO,
+        ("old_direction", "direction", "old_speed", "speed"),
+        "Wind changed: direction {old_direction:.1f}° -> {direction:.1f}°, "
+        "speed {old_speed:.1f} m/s -> {speed:.1f} m/s",
+    ),
+    "greenkeeper_journey": (
+        logging.INFO,
+        ("hole", "from_hole"),
+        "Greenkeeper: Starting journey to hole {hole} (from {from_hole})",
+    ),
+    "greenkeeper_rerouted": (
+        logging.INFO,
+        ("hole",),
+        "Greenkeeper: Rerouted journey to hole {hole} around closure",
+    ),
+    "greenkeeper_flag_placed": (
+        logging.INFO,
+        ("hole",),
+        "Greenkeeper: Placed flag on hole {hole}",
+    ),
+    "turn_candidates": (
+        logging.DEBUG,
+        ("group", "need_to_shoot"),
+        "Group {group}: Determining current turn index. "
+        "players_need_to_shoot: {need_to_shoot}",
+    ),
+    "turn_set": (
+        logging.DEBUG,
+        ("group", "index", "player", "distance"),
+        "Group {group}: Set current turn to index {index} "
+        "(Player {player}, max distance: {distance:.2f}m)",
+    ),
+    "player_complete_skipped": (
+        logging.DEBUG,
+        ("group", "player"),
+        "Group {group}, Player {player}: completed, skipping",
+    ),
+    "player_distance_to_ball": (
+        logging.DEBUG,
+        ("group", "player", "distance", "threshold"),
+        "Group {group}, Player {player}: distance to ball = {distance:.2f}m "
+        "(threshold: {threshold}m)",
+    ),
+    "players_need_to_shoot": (
+        logging.DEBUG,
+        ("group", "before", "after"),
+        "Group {group} mark_all_players_need_to_shoot: before={before}, after={after}",
+    ),
+}
+
+
+class EventLog:
+    """Structured simulation events in a preallocated ring buffer.
+
+    emit stores the event kind and its raw field values in the next slot;
+    nothing is formatted until events are read, by /events or by the file
+    sink thread. Kinds below the configured level are dropped with a single
+    lookup, and high volume kinds can keep only every Nth event. When the
+    buffer wraps, the oldest events are overwritten.
+    """
+
+    def __init__(self, capacity: int = EVENT_LOG_CAPACITY):
+        self.capacity = capacity
+        self._slots: List[Optional[tuple]] = [None] * capacity
+        # Total events stored; the next event goes to slot sequence % capacity
+        self.sequence = 0
+        # 0 drops a kind, 1 keeps every event, N keeps every Nth
+        self._keep_every: Dict[str, int] = {}
+        self._seen: Dict[str, int] = {}
+        self._sink_file = None
+        self._sink_thread: Optional[threading.Thread] = None
+        self._sink_stop = threading.Event()
+        self._written = 0
+        self.dropped = 0
+        self.configure()
+
+    def configure(
+        self, level: str = EVENT_LOG_LEVEL, sample_every: Dict[str, int] = None
+    ):
+        """Set the lowest recorded level and per kind sampling."""
+        minimum = logging.getLevelName(level.upper())
+        if not isinstance(minimum, int):
+            raise ValueError(f"Unknown event level: {level}")
+        if sample_every is None:
+            sample_every = EVENT_SAMPLE_EVERY
+
+        self._keep_every = {
+            kind: (max(1, sample_every.get(kind, 1)) if event_level >= minimum else 0)
+            for kind, (event_level, _, _) in EVENT_TYPES.items()
+        }
+        self._seen = {kind: 0 for kind in EVENT_TYPES}
+
+    def enabled(self, kind: str) -> bool:
+        """Check if events of a kind are recorded at all, to skip building costly fields."""
+        return self._keep_every[kind] > 0
+
+    def emit(self, kind: str, *fields):
+        """Record an event with its fields in the order of its EVENT_TYPES entry."""
+        keep_every = self._keep_every[kind]
+        if keep_every != 1:
+            if not keep_every:
+                return
+            seen = self._seen[kind] = self._seen[kind] + 1
+            if seen % keep_every:
+                return
+
+        sequence = self.sequence
+        self._slots[sequence % self.capacity] = (sequence, time.time(), kind, fields)
+        self.sequence = sequence + 1
+
+    @staticmethod
+    def to_dict(event: tuple) -> Dict[str, Any]:
+        """Expand a stored event into named fields and its formatted message."""
+        sequence, timestamp, kind, fields = event
+        level, names, template = EVENT_TYPES[kind]
+        values = dict(zip(names, fields))
+        return {
+            "sequence": sequence,
+            "time": timestamp,
+            "kind": kind,
+            "level": logging.getLevelName(level),
+            "fields": values,
+            "message": template.format(**values),
+        }
+
+    def recent(
+        self, limit: int = 100, kind: str = None, since: int = None
+    ) -> List[Dict[str, Any]]:
+        """Get the newest events, oldest first, optionally of one kind or after a sequence."""
+        end = self.sequence
+        start = max(0, end - self.capacity)
+        if since is not None:
+            start = max(start, since + 1)
+
+        events = []
+        for sequence in range(end - 1, start - 1, -1):
+            event = self._slots[sequence % self.capacity]
+            if event is None or event[0] != sequence:
+                continue
+            if kind and event[2] != kind:
+                continue
+            events.append(event)
+            if len(events) >= limit:
+                break
+        return [self.to_dict(event) for event in reversed(events)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer usage and sampling state."""
+        return {
+            "capacity": self.capacity,
+            "stored": self.sequence,
+            "buffered": min(self.sequence, self.capacity),
+            "dropped_by_sink": self.dropped,
+            "recorded_kinds": sorted(
+                kind for kind, keep_every in self._keep_every.items() if keep_every
+            ),
+            "sampled_kinds": {
+                kind: keep_every
+                for kind, keep_every in self._keep_every.items()
+                if keep_every > 1
+            },
+        }
+
+    def start_sink(self, path: str, interval: float = EVENT_SINK_FLUSH_SECONDS):
+        """Append new events to a JSON lines file from a background thread."""
+        if self._sink_thread:
+            raise RuntimeError("The event log already has a file sink")
+        self._sink_file = open(path, "a", encoding="utf-8")
+        self._written = self.sequence
+        self._sink_stop.clear()
+        self._sink_thread = threading.Thread(
+            target=self._run_sink, args=(interval,), name="event-log-sink", daemon=True
+        )
+        self._sink_thread.start()
+        logger.info(f"Writing simulation events to {path}")
+
+    def close(self):
+        """Stop the file sink after writing the remaining events."""
+        if not self._sink_thread:
+            return
+        self._sink_stop.set()
+        self._sink_thread.join()
+        self._sink_thread = None
+        self._drain()
+        self._sink_file.close()
+        self._sink_file = None
+
+    def _run_sink(self, interval: float):
+        while not self._sink_stop.wait(interval):
+            try:
+                self._drain()
+            except OSError as e:
+                logger.error(f"Writing events failed: {e}")
+
+    def _drain(self):
+        """Write events stored since the last drain; events already overwritten count as dropped."""
+        end = self.sequence
+        start = max(self._written, end - self.capacity)
+        self.dropped += start - self._written
+
+        lines = []
+        for sequence in range(start, end):
+            event = self._slots[sequence % self.capacity]
+            if event is None or event[0] != sequence:
+                self.dropped += 1
+                continue
+            lines.append(json.dumps(self.to_dict(event)))
+        self._written = end
+
+        if lines:
+            self._sink_file.write("\n".join(lines) + "\n")
+            self._sink_file.flush()
+
+
+# Shared by all agents and the engine
+event_log = EventLog()
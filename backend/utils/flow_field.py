@@ -0,0 +1,409 @@
+import math
+import heapq
+import logging
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .polygon_lod import PolygonLOD
+from ..constants import (
+    WALKING_GRID_CELL_SIZE,
+    WALKING_GRID_MARGIN,
+    WALKING_GRID_CACHE_SIZE,
+    FLOW_FIELD_BLOCK_CELLS,
+    FLOW_FIELD_CACHE_SIZE,
+    BALL_FIELD_CACHE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+NEIGHBOR_OFFSETS = [
+    (1, 0, 1.0),
+    (-1, 0, 1.0),
+    (0, 1, 1.0),
+    (0, -1, 1.0),
+    (1, 1, math.sqrt(2)),
+    (1, -1, math.sqrt(2)),
+    (-1, 1, math.sqrt(2)),
+    (-1, -1, math.sqrt(2)),
+]
+
+
+class WalkingGrid:
+    """Walkable cells around one hole. Water is blocked unless covered by a bridge."""
+
+    def __init__(
+        self,
+        hole_data: Dict,
+        water: List[List[Dict]],
+        bridges: List[List[Dict]],
+        obstacles: List[List[Dict]] = None,
+        cell_size: float = WALKING_GRID_CELL_SIZE,
+    ):
+        self.cell_size = cell_size
+
+        points = list(hole_data.get("fairway", [])) + list(hole_data.get("green", []))
+        for polygon in hole_data.get("tees", []) + hole_data.get("bunkers", []):
+            points.extend(polygon)
+
+        self.min_x = min(p["x"] for p in points) - WALKING_GRID_MARGIN
+        self.min_y = min(p["y"] for p in points) - WALKING_GRID_MARGIN
+        max_x = max(p["x"] for p in points) + WALKING_GRID_MARGIN
+        max_y = max(p["y"] for p in points) + WALKING_GRID_MARGIN
+
+        self.cols = int(math.ceil((max_x - self.min_x) / cell_size))
+        self.rows = int(math.ceil((max_y - self.min_y) / cell_size))
+        self.block_cols = int(math.ceil(self.cols / FLOW_FIELD_BLOCK_CELLS))
+        self.walkable = bytearray(b"\x01") * (self.cols * self.rows)
+        # Cell -> its block component, labeled a block at a time on first use
+        self._components: Dict[int, Tuple[int, ...]] = {}
+
+        self._mark_blocked(list(water) + list(obstacles or []), bridges)
+
+    def _mark_blocked(self, polygons: List[List[Dict]], bridges: List[List[Dict]]):
+        """Mark cells whose center lies in a blocking polygon as not walkable."""
+        for polygon in polygons:
+            if not polygon:
+                continue
+
+            # Scanline fill: find where each row's center line crosses the ring
+            col_start, row_start, col_end, row_end = self._cell_range(polygon)
+            for row in range(row_start, row_end + 1):
+                y = self.min_y + (row + 0.5) * self.cell_size
+                crossings = []
+                p1 = polygon[-1]
+                for p2 in polygon:
+                    if (p1["y"] < y) != (p2["y"] < y):
+                        t = (y - p1["y"]) / (p2["y"] - p1["y"])
+                        crossings.append(p1["x"] + t * (p2["x"] - p1["x"]))
+                    p1 = p2
+                crossings.sort()
+
+                for enter_x, exit_x in zip(crossings[::2], crossings[1::2]):
+                    first_col = max(
+                        int(math.ceil((enter_x - self.min_x) / self.cell_size - 0.5)),
+                        col_start,
+                    )
+                    last_col = min(
+                        int(math.floor((exit_x - self.min_x) / self.cell_size - 0.5)),
+                        col_end,
+                    )
+                    for col in range(first_col, last_col + 1):
+                        center = self.cell_center(row * self.cols + col)
+                        if any(PolygonLOD.contains(center, b) for b in bridges if b):
+                            continue
+                        self.walkable[row * self.cols + col] = 0
+
+    def _cell_range(self, polygon: List[Dict]) -> Tuple[int, int, int, int]:
+        """Get the clamped (col, row) range covered by a polygon's bounding box."""
+        col_start = int((min(p["x"] for p in polygon) - self.min_x) / self.cell_size)
+        col_end = int((max(p["x"] for p in polygon) - self.min_x) / self.cell_size)
+        row_start = int((min(p["y"] for p in polygon) - self.min_y) / self.cell_size)
+        row_end = int((max(p["y"] for p in polygon) - self.min_y) / self.cell_size)
+        return (
+            max(col_start, 0),
+            max(row_start, 0),
+            min(col_end, self.cols - 1),
+            min(row_end, self.rows - 1),
+        )
+
+    def cell_at(self, position: Dict[str, float]) -> Optional[int]:
+        """Get the cell index containing a position, or None if outside the grid."""
+        col = int((position["x"] - self.min_x) // self.cell_size)
+        row = int((position["y"] - self.min_y) // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def cell_center(self, cell: int) -> Dict[str, float]:
+        """Get the center position of a cell."""
+        row, col = divmod(cell, self.cols)
+        return {
+            "x": self.min_x + (col + 0.5) * self.cell_size,
+            "y": self.min_y + (row + 0.5) * self.cell_size,
+        }
+
+    def neighbors(self, cell: int):
+        """Yield (neighbor cell, step cost in cells) for the 8 surrounding cells."""
+        row, col = divmod(cell, self.cols)
+        for d_col, d_row, cost in NEIGHBOR_OFFSETS:
+            n_col, n_row = col + d_col, row + d_row
+            if 0 <= n_col < self.cols and 0 <= n_row < self.rows:
+                yield n_row * self.cols + n_col, cost
+
+    def block_of(self, cell: int) -> int:
+        """Get the index of the coarse block of cells a cell belongs to."""
+        row, col = divmod(cell, self.cols)
+        return (row // FLOW_FIELD_BLOCK_CELLS) * self.block_cols + (
+            col // FLOW_FIELD_BLOCK_CELLS
+        )
+
+    def block_cells(self, block: int) -> List[int]:
+        """Get the cells of a coarse block."""
+        block_row, block_col = divmod(block, self.block_cols)
+        first_row = block_row * FLOW_FIELD_BLOCK_CELLS
+        first_col = block_col * FLOW_FIELD_BLOCK_CELLS
+        return [
+            row * self.cols + col
+            for row in range(
+                first_row, min(first_row + FLOW_FIELD_BLOCK_CELLS, self.rows)
+            )
+            for col in range(
+                first_col, min(first_col + FLOW_FIELD_BLOCK_CELLS, self.cols)
+            )
+        ]
+
+    def block_component(self, cell: int) -> Tuple[int, ...]:
+        """Get the walkable cells of a cell's block that connect to it without leaving the block.
+
+        A cell that is not walkable gets the component of a walkable neighbor
+        in its block, or every cell of a block that is all water.
+        """
+        component = self._components.get(cell)
+        if component is not None:
+            return component
+
+        block = self.block_of(cell)
+        cells = self.block_cells(block)
+        for start in cells:
+            if not self.walkable[start] or start in self._components:
+                continue
+            found = [start]
+            seen = {start}
+            for current in found:
+                for neighbor, _ in self.neighbors(current):
+                    if (
+                        neighbor not in seen
+                        and self.walkable[neighbor]
+                        and self.block_of(neighbor) == block
+                    ):
+                        seen.add(neighbor)
+                        found.append(neighbor)
+            component = tuple(sorted(found))
+            for member in found:
+                self._components[member] = component
+
+        if not self.walkable[cell]:
+            component = tuple(cells)
+            for neighbor, _ in self.neighbors(cell):
+                if self.walkable[neighbor] and self.block_of(neighbor) == block:
+                    component = self._components[neighbor]
+                    break
+            self._components[cell] = component
+        return self._components[cell]
+
+
+class FlowField:
+    """Next-step pointers from the walkable cells of a window toward a set of target cells.
+
+    A field toward a block component (toward_cells) covers the whole hole
+    grid and is shared by balls resting near each other. A field toward a
+    ball's own cell (toward_cell) only covers the cells around its block; it
+    reaches all of the ball's block component, so it always finishes the walk
+    and every step of a walk is a lookup.
+    """
+
+    def __init__(
+        self,
+        grid: WalkingGrid,
+        targets: List[int],
+        window: Tuple[int, int, int, int],
+    ):
+        self.grid = grid
+        self.col_min, self.row_min, col_max, row_max = window
+        self.cols = col_max - self.col_min + 1
+        self.rows = row_max - self.row_min + 1
+        self.distance = array("d", [math.inf]) * (self.cols * self.rows)
+        self.next_cell = array("i", [-1]) * (self.cols * self.rows)
+        self._compute(targets)
+
+    @staticmethod
+    def toward_cells(grid: WalkingGrid, cells: Tuple[int, ...]) -> "FlowField":
+        """Field over the whole grid toward a set of cells, such as a block component."""
+        return FlowField(grid, list(cells), (0, 0, grid.cols - 1, grid.rows - 1))
+
+    @staticmethod
+    def toward_cell(grid: WalkingGrid, cell: int) -> "FlowField":
+        """Field toward one cell over its block and a margin of a quarter block around it."""
+        row, col = divmod(cell, grid.cols)
+        first_col = col - col % FLOW_FIELD_BLOCK_CELLS
+        first_row = row - row % FLOW_FIELD_BLOCK_CELLS
+        margin = FLOW_FIELD_BLOCK_CELLS // 4
+        window = (
+            max(first_col - margin, 0),
+            max(first_row - margin, 0),
+            min(first_col + FLOW_FIELD_BLOCK_CELLS - 1 + margin, grid.cols - 1),
+            min(first_row + FLOW_FIELD_BLOCK_CELLS - 1 + margin, grid.rows - 1),
+        )
+        return FlowField(grid, [cell], window)
+
+    def _index(self, cell: int) -> Optional[int]:
+        """Get a grid cell's index in the window arrays, or None outside the window."""
+        row, col = divmod(cell, self.grid.cols)
+        col -= self.col_min
+        row -= self.row_min
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def _compute(self, targets: List[int]):
+        """Dijkstra outward from the targets over walkable cells inside the window.
+
+        Works on window indices directly; this runs for every field built.
+        """
+        walkable = self.grid.walkable
+        grid_cols = self.grid.cols
+        cols, rows = self.cols, self.rows
+        col_min, row_min = self.col_min, self.row_min
+        distance = self.distance
+        next_cell = self.next_cell
+
+        open_set = []
+        for cell in targets:
+            index = self._index(cell)
+            distance[index] = 0.0
+            open_set.append((0.0, index))
+        heapq.heapify(open_set)
+
+        while open_set:
+            current_distance, index = heapq.heappop(open_set)
+            if current_distance > distance[index]:
+                continue
+
+            row, col = divmod(index, cols)
+            cell = (row + row_min) * grid_cols + col + col_min
+            for d_col, d_row, cost in NEIGHBOR_OFFSETS:
+                n_col, n_row = col + d_col, row + d_row
+                if not (0 <= n_col < cols and 0 <= n_row < rows):
+                    continue
+                if not walkable[(n_row + row_min) * grid_cols + n_col + col_min]:
+                    continue
+                neighbor = n_row * cols + n_col
+                new_distance = current_distance + cost
+                if new_distance < distance[neighbor]:
+                    distance[neighbor] = new_distance
+                    next_cell[neighbor] = cell
+                    heapq.heappush(open_set, (new_distance, neighbor))
+
+    def distance_at(self, cell: int) -> float:
+        """Get the walking distance in cells from a cell to the targets, inf if unreachable."""
+        index = self._index(cell)
+        return math.inf if index is None else self.distance[index]
+
+    def step_from(self, cell: int) -> Optional[int]:
+        """Get the next cell toward the targets, or None at a target or if none is reachable."""
+        index = self._index(cell)
+        if index is None or self.distance[index] == 0.0:
+            return None
+        next_cell = self.next_cell[index]
+        if next_cell >= 0:
+            return next_cell
+
+        # Cells that are not walkable themselves step to their best neighbor
+        best_cell, best_distance = None, math.inf
+        for neighbor, cost in self.grid.neighbors(cell):
+            if self.distance_at(neighbor) + cost < best_distance:
+                best_cell, best_distance = neighbor, self.distance_at(neighbor) + cost
+        return best_cell
+
+
+class FlowFieldCache:
+    """Lazily built walking grids per hole and flow fields per block component and ball, all LRU evicted."""
+
+    def __init__(
+        self,
+        holes: Dict[int, Dict],
+        water: List[List[Dict]],
+        bridges: List[List[Dict]],
+    ):
+        self.holes = holes
+        self.water = water
+        self.bridges = bridges
+        self.obstacles: List[List[Dict]] = []
+        self._grids: "OrderedDict[int, WalkingGrid]" = OrderedDict()
+        self._fields: "OrderedDict[Tuple[int, tuple], FlowField]" = OrderedDict()
+        self._ball_fields: "OrderedDict[Tuple[int, int], FlowField]" = OrderedDict()
+
+    def get_grid(self, hole_number: int) -> WalkingGrid:
+        """Get the walking grid for a hole, building it on first use."""
+        grid = self._grids.get(hole_number)
+        if grid is not None:
+            self._grids.move_to_end(hole_number)
+            return grid
+
+        grid = WalkingGrid(
+            self.holes[hole_number], self.water, self.bridges, self.obstacles
+        )
+        self._grids[hole_number] = grid
+        if len(self._grids) > WALKING_GRID_CACHE_SIZE:
+            evicted_hole, _ = self._grids.popitem(last=False)
+            self._fields = OrderedDict(
+                (key, field)
+                for key, field in self._fields.items()
+                if key[0] != evicted_hole
+            )
+            self._ball_fields = OrderedDict(
+                (key, field)
+                for key, field in self._ball_fields.items()
+                if key[0] != evicted_hole
+            )
+
+        logger.debug(
+            f"Built walking grid for hole {hole_number} ({grid.cols}x{grid.rows} cells)"
+        )
+        return grid
+
+    def get_field(
+        self, hole_number: int, target: Dict[str, float]
+    ) -> Optional[FlowField]:
+        """Get the flow field toward a target's block component, or None if it lies outside the hole grid."""
+        grid = self.get_grid(hole_number)
+        target_cell = grid.cell_at(target)
+        if target_cell is None:
+            return None
+
+        component = grid.block_component(target_cell)
+        key = (hole_number, component)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            return field
+
+        field = FlowField.toward_cells(grid, component)
+        self._fields[key] = field
+        if len(self._fields) > FLOW_FIELD_CACHE_SIZE:
+            self._fields.popitem(last=False)
+        return field
+
+    def get_ball_field(
+        self, hole_number: int, target: Dict[str, float]
+    ) -> Optional[FlowField]:
+        """Get the flow field toward a target's own cell, or None if it lies outside the hole grid."""
+        grid = self.get_grid(hole_number)
+        target_cell = grid.cell_at(target)
+        if target_cell is None:
+            return None
+
+        key = (hole_number, target_cell)
+        field = self._ball_fields.get(key)
+        if field is not None:
+            self._ball_fields.move_to_end(key)
+            return field
+
+        field = FlowField.toward_cell(grid, target_cell)
+        self._ball_fields[key] = field
+        if len(self._ball_fields) > BALL_FIELD_CACHE_SIZE:
+            self._ball_fields.popitem(last=False)
+        return field
+
+    def set_obstacles(self, obstacles: List[List[Dict]]):
+        """Replace the blocking obstacles and drop everything built with the old ones."""
+        self.obstacles = obstacles
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop all cached grids and fields."""
+        self._grids.clear()
+        self._fields.clear()
+        self._ball_fields.clear()
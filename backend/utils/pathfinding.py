@@ -4,6 +4,7 @@ import logging
 from typing import Dict, List, Tuple, Optional
 
 from .calculations import Calculations
+from .polygon_lod import PolygonLOD
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +22,20 @@ class PathFinder:
         self.waypoints = []
         self.graph = {}
 
+        # Dynamic obstacles (temporary closures) and incremental repair state
+        self.obstacles: Dict[int, List[Dict]] = {}
+        self.next_obstacle_id = 1
+        self.paths: Dict[Tuple[int, int], List[Dict[str, float]]] = {}
+        self.base_paths: Dict[Tuple[int, int], List[Dict[str, float]]] = {}
+        self._water_edge_cache: Dict[Tuple[int, int], bool] = {}
+        self._obstacle_bboxes: Dict[int, List[float]] = {}
+
     def _is_point_in_water(self, point: Dict[str, float]) -> bool:
         """Check if a point is inside any water hazard (excluding bridges)."""
         for water_polygon in self.water:
-            if Calculations.point_in_polygon(point, water_polygon):
+            if PolygonLOD.contains(point, water_polygon):
                 for bridge in self.bridges:
-                    if Calculations.point_in_polygon(point, bridge):
+                    if PolygonLOD.contains(point, bridge):
                         return False
                 return True
         return False
@@ -50,15 +59,12 @@ class PathFinder:
             sample_y = start["y"] + t * (end["y"] - start["y"])
             sample_point = {"x": sample_x, "y": sample_y}
 
-            in_water = any(
-                Calculations.point_in_polygon(sample_point, w) for w in self.water
-            )
+            in_water = any(PolygonLOD.contains(sample_point, w) for w in self.water)
 
             if in_water:
                 if self.bridges:
                     on_bridge = any(
-                        Calculations.point_in_polygon(sample_point, b)
-                        for b in self.bridges
+                        PolygonLOD.contains(sample_point, b) for b in self.bridges
                     )
                     if not on_bridge:
                         return True
@@ -143,7 +149,9 @@ class PathFinder:
 
         for i in range(len(waypoints)):
             for j in range(i + 1, len(waypoints)):
-                if not self._path_crosses_water(waypoints[i], waypoints[j]):
+                crosses_water = self._path_crosses_water(waypoints[i], waypoints[j])
+                self._water_edge_cache[(i, j)] = crosses_water
+                if not crosses_water:
                     distance = Calculations.get_distance(waypoints[i], waypoints[j])
                     self.graph[i].append((j, distance))
                     self.graph[j].append((i, distance))
@@ -185,12 +193,10 @@ class PathFinder:
     ) -> Dict[Tuple[int, int], List[Dict[str, float]]]:
         """Pre-compute shortest paths between all pairs of holes."""
         self.waypoints = self._generate_waypoints(holes)
+        self._water_edge_cache = {}
         self._build_graph(self.waypoints)
 
-        hole_to_waypoint = {}
-        for i, wp in enumerate(self.waypoints):
-            if wp.get("type") == "hole":
-                hole_to_waypoint[wp["hole_num"]] = i
+        hole_to_waypoint = self._get_hole_waypoints()
 
         paths = {}
         hole_nums = sorted(holes.keys())
@@ -230,4 +236,216 @@ class PathFinder:
                             self.waypoints[start_idx],
                         ]
 
+        self.paths = paths
+        self.base_paths = dict(paths)
         return paths
+
+    def _get_hole_waypoints(self) -> Dict[int, int]:
+        """Map each hole number to the index of its green center waypoint."""
+        return {
+            wp["hole_num"]: i
+            for i, wp in enumerate(self.waypoints)
+            if wp.get("type") == "hole"
+        }
+
+    def load_paths(
+        self,
+        holes: Dict[int, Dict],
+        paths: Dict[Tuple[int, int], List[Dict[str, float]]],
+        graph_data: Optional[Dict] = None,
+    ):
+        """Adopt previously computed paths so they can be repaired incrementally.
+
+        The paths dict is kept by reference, so repairs are visible to anyone
+        holding it (e.g. the greenkeeper). Without cached graph data, edges are
+        checked against water lazily during repairs.
+        """
+        if graph_data:
+            self.waypoints = graph_data["waypoints"]
+            self.graph = {i: [] for i in range(len(self.waypoints))}
+            for i, j, distance in graph_data["edges"]:
+                self.graph[i].append((j, distance))
+                self.graph[j].append((i, distance))
+        else:
+            self.waypoints = self._generate_waypoints(holes)
+            self.graph = {}
+
+        self._water_edge_cache = {}
+        self.paths = paths
+        self.base_paths = dict(paths)
+
+    def export_graph(self) -> Dict:
+        """Export waypoints and water-free edges for caching."""
+        return {
+            "waypoints": self.waypoints,
+            "edges": [
+                [i, j, distance]
+                for i, neighbors in self.graph.items()
+                for j, distance in neighbors
+                if i < j
+            ],
+        }
+
+    def _edge_is_clear(self, i: int, j: int) -> bool:
+        """Check if the edge between two waypoints avoids water and obstacles."""
+        key = (i, j) if i < j else (j, i)
+        crosses_water = self._water_edge_cache.get(key)
+        if crosses_water is None and self.graph:
+            # Only water-free edges are part of a built graph
+            crosses_water = not any(n == j for n, _ in self.graph[i])
+            self._water_edge_cache[key] = crosses_water
+        elif crosses_water is None:
+            crosses_water = self._path_crosses_water(
+                self.waypoints[i], self.waypoints[j]
+            )
+            self._water_edge_cache[key] = crosses_water
+
+        if crosses_water:
+            return False
+        return not self._segment_hits_obstacles(
+            self.waypoints[i], self.waypoints[j], self.obstacles.keys()
+        )
+
+    def _segment_hits_obstacles(
+        self, start: Dict[str, float], end: Dict[str, float], obstacle_ids
+    ) -> bool:
+        """Check if a straight segment touches any of the given obstacles."""
+        seg_min_x, seg_max_x = sorted((start["x"], end["x"]))
+        seg_min_y, seg_max_y = sorted((start["y"], end["y"]))
+
+        for obstacle_id in obstacle_ids:
+            min_x, min_y, max_x, max_y = self._obstacle_bboxes[obstacle_id]
+            if (
+                seg_max_x < min_x
+                or seg_min_x > max_x
+                or seg_max_y < min_y
+                or seg_min_y > max_y
+            ):
+                continue
+
+            if Calculations.line_segment_intersects_polygon(
+                start, end, self.obstacles[obstacle_id]
+            ):
+                return True
+
+        return False
+
+    def _path_hits_obstacles(self, path: List[Dict[str, float]], obstacle_ids) -> bool:
+        """Check if any leg of a stored path touches the given obstacles."""
+        for start, end in zip(path, path[1:]):
+            if self._segment_hits_obstacles(start, end, obstacle_ids):
+                return True
+        return False
+
+    def _lazy_astar(self, start_idx: int, goal_idx: int) -> Optional[List[int]]:
+        """A* that validates edges only when popped.
+
+        Uses the built graph when available, otherwise treats every waypoint
+        pair as a candidate edge so a repair only pays for the water checks
+        the search actually commits to.
+        """
+        if start_idx == goal_idx:
+            return [start_idx]
+
+        goal = self.waypoints[goal_idx]
+        open_set = [(0.0, 0.0, start_idx, None)]
+        parents = {}
+
+        while open_set:
+            f_score, g_score, current, parent = heapq.heappop(open_set)
+
+            if current in parents:
+                continue
+
+            if parent is not None and not self._edge_is_clear(parent, current):
+                continue
+
+            parents[current] = parent
+
+            if current == goal_idx:
+                path = [current]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return list(reversed(path))
+
+            if self.graph:
+                neighbors = self.graph[current]
+            else:
+                current_wp = self.waypoints[current]
+                neighbors = [
+                    (n, Calculations.get_distance(current_wp, wp))
+                    for n, wp in enumerate(self.waypoints)
+                ]
+
+            for neighbor, edge_cost in neighbors:
+                if neighbor in parents:
+                    continue
+                new_g = g_score + edge_cost
+                h = Calculations.get_distance(self.waypoints[neighbor], goal)
+                heapq.heappush(open_set, (new_g + h, new_g, neighbor, current))
+
+        return None  # No path found
+
+    def _repair_paths(self, pairs: List[Tuple[int, int]]):
+        """Replan the given hole pairs (and their reverse) around current obstacles."""
+        hole_to_waypoint = self._get_hole_waypoints()
+
+        for hole_a, hole_b in pairs:
+            start_idx = hole_to_waypoint[hole_a]
+            goal_idx = hole_to_waypoint[hole_b]
+
+            base_path = self.base_paths.get((hole_a, hole_b))
+            if base_path and not self._path_hits_obstacles(
+                base_path, self.obstacles.keys()
+            ):
+                path_coords = base_path
+            else:
+                waypoint_path = self._lazy_astar(start_idx, goal_idx)
+                if waypoint_path:
+                    path_coords = [self.waypoints[idx] for idx in waypoint_path]
+                else:
+                    logger.warning(
+                        f"No path around obstacles between holes {hole_a} and {hole_b} - keeping direct path"
+                    )
+                    path_coords = [
+                        self.waypoints[start_idx],
+                        self.waypoints[goal_idx],
+                    ]
+
+            self.paths[(hole_a, hole_b)] = path_coords
+            self.paths[(hole_b, hole_a)] = list(reversed(path_coords))
+
+    def add_obstacle(
+        self, polygon: List[Dict[str, float]]
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """Close an area and repair only the stored paths that pass through it."""
+        obstacle_id = self.next_obstacle_id
+        self.next_obstacle_id += 1
+        self.obstacles[obstacle_id] = polygon
+        self._obstacle_bboxes[obstacle_id] = PolygonLOD.bounding_box(polygon)
+
+        affected = [
+            pair
+            for pair, path in self.paths.items()
+            if pair[0] < pair[1] and self._path_hits_obstacles(path, [obstacle_id])
+        ]
+        self._repair_paths(affected)
+
+        return obstacle_id, affected + [(b, a) for a, b in affected]
+
+    def remove_obstacle(self, obstacle_id: int) -> List[Tuple[int, int]]:
+        """Reopen an area and restore or improve the paths that were detoured."""
+        if obstacle_id not in self.obstacles:
+            return []
+
+        del self.obstacles[obstacle_id]
+        del self._obstacle_bboxes[obstacle_id]
+
+        affected = [
+            pair
+            for pair, path in self.paths.items()
+            if pair[0] < pair[1] and path is not self.base_paths.get(pair)
+        ]
+        self._repair_paths(affected)
+
+        return affected + [(b, a) for a, b in affected]
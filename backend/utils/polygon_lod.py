@@ -0,0 +1,209 @@
+import math
+
+from typing import Dict, List, Any
+
+from .calculations import Calculations
+from .tick_metrics import HotPathCounters
+
+
+class LODPolygon(list):
+    """A polygon's points together with its LOD record.
+
+    Built once by the engine that loads the course, so the record lives and
+    dies with that engine's hole and feature data.
+    """
+
+    def __init__(self, points: List[Dict[str, float]], lod: Dict[str, Any]):
+        super().__init__(points)
+        self.lod = lod
+
+
+class PolygonLOD:
+    """Levels of detail for course polygons.
+
+    Each polygon gets a bounding box and a convex hull that contain it, used to
+    reject points cheaply before the exact ring test, and a simplified coarse
+    ring for clients. Course polygons carry their record as an LODPolygon;
+    any other polygon (obstacles, temporary rings) gets the exact test only.
+    """
+
+    @staticmethod
+    def build(polygon: List[Dict[str, float]], tolerance: float) -> Dict[str, Any]:
+        """Build the bounding box, collision hull and coarse ring of a polygon."""
+        return {
+            "bbox": PolygonLOD.bounding_box(polygon),
+            "hull": PolygonLOD.convex_hull(polygon),
+            "coarse": PolygonLOD.simplify(polygon, tolerance),
+        }
+
+    @staticmethod
+    def attach(polygon: List[Dict[str, float]], lod: Dict[str, Any]) -> LODPolygon:
+        """Get the polygon with its precomputed LOD record attached."""
+        return LODPolygon(polygon, lod)
+
+    @staticmethod
+    def contains(point, polygon: List[Dict[str, float]]) -> bool:
+        """Exact point in polygon test, rejecting via bounding box and hull first."""
+        HotPathCounters.polygon_tests += 1
+        if isinstance(point, dict):
+            x, y = point["x"], point["y"]
+        else:
+            x, y = point
+
+        lod = getattr(polygon, "lod", None)
+        if lod is None:
+            return Calculations.point_in_polygon((x, y), polygon)
+
+        min_x, min_y, max_x, max_y = lod["bbox"]
+        if x < min_x or x > max_x or y < min_y or y > max_y:
+            return False
+
+        if not PolygonLOD._in_convex_hull(x, y, lod["hull"]):
+            return False
+
+        return Calculations.point_in_polygon((x, y), polygon)
+
+    @staticmethod
+    def bounding_box(polygon: List[Dict[str, float]]) -> List[float]:
+        """Get the [min_x, min_y, max_x, max_y] bounding box of a polygon."""
+        if not polygon:
+            return [0.0, 0.0, 0.0, 0.0]
+        xs = [p["x"] for p in polygon]
+        ys = [p["y"] for p in polygon]
+        return [min(xs), min(ys), max(xs), max(ys)]
+
+    @staticmethod
+    def convex_hull(polygon: List[Dict[str, float]]) -> List[Dict[str, float]]:
+        """Counter-clockwise convex hull (monotone chain), a conservative collision hull."""
+        points = sorted({(p["x"], p["y"]) for p in polygon})
+        if len(points) < 3:
+            return [{"x": x, "y": y} for x, y in points]
+
+        def cross(o, a, b):
+            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+        lower, upper = [], []
+        for p in points:
+            while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+                lower.pop()
+            lower.append(p)
+        for p in reversed(points):
+            while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+                upper.pop()
+            upper.append(p)
+
+        return [{"x": x, "y": y} for x, y in lower[:-1] + upper[:-1]]
+
+    @staticmethod
+    def _in_convex_hull(x: float, y: float, hull: List[Dict[str, float]]) -> bool:
+        """Inclusive test against a counter-clockwise convex hull."""
+        n = len(hull)
+        if n < 3:
+            return True
+
+        for i in range(n):
+            a = hull[i]
+            b = hull[(i + 1) % n]
+            cross = (b["x"] - a["x"]) * (y - a["y"]) - (b["y"] - a["y"]) * (x - a["x"])
+            if cross < -1e-9:
+                return False
+        return True
+
+    @staticmethod
+    def simplify(
+        polygon: List[Dict[str, float]], tolerance: float
+    ) -> List[Dict[str, float]]:
+        """Douglas-Peucker simplification of a ring within tolerance meters.
+
+        The tolerance is halved until the result does not self-intersect, so
+        the ring's topology is preserved; the original is returned otherwise.
+        """
+        closed = len(polygon) > 1 and polygon[0] == polygon[-1]
+        ring = polygon[:-1] if closed else polygon
+        if len(ring) <= 4:
+            return list(polygon)
+
+        while tolerance > 0.01:
+            # Split the ring at the vertex farthest from the first one
+            far = max(
+                range(len(ring)),
+                key=lambda i: Calculations.get_distance(ring[0], ring[i]),
+            )
+            first = PolygonLOD._douglas_peucker(ring[: far + 1], tolerance)
+            second = PolygonLOD._douglas_peucker(ring[far:] + [ring[0]], tolerance)
+            simplified = first[:-1] + second[:-1]
+
+            if len(simplified) >= 3 and not PolygonLOD._self_intersects(simplified):
+                return simplified + [simplified[0]] if closed else simplified
+            tolerance /= 2
+
+        return list(polygon)
+
+    @staticmethod
+    def _douglas_peucker(
+        points: List[Dict[str, float]], tolerance: float
+    ) -> List[Dict[str, float]]:
+        """Simplify an open polyline, always keeping both endpoints."""
+        keep = [False] * len(points)
+        keep[0] = keep[-1] = True
+        stack = [(0, len(points) - 1)]
+
+        while stack:
+            start, end = stack.pop()
+            max_distance, max_index = 0.0, None
+            for i in range(start + 1, end):
+                distance = PolygonLOD._distance_to_segment(
+                    points[i], points[start], points[end]
+                )
+                if distance > max_distance:
+                    max_distance, max_index = distance, i
+
+            if max_index is not None and max_distance > tolerance:
+                keep[max_index] = True
+                stack.append((start, max_index))
+                stack.append((max_index, end))
+
+        return [p for p, kept in zip(points, keep) if kept]
+
+    @staticmethod
+    def _distance_to_segment(
+        point: Dict[str, float], start: Dict[str, float], end: Dict[str, float]
+    ) -> float:
+        """Shortest distance from a point to a line segment."""
+        dx = end["x"] - start["x"]
+        dy = end["y"] - start["y"]
+        length_sq = dx * dx + dy * dy
+        if length_sq == 0:
+            return Calculations.get_distance(point, start)
+
+        t = (
+            (point["x"] - start["x"]) * dx + (point["y"] - start["y"]) * dy
+        ) / length_sq
+        t = max(0.0, min(1.0, t))
+        return math.hypot(
+            point["x"] - (start["x"] + t * dx), point["y"] - (start["y"] + t * dy)
+        )
+
+    @staticmethod
+    def _self_intersects(ring: List[Dict[str, float]]) -> bool:
+        """Check if any two non-adjacent edges of a closed ring cross."""
+
+        def orientation(a, b, c):
+            value = (b["x"] - a["x"]) * (c["y"] - a["y"]) - (b["y"] - a["y"]) * (
+                c["x"] - a["x"]
+            )
+            return (value > 1e-12) - (value < -1e-12)
+
+        n = len(ring)
+        for i in range(n):
+            a1, a2 = ring[i], ring[(i + 1) % n]
+            for j in range(i + 2, n):
+                if i == 0 and j == n - 1:
+                    continue
+                b1, b2 = ring[j], ring[(j + 1) % n]
+                if (
+                    orientation(a1, a2, b1) * orientation(a1, a2, b2) < 0
+                    and orientation(b1, b2, a1) * orientation(b1, b2, a2) < 0
+                ):
+                    return True
+        return False
@@ -0,0 +1,167 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import tracemalloc
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from ..constants import PROFILER_MEMORY_TOP, PROFILER_SAMPLE_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class TickProfiler:
+    """Samples the simulation thread's stack during the next N ticks.
+
+    A background thread reads the stack of the thread running the ticks
+    every interval, only while a tick is in progress, and counts each
+    distinct stack. The result is in the collapsed stack format read by
+    flamegraph tools. A capture can also diff tracemalloc snapshots taken
+    before and after its ticks. Nothing runs between captures.
+    """
+
+    def __init__(self, interval: float = PROFILER_SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.in_tick = False
+        self._capture: Optional[Dict[str, Any]] = None
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def busy(self) -> bool:
+        return self._capture is not None
+
+    def start(self, ticks: int, memory: bool = False) -> asyncio.Future:
+        """Profile the next ticks of the calling thread; the future resolves to the result."""
+        if self._capture is not None:
+            raise RuntimeError("A profile capture is already running")
+
+        capture = {
+            "ticks": ticks,
+            "ticks_done": 0,
+            "tick_seconds": 0.0,
+            "stacks": Counter(),
+            "thread_id": threading.get_ident(),
+            "stop": threading.Event(),
+            "future": asyncio.get_running_loop().create_future(),
+            "memory_started": False,
+            "memory_before": None,
+        }
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                capture["memory_started"] = True
+            capture["memory_before"] = tracemalloc.take_snapshot()
+
+        capture["sampler"] = threading.Thread(
+            target=self._sample, args=(capture,), name="tick-profiler", daemon=True
+        )
+        self._capture = capture
+        capture["sampler"].start()
+        logger.info(f"Profiling the next {ticks} ticks")
+        return capture["future"]
+
+    def tick_started(self):
+        """Mark the start of a tick; samples are only taken inside ticks."""
+        if self._capture is not None:
+            self._capture["tick_started"] = time.perf_counter()
+            self.in_tick = True
+
+    def tick_finished(self):
+        """Mark the end of a tick and finish the capture after its last tick."""
+        capture = self._capture
+        if capture is None or not self.in_tick:
+            return
+        self.in_tick = False
+        capture["tick_seconds"] += time.perf_counter() - capture["tick_started"]
+        capture["ticks_done"] += 1
+        if capture["ticks_done"] >= capture["ticks"]:
+            self._finish()
+
+    def cancel(self):
+        """Stop a running capture without a result, e.g. on shutdown."""
+        capture = self._capture
+        if capture is None:
+            return
+        self._stop(capture)
+        if not capture["future"].done():
+            capture["future"].cancel()
+
+    def _stop(self, capture: Dict[str, Any]):
+        self._capture = None
+        self.in_tick = False
+        capture["stop"].set()
+        capture["sampler"].join()
+        if capture["memory_started"]:
+            tracemalloc.stop()
+
+    def _finish(self):
+        capture = self._capture
+        memory = None
+        if capture["memory_before"] is not None:
+            memory = self._memory_diff(
+                capture["memory_before"], tracemalloc.take_snapshot()
+            )
+        self._stop(capture)
+
+        stacks = capture["stacks"]
+        result = {
+            "ticks": capture["ticks_done"],
+            "tick_seconds": round(capture["tick_seconds"], 6),
+            "interval": self.interval,
+            "samples": sum(stacks.values()),
+            "collapsed": "".join(
+                f"{stack} {count}\n" for stack, count in stacks.most_common()
+            ),
+            "memory": memory,
+        }
+        logger.info(
+            f"Profiled {result['ticks']} ticks with {result['samples']} samples"
+        )
+        if not capture["future"].done():
+            capture["future"].set_result(result)
+
+    def _sample(self, capture: Dict[str, Any]):
+        """Sampler thread: count the stacks seen while a tick runs."""
+        thread_id = capture["thread_id"]
+        stacks = capture["stacks"]
+        stop = capture["stop"]
+        while not stop.wait(self.interval):
+            if not self.in_tick:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame))
+                frame = frame.f_back
+            stacks[";".join(reversed(labels))] += 1
+
+    def _label(self, frame) -> str:
+        """Name a frame as module:qualified function, cached per code object."""
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = self._labels[code] = (
+                f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+            )
+        return label
+
+    @staticmethod
+    def _memory_diff(
+        before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+    ) -> List[Dict[str, Any]]:
+        """Allocation sites that grew the most between two snapshots."""
+        return [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+            }
+            for stat in after.compare_to(before, "lineno")[:PROFILER_MEMORY_TOP]
+        ]
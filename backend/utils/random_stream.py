@@ -0,0 +1,48 @@
+import hashlib
+import secrets
+
+# Scales the top 53 bits of a draw to a float in [0, 1)
+FLOAT_SCALE = 2.0**-53
+
+
+class RandomStream:
+    """Counter-based random numbers: draw n is a keyed hash of n.
+
+    A stream is identified by the run seed and a name such as "player:12".
+    Its draws depend only on those and its own counter, never on other
+    streams, so results do not change with the order in which agents are
+    evaluated, and the whole stream state is a single integer.
+    """
+
+    def __init__(self, seed: int, name: str, counter: int = 0):
+        self.seed = seed
+        self.name = name
+        self.counter = counter
+
+        run_key = (seed % 2**64).to_bytes(8, "little")
+        stream_key = hashlib.blake2b(name.encode(), key=run_key).digest()
+        self._hasher = hashlib.blake2b(key=stream_key, digest_size=8)
+
+    @staticmethod
+    def new_seed() -> int:
+        """Get a fresh run seed for runs that do not need to be reproduced."""
+        return secrets.randbits(63)
+
+    def next_int(self) -> int:
+        """Draw a uniform 64-bit integer."""
+        hasher = self._hasher.copy()
+        hasher.update(self.counter.to_bytes(8, "little"))
+        self.counter += 1
+        return int.from_bytes(hasher.digest(), "little")
+
+    def random(self) -> float:
+        """Draw a float in [0, 1)."""
+        return (self.next_int() >> 11) * FLOAT_SCALE
+
+    def uniform(self, a: float, b: float) -> float:
+        """Draw a float between a and b, like random.uniform."""
+        return a + (b - a) * self.random()
+
+    def randint(self, a: int, b: int) -> int:
+        """Draw an integer between a and b inclusive, like random.randint."""
+        return a + self.next_int() % (b - a + 1)
@@ -0,0 +1,226 @@
+import math
+import time
+import logging
+import functools
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from .calculations import Calculations
+from .event_log import event_log
+from .polygon_lod import PolygonLOD
+from .random_stream import RandomStream
+from .tick_metrics import HotPathCounters
+from ..constants import (
+    EQUIVALENCE_ABS_TOLERANCE,
+    EQUIVALENCE_REL_TOLERANCE,
+    SHADOW_MISMATCH_HISTORY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def exact_geometry():
+    """Run polygon tests with the plain ray casting test instead of the LOD rejection levels."""
+    original = PolygonLOD.__dict__["contains"]
+    PolygonLOD.contains = staticmethod(Calculations.point_in_polygon)
+    try:
+        yield
+    finally:
+        PolygonLOD.contains = original
+
+
+@contextmanager
+def unobserved():
+    """Keep a run out of the hot path counters and the event log, e.g. a shadow reference run."""
+    counters = {
+        name: getattr(HotPathCounters, name) for name in HotPathCounters.DESCRIPTIONS
+    }
+    event_log.emit = lambda kind, *fields: None
+    try:
+        yield
+    finally:
+        del event_log.emit
+        for name, value in counters.items():
+            setattr(HotPathCounters, name, value)
+
+
+def diff_results(
+    reference: Any,
+    candidate: Any,
+    rel_tol: float = EQUIVALENCE_REL_TOLERANCE,
+    abs_tol: float = EQUIVALENCE_ABS_TOLERANCE,
+    path: str = "result",
+) -> Optional[str]:
+    """Describe the first difference between two results, or None if they match.
+
+    Floats match within the tolerances; dicts, lists and tuples are compared
+    element by element, everything else exactly.
+    """
+    if isinstance(reference, bool) or isinstance(candidate, bool):
+        if reference is candidate:
+            return None
+    elif isinstance(reference, (int, float)) and isinstance(candidate, (int, float)):
+        if reference == candidate or math.isclose(
+            reference, candidate, rel_tol=rel_tol, abs_tol=abs_tol
+        ):
+            return None
+    elif isinstance(reference, dict) and isinstance(candidate, dict):
+        if reference.keys() != candidate.keys():
+            return f"{path}: keys {sorted(reference)} != {sorted(candidate)}"
+        for key in reference:
+            difference = diff_results(
+                reference[key], candidate[key], rel_tol, abs_tol, f"{path}.{key}"
+            )
+            if difference:
+                return difference
+        return None
+    elif isinstance(reference, (list, tuple)) and isinstance(candidate, (list, tuple)):
+        if len(reference) != len(candidate):
+            return f"{path}: length {len(reference)} != {len(candidate)}"
+        for i, (a, b) in enumerate(zip(reference, candidate)):
+            difference = diff_results(a, b, rel_tol, abs_tol, f"{path}[{i}]")
+            if difference:
+                return difference
+        return None
+    elif reference == candidate:
+        return None
+
+    return f"{path}: reference {reference!r} != candidate {candidate!r}"
+
+
+def shadowed(name: str):
+    """Let the installed ShadowChecker sample calls of a function under this name."""
+
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            checker = ShadowChecker.active
+            if checker is None or checker.busy:
+                return function(*args, **kwargs)
+            return checker.observe(name, function, args, kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class ShadowChecker:
+    """Re-runs a sample of live decisions with a reference implementation.
+
+    Functions marked with @shadowed are compared against the reference
+    registered under their name, by default the same function with exact
+    polygon tests. Divergence and the time spent by both sides are kept per
+    name. Sampling draws from its own random stream, so it never changes
+    the outcome of a run.
+    """
+
+    active: Optional["ShadowChecker"] = None
+
+    def __init__(
+        self,
+        sample_rate: float,
+        references: Dict[str, Callable] = None,
+        rel_tol: float = EQUIVALENCE_REL_TOLERANCE,
+        abs_tol: float = EQUIVALENCE_ABS_TOLERANCE,
+    ):
+        self.sample_rate = sample_rate
+        self.references = references or {}
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.busy = False
+        self.rng = RandomStream(RandomStream.new_seed(), "shadow")
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def install(self):
+        """Start sampling calls of all shadowed functions."""
+        ShadowChecker.active = self
+        logger.info(f"Shadow checking {self.sample_rate:.2%} of decisions")
+
+    def uninstall(self):
+        """Stop sampling."""
+        if ShadowChecker.active is self:
+            ShadowChecker.active = None
+
+    def observe(self, name: str, function: Callable, args: tuple, kwargs: dict):
+        """Run a live call, and for a sample of calls the reference next to it."""
+        if self.rng.random() >= self.sample_rate:
+            return function(*args, **kwargs)
+
+        self.busy = True
+        try:
+            started = time.perf_counter()
+            result = function(*args, **kwargs)
+            candidate_seconds = time.perf_counter() - started
+
+            # The live call already counted and logged this decision
+            reference = self.references.get(name)
+            started = time.perf_counter()
+            with unobserved():
+                if reference is None:
+                    with exact_geometry():
+                        expected = function(*args, **kwargs)
+                else:
+                    expected = reference(*args, **kwargs)
+            reference_seconds = time.perf_counter() - started
+        finally:
+            self.busy = False
+
+        self._record(
+            name,
+            diff_results(expected, result, self.rel_tol, self.abs_tol),
+            candidate_seconds,
+            reference_seconds,
+        )
+        return result
+
+    def _record(
+        self,
+        name: str,
+        difference: Optional[str],
+        candidate_seconds: float,
+        reference_seconds: float,
+    ):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = {
+                "sampled": 0,
+                "mismatches": 0,
+                "candidate_seconds": 0.0,
+                "reference_seconds": 0.0,
+                "recent_mismatches": deque(maxlen=SHADOW_MISMATCH_HISTORY),
+            }
+
+        stats["sampled"] += 1
+        stats["candidate_seconds"] += candidate_seconds
+        stats["reference_seconds"] += reference_seconds
+        if difference:
+            stats["mismatches"] += 1
+            stats["recent_mismatches"].append(difference)
+            logger.warning(f"Shadow check of {name} diverged: {difference}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get divergence and speedup per shadowed function."""
+        return {
+            "sample_rate": self.sample_rate,
+            "functions": {
+                name: {
+                    "sampled": stats["sampled"],
+                    "mismatches": stats["mismatches"],
+                    "divergence": stats["mismatches"] / stats["sampled"],
+                    "candidate_seconds": round(stats["candidate_seconds"], 6),
+                    "reference_seconds": round(stats["reference_seconds"], 6),
+                    "speedup": (
+                        round(
+                            stats["reference_seconds"] / stats["candidate_seconds"], 3
+                        )
+                        if stats["candidate_seconds"]
+                        else None
+                    ),
+                    "recent_mismatches": list(stats["recent_mismatches"]),
+                }
+                for name, stats in self.stats.items()
+            },
+        }
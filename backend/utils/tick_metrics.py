@@ -0,0 +1,108 @@
+from collections import deque
+from typing import Dict, List
+
+from ..constants import METRICS_QUANTILES, METRICS_WINDOW_TICKS
+
+# Tick phases in report order; the engine times all but the last two
+TICK_PHASES = [
+    "tick",
+    "spawn",
+    "wind",
+    "greenkeeper",
+    "shot_search",
+    "walking",
+    "state",
+    "serialization",
+    "broadcast",
+]
+
+
+class HotPathCounters:
+    """Process-wide counts bumped inline by the hot paths.
+
+    Plain class attributes keep each increment to one attribute update,
+    cheap enough to stay on inside polygon tests and shot selection.
+    """
+
+    shots_evaluated = 0
+    options_evaluated = 0
+    polygon_tests = 0
+    blocked_shots = 0
+    reused_plans = 0
+    reduced_searches = 0
+    deferred_group_updates = 0
+    budget_overruns = 0
+
+    DESCRIPTIONS = {
+        "shots_evaluated": "Shot selections run",
+        "options_evaluated": "Shot options scored during shot selection",
+        "polygon_tests": "Point in polygon tests",
+        "blocked_shots": "Shot attempts blocked by players or the greenkeeper ahead",
+        "reused_plans": "Safety checks that reused a shot plan instead of a new search",
+        "reduced_searches": "Shot decisions made with a coarser search to stay in the tick budget",
+        "deferred_group_updates": "Shot decisions and walking steps postponed to the next tick to stay in the tick budget",
+        "budget_overruns": "Ticks that took longer than the tick budget",
+    }
+
+
+class TickMetrics:
+    """Rolling per-phase tick timings, rendered in the Prometheus text format.
+
+    Each phase keeps the durations of its last window observations for the
+    quantiles, plus a running sum and count. Observing is a deque append,
+    so it stays on in production; sorting happens only when scraped.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW_TICKS):
+        self.window = window
+        self.samples: Dict[str, deque] = {}
+        self.sums: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def observe(self, phase: str, seconds: float):
+        """Record one duration of a phase."""
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+            self.sums[phase] = 0.0
+            self.counts[phase] = 0
+        samples.append(seconds)
+        self.sums[phase] += seconds
+        self.counts[phase] += 1
+
+    def quantiles(self, phase: str) -> Dict[float, float]:
+        """Get the configured quantiles of a phase over its window."""
+        ordered = sorted(self.samples.get(phase, ()))
+        if not ordered:
+            return {}
+        return {
+            q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            for q in METRICS_QUANTILES
+        }
+
+    def render(self) -> str:
+        """Render phase summaries and hot path counters in the Prometheus text format."""
+        lines: List[str] = [
+            "# HELP golf_tick_phase_seconds Duration of a simulation tick phase",
+            "# TYPE golf_tick_phase_seconds summary",
+        ]
+        phases = [phase for phase in TICK_PHASES if phase in self.samples]
+        phases += sorted(set(self.samples) - set(TICK_PHASES))
+        for phase in phases:
+            for q, seconds in self.quantiles(phase).items():
+                lines.append(
+                    f'golf_tick_phase_seconds{{phase="{phase}",quantile="{q}"}} {seconds:.9f}'
+                )
+            lines.append(
+                f'golf_tick_phase_seconds_sum{{phase="{phase}"}} {self.sums[phase]:.9f}'
+            )
+            lines.append(
+                f'golf_tick_phase_seconds_count{{phase="{phase}"}} {self.counts[phase]}'
+            )
+
+        for name, description in HotPathCounters.DESCRIPTIONS.items():
+            lines.append(f"# HELP golf_{name}_total {description}")
+            lines.append(f"# TYPE golf_{name}_total counter")
+            lines.append(f"golf_{name}_total {getattr(HotPathCounters, name)}")
+
+        return "\n".join(lines) + "\n"